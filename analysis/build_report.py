@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Report Pipeline - renders every analysis figure (analysis/figures/01..31_*.png)
+and refreshes the numbers of the markdown reports
+
+The report jobs of the final, refined, HFT and normal-day analyses and the flat
+scripts run together in one process pool (Agg backend): shared data is computed
+once and figures render as soon as their data is ready. Each job keeps the
+matplotlib style its script sets, as when the scripts run one by one.
+
+The build is incremental: every job declares the tick files and result CSVs it
+reads, and only outputs whose inputs, code or upstream data changed since the
+last build (or that are missing) are rebuilt; adding a competition day only
+refreshes the figures and reports that read it.
+
+Run from anywhere:  python analysis/build_report.py [--workers N] [--only JOB ...] [--force] [--dry-run]
+"""
+
+import argparse
+import importlib
+import os
+import runpy
+import sys
+from pathlib import Path
+import matplotlib.pyplot as plt
+
+ANALYSIS_DIR = Path(__file__).parent
+BASE_DIR = ANALYSIS_DIR.parent
+
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(ANALYSIS_DIR))
+from tradeSim import Pipeline
+import report_numbers
+
+RESULT_DIR = BASE_DIR / 'result'
+TICKS_DIR = BASE_DIR / 'marketInfo' / 'ticks'
+FIGURES_DIR = ANALYSIS_DIR / 'figures'
+PORTFOLIO_SUMMARY = RESULT_DIR / 'FemboyLover' / 'FemboyLover_portfolio_summary.csv'
+
+# Scripts with report JOBS, longest first
+MODULES = ['normal_day_strategy_analysis', 'final_report_analysis', 'refined_report_analysis',
+           'hft_strategy_analysis']
+# Scripts without functions, run as one job each: name -> (inputs, figures)
+SCRIPTS = {
+    'strategy_analysis.py': (
+        [PORTFOLIO_SUMMARY,
+         RESULT_DIR / 'FemboyLover' / 'FemboyLover_portfolios_transaction_summary.csv',
+         TICKS_DIR / '2025-11-10.csv', TICKS_DIR / '2025-11-11.csv'],
+        ['01_portfolio_performance.png', '02_stock_analysis.png', '03_day2_analysis.png',
+         '04_strategy_mechanics.png', '05_competition_dashboard.png', '06_profit_attribution.png']),
+    'compare_strategies.py': (
+        [PORTFOLIO_SUMMARY,
+         RESULT_DIR / 'FemboyLover_Hybrid' / 'FemboyLover_Hybrid_portfolio_summary.csv'],
+        ['19_strategy_comparison_results.png']),
+}
+
+# Markdown reports whose summary numbers come from the portfolio summary and the advanced metrics
+REPORTS = ['FINAL_COMPETITION_REPORT.md', 'FINAL_COMPETITION_REPORT_V2.md']
+
+# Stamps of the last successful build of each output
+STATE = ANALYSIS_DIR / 'cache' / 'build.json'
+
+
+def current_style():
+    return {key: value for key, value in plt.rcParams.items() if key != 'backend'}
+
+
+def render_styled(style, func, *args):
+    with plt.rc_context(style):
+        return func(*args)
+
+
+def run_script(name):
+    runpy.run_path(str(ANALYSIS_DIR / name), run_name='__main__')
+
+
+def load_jobs():
+    """
+    JOBS of every script, each wrapped to render with its script's style.
+    """
+    jobs = []
+    for name in MODULES:
+        plt.rcdefaults()
+        module = importlib.import_module(name)
+        style = current_style()
+        jobs += [job._replace(func=render_styled, args=(style, job.func) + tuple(job.args)) for job in module.JOBS]
+    plt.rcdefaults()
+    style = current_style()
+    for name, (inputs, figures) in SCRIPTS.items():
+        jobs.append(Pipeline.Job(name, render_styled, args=(style, run_script, name),
+                                 inputs=[ANALYSIS_DIR / name] + inputs,
+                                 outputs=[FIGURES_DIR / figure for figure in figures]))
+
+    for name in REPORTS:
+        jobs.append(Pipeline.Job(name, report_numbers.update_report, ['metrics'],
+                                 args=(ANALYSIS_DIR / name, PORTFOLIO_SUMMARY), inputs=[PORTFOLIO_SUMMARY],
+                                 outputs=[ANALYSIS_DIR / name]))
+    return jobs
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Render the analysis report figures in parallel")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--only", nargs="+", metavar="JOB", default=None,
+                        help="build only these jobs (and the data they need)")
+    parser.add_argument("--force", action="store_true", help="rebuild up-to-date outputs too")
+    parser.add_argument("--dry-run", action="store_true", help="list the outdated jobs without running them")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # the scripts read result/ and write analysis/figures/ relative to the repository root
+    os.chdir(BASE_DIR)
+    jobs = load_jobs()
+    print("=" * 70)
+    print(f"REPORT PIPELINE - {len(jobs)} jobs")
+    print("=" * 70)
+    if args.dry_run:
+        for name in Pipeline.outdated(jobs, str(STATE), args.only, args.force)[0]:
+            print(f"  {name}")
+        return
+    Pipeline.run(jobs, workers=args.workers, targets=args.only, state=str(STATE), force=args.force)
+    print("\n" + "=" * 70)
+    print(f"Figures saved to: {ANALYSIS_DIR / 'figures'}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
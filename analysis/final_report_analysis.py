@@ -12,6 +12,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from datetime import datetime, time
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -28,6 +29,10 @@ TICKS_DIR = BASE_DIR / "marketInfo" / "ticks"
 FIGURES_DIR = Path(__file__).parent / "figures"
 FIGURES_DIR.mkdir(exist_ok=True)
 
+sys.path.insert(0, str(BASE_DIR))
+from tradeSim import Replay, Features, Catalog, Pipeline, TriggerGrid, Microstructure
+from report_cache import MEMO
+
 # Development period dates (for strategy selection)
 DEV_DATES = [
     "2025-09-17", "2025-09-18", "2025-09-19", "2025-09-22", "2025-09-23",
@@ -48,18 +53,25 @@ COMP_DATES = [
 
 COMMISSION_RATE = 0.00157 * 1.07  # 0.168%
 
+# Competition results read by the report
+RESULT_DIR = BASE_DIR / "result" / "FemboyLover"
+PORTFOLIO_SUMMARY = RESULT_DIR / "FemboyLover_portfolio_summary.csv"
+TRANSACTION_SUMMARY = RESULT_DIR / "FemboyLover_portfolios_transaction_summary.csv"
+
 
 def load_tick_data(date_str):
-    """Load tick data for a specific date"""
+    """Load tick data for a specific date (cached, with the engine's feature columns)"""
     file_path = TICKS_DIR / f"{date_str}.csv"
     if file_path.exists():
-        df = pd.read_csv(file_path)
+        df = Replay.load_day(str(file_path))
         df = df.rename(columns={
             'ShareCode': 'symbol', 'TradeDateTime': 'timestamp',
-            'LastPrice': 'price', 'Volume': 'volume', 'Flag': 'flag'
+            'LastPrice': 'price', 'Volume': 'volume', 'Flag': 'flag',
+            'CumBuyVol': 'cum_buy_vol', 'CumSellVol': 'cum_sell_vol', 'CumVWAP': 'cum_vwap',
+            'SessionVWAP': 'session_vwap', 'SecondsSinceOpen': 'seconds_since_open',
+            'IsOpenAuction': 'is_open_auction'
         })
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df[~df['flag'].str.contains('OPEN', na=False)]
+        df = df[~df['is_open_auction']]
         return df
     return None
 
@@ -77,6 +89,8 @@ def get_tick_size(price):
     else: return 4.00
 
 
+@MEMO.memoize(inputs=lambda: Replay.tick_files(DEV_DATES[:20], TICKS_DIR), version=(Features.VERSION, COMMISSION_RATE),
+              depends=("load_tick_data", TriggerGrid.evaluate))
 def analyze_buy_trigger_optimization():
     """Analyze different buy trigger percentages to find optimal value"""
     print("Analyzing buy trigger optimization...")
@@ -92,9 +106,10 @@ def analyze_buy_trigger_optimization():
         if df is None:
             continue
 
-        for trigger in triggers:
-            # Simulate strategy with this trigger
-            ret, trades, wins = simulate_vwap_strategy(df, trigger)
+        # Simulate strategy with every trigger in one pass (same results as simulate_vwap_strategy)
+        day = TriggerGrid.evaluate(df['symbol'], df['price'], df['volume'], df['session_vwap'],
+                                   df['seconds_since_open'], triggers, commission_rate=COMMISSION_RATE)
+        for trigger, ret, trades, wins in zip(triggers, day['return_pct'], day['trades'], day['wins']):
             results[trigger]['returns'].append(ret)
             results[trigger]['trades'].append(trades)
             results[trigger]['wins'].append(wins)
@@ -129,38 +144,29 @@ def simulate_vwap_strategy(df, buy_trigger_pct=0.985, position_size=500000):
     trades = 0
     wins = 0
 
-    symbol_data = {}
-
-    liquidate_time = time(16, 25)
-    stop_trades_time = time(16, 20)
+    liquidate_after = Features.seconds_after_open(time(16, 25))
+    stop_trades_after = Features.seconds_after_open(time(16, 20))
 
-    for _, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
-        current_time = timestamp.time()
+    # running VWAP (continuous session, the opening auction is filtered out) and
+    # time of day come precomputed with the ticks
+    for row in df[['symbol', 'price', 'volume', 'session_vwap', 'seconds_since_open']].itertuples(index=False):
+        symbol = row.symbol
+        price = row.price
+        vwap = row.session_vwap
+        elapsed = row.seconds_since_open
 
-        if price <= 0 or volume <= 0:
+        if price <= 0 or row.volume <= 0:
             continue
 
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
-
         has_position = symbol in positions and positions[symbol]['volume'] > 0
 
         if has_position:
             pos = positions[symbol]
-            take_profit = data['vwap']
+            take_profit = vwap
             stop_loss = pos['entry'] * 0.98
 
             sell = False
-            if current_time >= liquidate_time:
+            if elapsed >= liquidate_after:
                 sell = True
             elif price >= take_profit:
                 sell = True
@@ -180,10 +186,10 @@ def simulate_vwap_strategy(df, buy_trigger_pct=0.985, position_size=500000):
 
                 del positions[symbol]
         else:
-            if current_time >= stop_trades_time:
+            if elapsed >= stop_trades_after:
                 continue
 
-            buy_trigger_price = data['vwap'] * buy_trigger_pct
+            buy_trigger_price = vwap * buy_trigger_pct
 
             if price <= buy_trigger_price and cash > position_size:
                 tick = get_tick_size(price)
@@ -204,45 +210,39 @@ def simulate_vwap_strategy(df, buy_trigger_pct=0.985, position_size=500000):
     return return_pct, trades, wins
 
 
+def load_daily_bars(date_str):
+    """Daily OHLCV bar per symbol, from the cached hourly bucket table of the day"""
+    file_path = TICKS_DIR / f"{date_str}.csv"
+    if file_path.exists():
+        return Microstructure.daily_bars(Microstructure.day_buckets(str(file_path)))
+    return None
+
+
+@MEMO.memoize(inputs=lambda: Replay.tick_files(DEV_DATES, TICKS_DIR), version=(Features.VERSION, Microstructure.VERSION),
+              depends=("load_daily_bars", Microstructure.buckets, Microstructure.daily_bars,
+                       Microstructure.overnight_gaps))
 def analyze_eod_vs_overnight():
     """Analyze EOD liquidation vs overnight holding"""
     print("Analyzing EOD vs Overnight holding...")
 
-    results = {'eod': [], 'overnight': []}
-
-    # Use consecutive day pairs from development period
-    for i in range(len(DEV_DATES) - 1):
-        date1 = DEV_DATES[i]
-        date2 = DEV_DATES[i + 1]
-
-        df1 = load_tick_data(date1)
-        df2 = load_tick_data(date2)
+    bars = {date: load_daily_bars(date) for date in DEV_DATES}
+    results = []
 
-        if df1 is None or df2 is None:
+    # Use consecutive day pairs from development period: close of one day vs open of the next
+    for date1, date2 in zip(DEV_DATES[:-1], DEV_DATES[1:]):
+        if bars[date1] is None or bars[date2] is None:
             continue
+        gaps = Microstructure.overnight_gaps(bars[date1], bars[date2])
+        results.append(gaps.assign(date=date1)[['date', 'symbol', 'close', 'open', 'gap_pct']])
 
-        # Calculate overnight gaps
-        for symbol in df1['symbol'].unique():
-            sym1 = df1[df1['symbol'] == symbol]
-            sym2 = df2[df2['symbol'] == symbol]
-
-            if len(sym1) > 0 and len(sym2) > 0:
-                close_price = sym1.iloc[-1]['price']
-                open_price = sym2.iloc[0]['price']
-
-                gap_pct = (open_price - close_price) / close_price * 100
-
-                results['overnight'].append({
-                    'date': date1,
-                    'symbol': symbol,
-                    'close': close_price,
-                    'open': open_price,
-                    'gap_pct': gap_pct
-                })
-
-    return pd.DataFrame(results['overnight'])
+    if not results:
+        return pd.DataFrame(columns=['date', 'symbol', 'close', 'open', 'gap_pct'])
+    return pd.concat(results, ignore_index=True)
 
 
+@MEMO.memoize(inputs=lambda: Replay.tick_files(DEV_DATES[:15], TICKS_DIR), version=(Features.VERSION, COMMISSION_RATE),
+              depends=("load_tick_data", "simulate_vwap_strategy", "simulate_momentum_strategy",
+                       "simulate_trend_strategy", "get_tick_size"))
 def analyze_strategy_comparison():
     """Compare Mean Reversion vs Momentum vs Trend Following"""
     print("Comparing strategies...")
@@ -460,32 +460,21 @@ def analyze_tick_clustering():
 
     results = []
 
+    # end-of-day MarketState values per day, kept in the tick catalog
+    catalog = Catalog.TickCatalog.build(str(TICKS_DIR))
     all_dates = DEV_DATES + COMP_DATES
 
     for date in all_dates:
-        df = load_tick_data(date)
-        if df is None:
+        if date not in catalog or catalog[date].traded == 0:
             continue
 
-        total_symbols = 0
-        clustered_symbols = 0
-
-        for symbol in df['symbol'].unique():
-            sym_df = df[df['symbol'] == symbol]
-            unique_prices = len(sym_df['price'].unique())
-
-            total_symbols += 1
-            if unique_prices <= 2:
-                clustered_symbols += 1
-
-        tcr = clustered_symbols / total_symbols * 100 if total_symbols > 0 else 0
-
+        info = catalog[date]
         results.append({
             'date': date,
-            'total_symbols': total_symbols,
-            'clustered': clustered_symbols,
-            'tcr': tcr,
-            'is_anomaly': tcr >= 50
+            'total_symbols': info.traded,
+            'clustered': info.clustered,
+            'tcr': info.tcr,
+            'is_anomaly': info.anomaly
         })
 
     return pd.DataFrame(results)
@@ -884,7 +873,7 @@ def plot_final_performance_summary():
     gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
 
     # Load competition results
-    comp_results = pd.read_csv('result/FemboyLover/FemboyLover_portfolio_summary.csv')
+    comp_results = pd.read_csv(PORTFOLIO_SUMMARY)
 
     # NAV progression
     ax1 = fig.add_subplot(gs[0, :2])
@@ -987,40 +976,33 @@ def plot_final_performance_summary():
     print("Saved: 25_final_performance_summary.png")
 
 
-def main():
+# Report steps (see build_report.py): trigger, overnight, strategy and TCR data, then figures 20-25.
+JOBS = [
+    Pipeline.Job('trigger_df', analyze_buy_trigger_optimization, inputs=Replay.tick_files(DEV_DATES[:20], TICKS_DIR)),
+    Pipeline.Job('overnight_df', analyze_eod_vs_overnight, inputs=Replay.tick_files(DEV_DATES, TICKS_DIR)),
+    Pipeline.Job('comparison_df', analyze_strategy_comparison, inputs=Replay.tick_files(DEV_DATES[:15], TICKS_DIR)),
+    Pipeline.Job('tcr_df', analyze_tick_clustering, inputs=Replay.tick_files(DEV_DATES + COMP_DATES, TICKS_DIR)),
+    Pipeline.figure(FIGURES_DIR, '20_buy_trigger_optimization.png', plot_buy_trigger_optimization, ['trigger_df']),
+    Pipeline.figure(FIGURES_DIR, '21_eod_vs_overnight.png', plot_eod_analysis, ['overnight_df']),
+    Pipeline.figure(FIGURES_DIR, '22_strategy_comparison.png', plot_strategy_comparison, ['comparison_df']),
+    Pipeline.figure(FIGURES_DIR, '23_tick_clustering_analysis.png', plot_tick_clustering_analysis, ['tcr_df']),
+    Pipeline.figure(FIGURES_DIR, '24_vwap_explanation.png', plot_vwap_explanation),
+    Pipeline.figure(FIGURES_DIR, '25_final_performance_summary.png', plot_final_performance_summary,
+                    inputs=[PORTFOLIO_SUMMARY]),
+]
+
+
+def main(workers=None):
     print("=" * 70)
     print("FINAL REPORT ANALYSIS - Generating Visualizations")
     print("=" * 70)
 
-    # 1. Buy trigger optimization
-    print("\n[1/6] Analyzing buy trigger optimization...")
-    trigger_df = analyze_buy_trigger_optimization()
-    plot_buy_trigger_optimization(trigger_df)
-    print(trigger_df.to_string(index=False))
-
-    # 2. EOD vs Overnight analysis
-    print("\n[2/6] Analyzing EOD vs Overnight holding...")
-    overnight_df = analyze_eod_vs_overnight()
-    plot_eod_analysis(overnight_df)
-
-    # 3. Strategy comparison
-    print("\n[3/6] Comparing strategies...")
-    comparison_df = analyze_strategy_comparison()
-    plot_strategy_comparison(comparison_df)
-    print(comparison_df.to_string(index=False))
-
-    # 4. Tick clustering analysis
-    print("\n[4/6] Analyzing tick clustering...")
-    tcr_df = analyze_tick_clustering()
-    plot_tick_clustering_analysis(tcr_df)
-
-    # 5. VWAP explanation
-    print("\n[5/6] Creating VWAP explanation...")
-    plot_vwap_explanation()
-
-    # 6. Final performance summary
-    print("\n[6/6] Creating final performance summary...")
-    plot_final_performance_summary()
+    results = Pipeline.run(JOBS, workers)
+
+    print("\nBuy trigger optimization:")
+    print(results['trigger_df'].to_string(index=False))
+    print("\nStrategy comparison:")
+    print(results['comparison_df'].to_string(index=False))
 
     print("\n" + "=" * 70)
     print("All visualizations generated successfully!")
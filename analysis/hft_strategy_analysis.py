@@ -8,6 +8,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -22,14 +23,8 @@ FIGURES_DIR.mkdir(exist_ok=True)
 # Load tick data for analysis
 TICKS_DIR = Path(__file__).parent.parent / "marketInfo" / "ticks"
 
-def load_tick_data(date_str):
-    """Load tick data for a specific date"""
-    file_path = TICKS_DIR / f"{date_str}.csv"
-    if file_path.exists():
-        df = pd.read_csv(file_path)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        return df
-    return None
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from tradeSim import Microstructure, Pipeline
 
 def analyze_transaction_costs():
     """Analyze transaction costs breakdown"""
@@ -125,56 +120,11 @@ def plot_transaction_costs():
     print("Saved: 08_transaction_costs.png")
 
 def analyze_tick_microstructure(date_str):
-    """Analyze tick-level microstructure"""
-    df = load_tick_data(date_str)
-    if df is None:
+    """Analyze tick-level microstructure (all symbols in one pass, cached per date)"""
+    file_path = TICKS_DIR / f"{date_str}.csv"
+    if not file_path.exists():
         return None
-
-    results = []
-    for symbol in df['symbol'].unique():
-        sym_df = df[df['symbol'] == symbol].copy()
-        sym_df = sym_df.sort_values('timestamp')
-
-        prices = sym_df['price'].values
-        volumes = sym_df['volume'].values
-
-        if len(prices) < 10:
-            continue
-
-        # Calculate returns
-        returns = np.diff(prices) / prices[:-1]
-
-        # Microstructure metrics
-        unique_prices = len(np.unique(prices))
-        price_range = (prices.max() - prices.min()) / prices.mean() * 100
-        avg_price = prices.mean()
-
-        # Get tick size for this price
-        tick_size = get_tick_size(avg_price)
-        slippage_pct = tick_size / avg_price * 100
-
-        # Momentum analysis (next tick return)
-        momentum_win_rate = np.mean(returns[:-1] * returns[1:] > 0) if len(returns) > 1 else 0
-
-        # Mean reversion analysis
-        mean_price = prices.mean()
-        above_mean = prices > mean_price
-        crossings = np.sum(np.diff(above_mean.astype(int)) != 0)
-
-        results.append({
-            'Symbol': symbol,
-            'Ticks': len(prices),
-            'AvgPrice': avg_price,
-            'TickSize': tick_size,
-            'Slippage%': slippage_pct,
-            'UniquePrices': unique_prices,
-            'Range%': price_range,
-            'MomentumWinRate': momentum_win_rate,
-            'MeanCrossings': crossings,
-            'AvgVolume': volumes.mean()
-        })
-
-    return pd.DataFrame(results)
+    return Microstructure.day_stats(str(file_path))
 
 def get_tick_size(price):
     """Get tick size based on price tier"""
@@ -668,18 +618,23 @@ def plot_why_hft_fails():
     plt.close()
     print("Saved: 13_why_hft_fails.png")
 
-def main():
+# Report steps, rendered in parallel
+JOBS = [
+    Pipeline.figure(FIGURES_DIR, '08_transaction_costs.png', plot_transaction_costs),
+    Pipeline.figure(FIGURES_DIR, '09_strategy_comparison.png', plot_strategy_comparison),
+    Pipeline.figure(FIGURES_DIR, '10_hft_viability_matrix.png', plot_hft_viability_matrix),
+    Pipeline.figure(FIGURES_DIR, '11_cost_vs_opportunity.png', plot_cost_vs_opportunity),
+    Pipeline.figure(FIGURES_DIR, '12_recommended_approach.png', plot_recommended_approach),
+    Pipeline.figure(FIGURES_DIR, '13_why_hft_fails.png', plot_why_hft_fails),
+]
+
+
+def main(workers=None):
     print("=" * 60)
     print("HFT Strategy Exploration - Generating Visualizations")
     print("=" * 60)
 
-    # Generate all figures
-    plot_transaction_costs()
-    plot_strategy_comparison()
-    plot_hft_viability_matrix()
-    plot_cost_vs_opportunity()
-    plot_recommended_approach()
-    plot_why_hft_fails()
+    Pipeline.run(JOBS, workers)
 
     print("\n" + "=" * 60)
     print("All visualizations generated successfully!")
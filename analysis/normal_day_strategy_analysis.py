@@ -11,7 +11,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from datetime import datetime, time, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -25,12 +26,16 @@ TICKS_DIR = BASE_DIR / "marketInfo" / "ticks"
 FIGURES_DIR = Path(__file__).parent / "figures"
 FIGURES_DIR.mkdir(exist_ok=True)
 
+sys.path.insert(0, str(BASE_DIR))
+from tradeSim import Replay, Features, Catalog, Pipeline
+from report_cache import MEMO
+from strategy.indicators import CumulativeVWAP, FlagImbalance, RollingMinMax
+
 # Constants
 COMMISSION_RATE = 0.00157 * 1.07  # 0.168%
 INITIAL_CAPITAL = 10_000_000
 
-# Define normal vs anomaly days
-ANOMALY_DAYS = ['2025-10-28', '2025-11-11']
+# Normal days to test on; anomaly days come from the tick catalog (TCR >= 50%)
 NORMAL_TEST_DAYS = ['2025-11-12', '2025-11-13', '2025-11-14', '2025-11-17', '2025-11-18',
                     '2025-11-19', '2025-11-20', '2025-11-21', '2025-09-17', '2025-09-18']
 
@@ -50,18 +55,24 @@ def load_tick_data(date_str):
     """Load tick data for a specific date"""
     file_path = TICKS_DIR / f"{date_str}.csv"
     if file_path.exists():
-        df = pd.read_csv(file_path)
+        # cached ticks with the engine's feature columns
+        df = Replay.load_day(str(file_path))
         # Rename columns to standard names
         df = df.rename(columns={
             'ShareCode': 'symbol',
             'TradeDateTime': 'timestamp',
             'LastPrice': 'price',
             'Volume': 'volume',
-            'Flag': 'flag'
+            'Flag': 'flag',
+            'CumBuyVol': 'cum_buy_vol',
+            'CumSellVol': 'cum_sell_vol',
+            'CumVWAP': 'cum_vwap',
+            'SessionVWAP': 'session_vwap',
+            'SecondsSinceOpen': 'seconds_since_open',
+            'IsOpenAuction': 'is_open_auction'
         })
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
         # Filter out OPEN flags
-        df = df[~df['flag'].str.contains('OPEN', na=False)]
+        df = df[~df['is_open_auction']]
         return df
     return None
 
@@ -261,42 +272,42 @@ class StrategyBacktester:
         }
 
 
+def valid_ticks(df):
+    """
+    Rows with a positive price and volume, in order, as namedtuples with two
+    extra fields: sid (dense symbol id, indexing strategy.indicators and the
+    per-symbol arrays) and n (the symbol's tick number among these rows, from 1).
+
+    Returns (rows, number of symbols).
+    """
+    df = df[(df['price'] > 0) & (df['volume'] > 0)]
+    sids, symbols = pd.factorize(df['symbol'])
+    df = df.assign(sid=sids, n=df.groupby('symbol').cumcount().to_numpy() + 1)
+    return df.itertuples(index=False), len(symbols)
+
+
 def run_vwap_mean_reversion(df, backtester, position_size=500_000, buy_trigger=0.985):
     """Original VWAP Mean Reversion Strategy"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, _ = valid_ticks(df)
+    vwaps = CumulativeVWAP()
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 20)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0, 'buy_price': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(row.sid, price, row.volume)
 
         # Check if we have position
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap']
+            take_profit = vwap
             stop_loss = pos['avg_price'] * 0.98
 
             sell = False
@@ -313,7 +324,7 @@ def run_vwap_mean_reversion(df, backtester, position_size=500_000, buy_trigger=0
             if current_time >= stop_trades_time:
                 continue
 
-            buy_trigger_price = data['vwap'] * buy_trigger
+            buy_trigger_price = vwap * buy_trigger
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
@@ -327,32 +338,19 @@ def run_momentum_strategy(df, backtester, position_size=500_000, lookback=5, thr
     """Momentum Strategy - Buy on upward momentum, sell on reversal"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, n_symbols = valid_ticks(df)
+    # last `lookback` prices per symbol (the return is measured from the oldest)
+    recent = [deque(maxlen=lookback) for _ in range(n_symbols)]
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 20)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'prices': [], 'entry_price': 0}
-
-        data = symbol_data[symbol]
-        data['prices'].append(price)
-
-        if len(data['prices']) > lookback:
-            data['prices'] = data['prices'][-lookback:]
+        prices = recent[row.sid]
+        prices.append(price)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
@@ -361,8 +359,8 @@ def run_momentum_strategy(df, backtester, position_size=500_000, lookback=5, thr
             # Sell on momentum reversal or EOD
             if current_time >= liquidate_time:
                 backtester.sell(symbol, pos['volume'], price, timestamp)
-            elif len(data['prices']) >= lookback:
-                recent_return = (price - data['prices'][0]) / data['prices'][0] * 100
+            elif row.n >= lookback:
+                recent_return = (price - prices[0]) / prices[0] * 100
                 if recent_return < -threshold:  # Momentum reversed
                     backtester.sell(symbol, pos['volume'], price, timestamp)
                 elif price >= pos['avg_price'] * 1.01:  # 1% profit target
@@ -371,8 +369,8 @@ def run_momentum_strategy(df, backtester, position_size=500_000, lookback=5, thr
             if current_time >= stop_trades_time:
                 continue
 
-            if len(data['prices']) >= lookback and backtester.cash > position_size:
-                recent_return = (price - data['prices'][0]) / data['prices'][0] * 100
+            if row.n >= lookback and backtester.cash > position_size:
+                recent_return = (price - prices[0]) / prices[0] * 100
                 if recent_return > threshold:  # Positive momentum
                     vol_to_buy = int((position_size / price) // 100 * 100)
                     if vol_to_buy >= 100:
@@ -385,34 +383,23 @@ def run_range_breakout_strategy(df, backtester, position_size=500_000, range_per
     """Range Breakout Strategy - Buy on breakout above range high"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, n_symbols = valid_ticks(df)
+    # the range is the min/max of the range_period - 1 ticks before the current one
+    window = RollingMinMax(n_symbols, window=range_period - 1)
+    previous = [None] * n_symbols
+    range_high = np.zeros(n_symbols)
+    range_low = np.full(n_symbols, np.inf)
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 20)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp, sid = row.symbol, row.price, row.timestamp, row.sid
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'prices': [], 'entry_price': 0, 'range_high': 0, 'range_low': float('inf')}
-
-        data = symbol_data[symbol]
-        data['prices'].append(price)
-
-        if len(data['prices']) > range_period:
-            data['prices'] = data['prices'][-range_period:]
-            data['range_high'] = max(data['prices'][:-1])
-            data['range_low'] = min(data['prices'][:-1])
+        if row.n > range_period:
+            range_low[sid], range_high[sid] = previous[sid]
+        previous[sid] = window.update(sid, price)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
@@ -420,7 +407,7 @@ def run_range_breakout_strategy(df, backtester, position_size=500_000, range_per
             pos = backtester.positions[symbol]
             if current_time >= liquidate_time:
                 backtester.sell(symbol, pos['volume'], price, timestamp)
-            elif data['range_low'] > 0 and price <= data['range_low']:  # Breakdown - stop loss
+            elif range_low[sid] > 0 and price <= range_low[sid]:  # Breakdown - stop loss
                 backtester.sell(symbol, pos['volume'], price, timestamp)
             elif price >= pos['avg_price'] * 1.015:  # 1.5% profit target
                 backtester.sell(symbol, pos['volume'], price, timestamp)
@@ -428,8 +415,8 @@ def run_range_breakout_strategy(df, backtester, position_size=500_000, range_per
             if current_time >= stop_trades_time:
                 continue
 
-            if len(data['prices']) >= range_period and data['range_high'] > 0:
-                breakout_level = data['range_high'] * (1 + breakout_pct / 100)
+            if row.n >= range_period and range_high[sid] > 0:
+                breakout_level = range_high[sid] * (1 + breakout_pct / 100)
                 if price >= breakout_level and backtester.cash > position_size:
                     vol_to_buy = int((position_size / price) // 100 * 100)
                     if vol_to_buy >= 100:
@@ -442,41 +429,17 @@ def run_volume_imbalance_strategy(df, backtester, position_size=500_000, imbalan
     """Volume Imbalance Strategy - Trade in direction of volume flow"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, _ = valid_ticks(df)
+    imbalance = FlagImbalance()
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 20)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        flag = row['flag']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'buy_vol': 0, 'sell_vol': 0, 'prices': []}
-
-        data = symbol_data[symbol]
-
-        if flag == 'Buy':
-            data['buy_vol'] += volume
-        elif flag == 'Sell':
-            data['sell_vol'] += volume
-
-        data['prices'].append(price)
-        if len(data['prices']) > 20:
-            data['prices'] = data['prices'][-20:]
-
-        total_vol = data['buy_vol'] + data['sell_vol']
-        buy_pct = data['buy_vol'] / total_vol * 100 if total_vol > 0 else 50
+        buy_pct = imbalance.update(row.sid, row.flag, row.volume)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
@@ -506,8 +469,6 @@ def run_enhanced_vwap_strategy(df, backtester, position_size=400_000, buy_trigge
     """Enhanced VWAP Strategy - Selective stocks, tighter trigger, dynamic sizing"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
     stock_ranges = {}
 
     liquidate_time = time(16, 25)
@@ -524,35 +485,24 @@ def run_enhanced_vwap_strategy(df, backtester, position_size=400_000, buy_trigge
     if target_stocks is None:
         target_stocks = [s for s, r in stock_ranges.items() if r >= min_range]
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
-        current_time = timestamp.time()
+    rows, _ = valid_ticks(df)
+    vwaps = CumulativeVWAP()
 
-        if price <= 0 or volume <= 0:
-            continue
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
+        current_time = timestamp.time()
 
         # Only trade target stocks
         if symbol not in target_stocks:
             continue
 
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(row.sid, price, row.volume)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap'] * 0.998  # Sell slightly below VWAP
+            take_profit = vwap * 0.998  # Sell slightly below VWAP
             stop_loss = pos['avg_price'] * 0.985  # Tighter stop
 
             sell = False
@@ -569,7 +519,7 @@ def run_enhanced_vwap_strategy(df, backtester, position_size=400_000, buy_trigge
             if current_time >= stop_trades_time:
                 continue
 
-            buy_trigger_price = data['vwap'] * buy_trigger
+            buy_trigger_price = vwap * buy_trigger
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
@@ -583,32 +533,18 @@ def run_time_based_vwap_strategy(df, backtester, position_size=500_000):
     """Time-Based VWAP - Different triggers at different times of day"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, _ = valid_ticks(df)
+    vwaps = CumulativeVWAP()
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 10)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
         hour = timestamp.hour
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(row.sid, price, row.volume)
 
         # Dynamic buy trigger based on time
         if hour < 11:  # Morning - aggressive
@@ -622,7 +558,7 @@ def run_time_based_vwap_strategy(df, backtester, position_size=500_000):
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap']
+            take_profit = vwap
             stop_loss = pos['avg_price'] * 0.98
 
             sell = False
@@ -639,7 +575,7 @@ def run_time_based_vwap_strategy(df, backtester, position_size=500_000):
             if current_time >= stop_trades_time:
                 continue
 
-            buy_trigger_price = data['vwap'] * buy_trigger
+            buy_trigger_price = vwap * buy_trigger
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
@@ -653,37 +589,24 @@ def run_double_down_vwap_strategy(df, backtester, position_size=300_000):
     """Double-Down VWAP - Add to winning positions"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, n_symbols = valid_ticks(df)
+    vwaps = CumulativeVWAP()
+    buys = np.zeros(n_symbols, dtype=np.int64)
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 10)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp, sid = row.symbol, row.price, row.timestamp, row.sid
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0, 'buys': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(sid, price, row.volume)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap']
+            take_profit = vwap
             stop_loss = pos['avg_price'] * 0.98
 
             sell = False
@@ -696,27 +619,27 @@ def run_double_down_vwap_strategy(df, backtester, position_size=300_000):
 
             if sell:
                 backtester.sell(symbol, pos['volume'], price, timestamp)
-                data['buys'] = 0
+                buys[sid] = 0
             else:
                 # Double down if price drops further but still above stop
-                if data['buys'] < 2 and price <= pos['avg_price'] * 0.99 and price > stop_loss:
+                if buys[sid] < 2 and price <= pos['avg_price'] * 0.99 and price > stop_loss:
                     if backtester.cash > position_size:
                         vol_to_buy = int((position_size / price) // 100 * 100)
                         if vol_to_buy >= 100:
                             backtester.buy(symbol, vol_to_buy, price, timestamp)
-                            data['buys'] += 1
+                            buys[sid] += 1
         else:
-            data['buys'] = 0
+            buys[sid] = 0
             if current_time >= stop_trades_time:
                 continue
 
-            buy_trigger_price = data['vwap'] * 0.985
+            buy_trigger_price = vwap * 0.985
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
                 if vol_to_buy >= 100:
                     backtester.buy(symbol, vol_to_buy, price, timestamp)
-                    data['buys'] = 1
+                    buys[sid] = 1
 
     return backtester.get_results()
 
@@ -725,37 +648,25 @@ def run_scalping_strategy(df, backtester, position_size=200_000, profit_target=0
     """Scalping Strategy - Quick in and out with small profit targets"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, n_symbols = valid_ticks(df)
+    # high of the last 5 ticks, the current one included
+    window = RollingMinMax(n_symbols, window=5)
+    hold_ticks = np.zeros(n_symbols, dtype=np.int64)
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 00)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp, sid = row.symbol, row.price, row.timestamp, row.sid
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'prices': [], 'hold_ticks': 0}
-
-        data = symbol_data[symbol]
-        data['prices'].append(price)
-        if len(data['prices']) > 10:
-            data['prices'] = data['prices'][-10:]
+        _, recent_high = window.update(sid, price)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            data['hold_ticks'] += 1
+            hold_ticks[sid] += 1
 
             pnl_pct = (price - pos['avg_price']) / pos['avg_price'] * 100
 
@@ -766,20 +677,19 @@ def run_scalping_strategy(df, backtester, position_size=200_000, profit_target=0
                 sell = True
             elif pnl_pct <= -0.5:  # Tight stop
                 sell = True
-            elif data['hold_ticks'] >= max_hold_ticks:  # Time-based exit
+            elif hold_ticks[sid] >= max_hold_ticks:  # Time-based exit
                 sell = True
 
             if sell:
                 backtester.sell(symbol, pos['volume'], price, timestamp)
-                data['hold_ticks'] = 0
+                hold_ticks[sid] = 0
         else:
-            data['hold_ticks'] = 0
+            hold_ticks[sid] = 0
             if current_time >= stop_trades_time:
                 continue
 
             # Buy on small dip
-            if len(data['prices']) >= 5:
-                recent_high = max(data['prices'][-5:])
+            if row.n >= 5:
                 if price <= recent_high * 0.995 and backtester.cash > position_size:  # 0.5% below recent high
                     vol_to_buy = int((position_size / price) // 100 * 100)
                     if vol_to_buy >= 100:
@@ -792,38 +702,24 @@ def run_deep_discount_vwap(df, backtester, position_size=600_000, buy_trigger=0.
     """Deep Discount VWAP - Only buy at significant discount (2.5% below VWAP)"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, _ = valid_ticks(df)
+    vwaps = CumulativeVWAP()
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 15)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(row.sid, price, row.volume)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
             # Higher take profit - 0.5% above VWAP
-            take_profit = data['vwap'] * 1.005
+            take_profit = vwap * 1.005
             stop_loss = pos['avg_price'] * 0.97  # 3% stop loss
 
             sell = False
@@ -841,7 +737,7 @@ def run_deep_discount_vwap(df, backtester, position_size=600_000, buy_trigger=0.
                 continue
 
             # Only buy at deep discount
-            buy_trigger_price = data['vwap'] * buy_trigger
+            buy_trigger_price = vwap * buy_trigger
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
@@ -855,38 +751,24 @@ def run_afternoon_vwap(df, backtester, position_size=500_000, buy_trigger=0.985)
     """Afternoon Only VWAP - Only trade after 13:00 when VWAP is more stable"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, _ = valid_ticks(df)
+    vwaps = CumulativeVWAP()
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 15)
     start_trades_time = time(13, 0)  # Only start trading in afternoon
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(row.sid, price, row.volume)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap']
+            take_profit = vwap
             stop_loss = pos['avg_price'] * 0.98
 
             sell = False
@@ -904,7 +786,7 @@ def run_afternoon_vwap(df, backtester, position_size=500_000, buy_trigger=0.985)
             if current_time < start_trades_time or current_time >= stop_trades_time:
                 continue
 
-            buy_trigger_price = data['vwap'] * buy_trigger
+            buy_trigger_price = vwap * buy_trigger
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
@@ -918,41 +800,27 @@ def run_low_price_focus(df, backtester, position_size=400_000, buy_trigger=0.985
     """Low Price Focus - Only trade stocks under 25 THB for lower transaction costs"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, _ = valid_ticks(df)
+    vwaps = CumulativeVWAP()
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 15)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
         # Only trade low price stocks
         if price > max_price:
             continue
 
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(row.sid, price, row.volume)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap']
+            take_profit = vwap
             stop_loss = pos['avg_price'] * 0.98
 
             sell = False
@@ -969,7 +837,7 @@ def run_low_price_focus(df, backtester, position_size=400_000, buy_trigger=0.985
             if current_time >= stop_trades_time:
                 continue
 
-            buy_trigger_price = data['vwap'] * buy_trigger
+            buy_trigger_price = vwap * buy_trigger
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
@@ -983,37 +851,23 @@ def run_conservative_vwap(df, backtester, position_size=300_000, buy_trigger=0.9
     """Conservative VWAP - Fewer positions, tighter controls"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, _ = valid_ticks(df)
+    vwaps = CumulativeVWAP()
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 10)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp = row.symbol, row.price, row.timestamp
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {'vwap_num': 0, 'vwap_den': 0, 'vwap': 0}
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
+        vwap = vwaps.update(row.sid, price, row.volume)
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap'] * 0.998  # Slightly below VWAP
+            take_profit = vwap * 0.998  # Slightly below VWAP
             stop_loss = pos['avg_price'] * 0.985  # Tighter stop
 
             sell = False
@@ -1034,7 +888,7 @@ def run_conservative_vwap(df, backtester, position_size=300_000, buy_trigger=0.9
             if len(backtester.positions) >= max_positions:
                 continue
 
-            buy_trigger_price = data['vwap'] * buy_trigger
+            buy_trigger_price = vwap * buy_trigger
 
             if price <= buy_trigger_price and backtester.cash > position_size:
                 vol_to_buy = int((position_size / price) // 100 * 100)
@@ -1048,50 +902,33 @@ def run_wait_for_pattern(df, backtester, position_size=500_000):
     """Wait for Pattern - Only trade when price shows specific pattern"""
     backtester.reset()
 
-    symbol_data = {}
-    current_prices = {}
+    rows, n_symbols = valid_ticks(df)
+    vwaps = CumulativeVWAP()
+    # low of the last 5 ticks, the current one included
+    window = RollingMinMax(n_symbols, window=5)
+    below_vwap_count = np.zeros(n_symbols, dtype=np.int64)
 
     liquidate_time = time(16, 25)
     stop_trades_time = time(16, 10)
 
-    for idx, row in df.iterrows():
-        symbol = row['symbol']
-        price = row['price']
-        volume = row['volume']
-        timestamp = row['timestamp']
+    for row in rows:
+        symbol, price, timestamp, sid = row.symbol, row.price, row.timestamp, row.sid
         current_time = timestamp.time()
 
-        if price <= 0 or volume <= 0:
-            continue
-
-        current_prices[symbol] = price
-
-        if symbol not in symbol_data:
-            symbol_data[symbol] = {
-                'vwap_num': 0, 'vwap_den': 0, 'vwap': 0,
-                'prices': [], 'below_vwap_count': 0
-            }
-
-        data = symbol_data[symbol]
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        data['vwap'] = data['vwap_num'] / data['vwap_den']
-
-        data['prices'].append(price)
-        if len(data['prices']) > 20:
-            data['prices'] = data['prices'][-20:]
+        vwap = vwaps.update(sid, price, row.volume)
+        recent_low, _ = window.update(sid, price)
 
         # Track consecutive below VWAP
-        if price < data['vwap'] * 0.99:
-            data['below_vwap_count'] += 1
+        if price < vwap * 0.99:
+            below_vwap_count[sid] += 1
         else:
-            data['below_vwap_count'] = 0
+            below_vwap_count[sid] = 0
 
         has_position = symbol in backtester.positions and backtester.positions[symbol]['volume'] > 0
 
         if has_position:
             pos = backtester.positions[symbol]
-            take_profit = data['vwap']
+            take_profit = vwap
             stop_loss = pos['avg_price'] * 0.98
 
             sell = False
@@ -1109,10 +946,9 @@ def run_wait_for_pattern(df, backtester, position_size=500_000):
                 continue
 
             # Pattern: price below VWAP for 3+ ticks AND showing potential reversal
-            if data['below_vwap_count'] >= 3 and len(data['prices']) >= 5:
-                recent_low = min(data['prices'][-5:])
+            if below_vwap_count[sid] >= 3 and row.n >= 5:
                 # Price bouncing from recent low
-                if price > recent_low * 1.002 and price <= data['vwap'] * 0.985:
+                if price > recent_low * 1.002 and price <= vwap * 0.985:
                     if backtester.cash > position_size:
                         vol_to_buy = int((position_size / price) // 100 * 100)
                         if vol_to_buy >= 100:
@@ -1121,6 +957,12 @@ def run_wait_for_pattern(df, backtester, position_size=500_000):
     return backtester.get_results()
 
 
+@MEMO.memoize(inputs=lambda date_str: [Replay.tick_file(date_str, TICKS_DIR)],
+              version=(Features.VERSION, COMMISSION_RATE, INITIAL_CAPITAL),
+              depends=("load_tick_data", "get_tick_size", "StrategyBacktester", "valid_ticks",
+                       "run_vwap_mean_reversion", "run_enhanced_vwap_strategy", "run_time_based_vwap_strategy",
+                       "run_double_down_vwap_strategy", "run_deep_discount_vwap", "run_afternoon_vwap",
+                       "run_low_price_focus", "run_conservative_vwap", "run_wait_for_pattern"))
 def run_all_backtests(date_str):
     """Run all strategies on a given date"""
     df = load_tick_data(date_str)
@@ -1495,8 +1337,9 @@ def main():
     print("=" * 70)
 
     # Define test dates
-    normal_days = NORMAL_TEST_DAYS
-    anomaly_days = ANOMALY_DAYS
+    catalog = Catalog.TickCatalog.build(str(TICKS_DIR))
+    normal_days = [d for d in NORMAL_TEST_DAYS if d in catalog and not catalog[d].anomaly]
+    anomaly_days = catalog.dates(anomaly=True)
     all_test_days = normal_days + anomaly_days
 
     print(f"\nAnalyzing {len(normal_days)} normal days and {len(anomaly_days)} anomaly days...")
@@ -1574,5 +1417,16 @@ def main():
     return all_results
 
 
+# Report steps (see build_report.py): backtests of the test days, then figures 14-18.
+# Anomaly days come from the catalog, so every tick file is an input.
+JOBS = [
+    Pipeline.Job('normal_day_strategy_analysis', main,
+                 inputs=lambda: Replay.tick_files(Replay.discover_dates(str(TICKS_DIR)), TICKS_DIR),
+                 outputs=[FIGURES_DIR / name for name in [
+                     '14_strategy_returns_comparison.png', '15_daily_performance.png', '16_risk_analysis.png',
+                     '17_strategy_decision_matrix.png', '18_recommendation_summary.png']]),
+]
+
+
 if __name__ == "__main__":
     main()
@@ -11,6 +11,7 @@ import seaborn as sns
 from pathlib import Path
 from datetime import datetime, time
 from scipy import stats
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -22,19 +23,35 @@ BASE_DIR = Path(__file__).parent.parent
 TICKS_DIR = BASE_DIR / "marketInfo" / "ticks"
 FIGURES_DIR = Path(__file__).parent / "figures"
 
+sys.path.insert(0, str(BASE_DIR))
+from tradeSim import Replay, Features, Microstructure, Pipeline
+from report_cache import MEMO
+
 COMMISSION_RATE = 0.00157 * 1.07
+REVERSION_THRESHOLDS = [0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0]  # % below VWAP
+
+# Sample days of the intraday and mean reversion studies
+INTRADAY_DATES = ['2025-11-11', '2025-11-12', '2025-11-13']
+REVERSION_DATES = ['2025-11-10', '2025-11-12', '2025-11-13', '2025-11-14']
+
+# Competition results read by the report
+RESULT_DIR = BASE_DIR / "result" / "FemboyLover"
+PORTFOLIO_SUMMARY = RESULT_DIR / "FemboyLover_portfolio_summary.csv"
+TRANSACTION_SUMMARY = RESULT_DIR / "FemboyLover_portfolios_transaction_summary.csv"
 
 
 def load_tick_data(date_str):
     file_path = TICKS_DIR / f"{date_str}.csv"
     if file_path.exists():
-        df = pd.read_csv(file_path)
+        df = Replay.load_day(str(file_path))
         df = df.rename(columns={
             'ShareCode': 'symbol', 'TradeDateTime': 'timestamp',
-            'LastPrice': 'price', 'Volume': 'volume', 'Flag': 'flag'
+            'LastPrice': 'price', 'Volume': 'volume', 'Flag': 'flag',
+            'CumBuyVol': 'cum_buy_vol', 'CumSellVol': 'cum_sell_vol', 'CumVWAP': 'cum_vwap',
+            'SessionVWAP': 'session_vwap', 'SecondsSinceOpen': 'seconds_since_open',
+            'IsOpenAuction': 'is_open_auction'
         })
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df[~df['flag'].str.contains('OPEN', na=False)]
+        df = df[~df['is_open_auction']]
         return df
     return None
 
@@ -56,7 +73,7 @@ def analyze_transaction_costs_detailed():
     print("Analyzing transaction costs in detail...")
 
     # Load competition results
-    results = pd.read_csv('result/FemboyLover/FemboyLover_portfolios_transaction_summary.csv')
+    results = pd.read_csv(TRANSACTION_SUMMARY)
 
     total_buy_amount = results[results['Symbol'] != 'TOTAL']['Buy Amount'].sum()
     total_sell_amount = results[results['Symbol'] != 'TOTAL']['Sell Amount'].sum()
@@ -88,108 +105,69 @@ def analyze_transaction_costs_detailed():
     }
 
 
+@MEMO.memoize(inputs=lambda: Replay.tick_files(INTRADAY_DATES, TICKS_DIR), version=(Features.VERSION, Microstructure.VERSION),
+              depends=(Microstructure.buckets,))
 def analyze_intraday_patterns():
-    """Analyze intraday trading patterns"""
-    print("Analyzing intraday patterns...")
+    """Analyze intraday trading patterns
 
-    # Use a sample of days
-    sample_dates = ['2025-11-11', '2025-11-12', '2025-11-13']
+    Per date, hour and symbol (10 ticks or more in the hour): mean absolute
+    deviation from the hour's VWAP and ticks at or below 98.5% of it, read from
+    the cached hourly bucket table of each day.
+    """
+    print("Analyzing intraday patterns...")
 
     hourly_data = []
 
-    for date in sample_dates:
-        df = load_tick_data(date)
-        if df is None:
+    for date in INTRADAY_DATES:
+        file_path = TICKS_DIR / f"{date}.csv"
+        if not file_path.exists():
             continue
 
-        df['hour'] = df['timestamp'].dt.hour
-
-        for hour in range(10, 17):
-            hour_df = df[df['hour'] == hour]
-            if len(hour_df) == 0:
-                continue
-
-            # Calculate VWAP deviations for this hour
-            for symbol in hour_df['symbol'].unique():
-                sym_df = hour_df[hour_df['symbol'] == symbol]
-                if len(sym_df) < 10:
-                    continue
-
-                prices = sym_df['price'].values
-                volumes = sym_df['volume'].values
-
-                # Calculate VWAP
-                vwap = np.sum(prices * volumes) / np.sum(volumes)
-
-                # Deviations
-                deviations = (prices - vwap) / vwap * 100
-                buy_signals = np.sum(prices <= vwap * 0.985)
-
-                hourly_data.append({
-                    'date': date,
-                    'hour': hour,
-                    'symbol': symbol,
-                    'avg_deviation': np.mean(np.abs(deviations)),
-                    'buy_signals': buy_signals,
-                    'ticks': len(prices)
-                })
-
-    return pd.DataFrame(hourly_data)
-
-
-def analyze_mean_reversion_statistics():
-    """Statistical analysis of mean reversion behavior"""
+        buckets = Microstructure.day_buckets(str(file_path))
+        buckets = buckets[buckets['hour'].between(10, 16) & (buckets['ticks'] >= 10)]
+        hourly_data.append(pd.DataFrame({
+            'date': date,
+            'hour': buckets['hour'],
+            'symbol': buckets['symbol'],
+            'avg_deviation': buckets['abs_dev_pct'],
+            'buy_signals': buckets['signals'],
+            'ticks': buckets['ticks']
+        }).sort_values(['hour', 'symbol'], kind='stable'))
+
+    if not hourly_data:
+        return pd.DataFrame()
+    return pd.concat(hourly_data, ignore_index=True)
+
+
+@MEMO.memoize(inputs=lambda thresholds: Replay.tick_files(REVERSION_DATES, TICKS_DIR), version=Features.VERSION,
+              depends=("load_tick_data", Microstructure.reversion_events, Microstructure.reversion_summary))
+def analyze_mean_reversion_statistics(thresholds=REVERSION_THRESHOLDS):
+    """Statistical analysis of mean reversion behavior
+
+    Returns the first -1.5% VWAP deviation per stock and day with its reversion,
+    and the hit rate / ticks-to-revert of every deviation entry per threshold.
+    """
     print("Analyzing mean reversion statistics...")
 
-    sample_dates = ['2025-11-10', '2025-11-12', '2025-11-13', '2025-11-14']
-    reversion_data = []
+    first_events = []
+    sweep_events = []
 
-    for date in sample_dates:
+    for date in REVERSION_DATES:
         df = load_tick_data(date)
         if df is None:
             continue
 
-        for symbol in df['symbol'].unique():
-            sym_df = df[df['symbol'] == symbol].copy().sort_values('timestamp')
-            if len(sym_df) < 100:
-                continue
-
-            prices = sym_df['price'].values
-            volumes = sym_df['volume'].values
-
-            # Calculate running VWAP
-            cum_pv = np.cumsum(prices * volumes)
-            cum_v = np.cumsum(volumes)
-            vwap = cum_pv / cum_v
-
-            # Find deviation points
-            deviations = (prices - vwap) / vwap * 100
-
-            # Track reversion
-            for i in range(len(deviations) - 1):
-                if deviations[i] <= -1.5:  # Below threshold
-                    # Look for reversion within next N ticks
-                    for j in range(i + 1, min(i + 100, len(deviations))):
-                        if prices[j] >= vwap[j]:  # Reverted
-                            reversion_data.append({
-                                'date': date,
-                                'symbol': symbol,
-                                'initial_deviation': deviations[i],
-                                'ticks_to_revert': j - i,
-                                'reverted': True
-                            })
-                            break
-                    else:
-                        reversion_data.append({
-                            'date': date,
-                            'symbol': symbol,
-                            'initial_deviation': deviations[i],
-                            'ticks_to_revert': 100,
-                            'reverted': False
-                        })
-                    break  # Only track first deviation per stock
-
-    return pd.DataFrame(reversion_data)
+        columns = (df['symbol'], df['timestamp'], df['price'], df['volume'])
+        # Only track first deviation per stock
+        first_events.append(Microstructure.reversion_events(*columns, thresholds=[1.5], first_only=True)
+                            .assign(date=date))
+        sweep_events.append(Microstructure.reversion_events(*columns, thresholds=thresholds).assign(date=date))
+
+    if not first_events:
+        return pd.DataFrame(), pd.DataFrame()
+    reversion_df = pd.concat(first_events, ignore_index=True)[
+        ['date', 'symbol', 'initial_deviation', 'ticks_to_revert', 'reverted']]
+    return reversion_df, Microstructure.reversion_summary(pd.concat(sweep_events, ignore_index=True))
 
 
 def calculate_advanced_metrics():
@@ -197,7 +175,7 @@ def calculate_advanced_metrics():
     print("Calculating advanced metrics...")
 
     # Load daily results
-    results = pd.read_csv('result/FemboyLover/FemboyLover_portfolio_summary.csv')
+    results = pd.read_csv(PORTFOLIO_SUMMARY)
 
     returns = results['Return rate'].diff().fillna(results['Return rate'].iloc[0])
     daily_returns = returns.values
@@ -321,6 +299,8 @@ def plot_transaction_cost_breakdown(cost_data):
 
 def plot_intraday_patterns(hourly_df):
     """Plot intraday trading patterns"""
+    if len(hourly_df) == 0:
+        return
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
     # Average deviation by hour
@@ -367,6 +347,13 @@ def plot_intraday_patterns(hourly_df):
     print("Saved: 27_intraday_patterns.png")
 
 
+def plot_first_reversions(reversion):
+    """Plot the first-deviation events of analyze_mean_reversion_statistics()"""
+    reversion_df, _ = reversion
+    if len(reversion_df) > 0:
+        plot_mean_reversion_statistics(reversion_df)
+
+
 def plot_mean_reversion_statistics(reversion_df):
     """Plot mean reversion statistical analysis"""
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -483,7 +470,7 @@ def plot_advanced_metrics(metrics):
 
     # Return distribution
     ax3 = axes[1, 0]
-    results = pd.read_csv('result/FemboyLover/FemboyLover_portfolio_summary.csv')
+    results = pd.read_csv(PORTFOLIO_SUMMARY)
     returns = results['Return rate'].diff().fillna(results['Return rate'].iloc[0])
 
     ax3.hist(returns, bins=15, color='steelblue', edgecolor='black', alpha=0.7)
@@ -543,7 +530,7 @@ def plot_profit_attribution():
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
     # Load transaction summary
-    results = pd.read_csv('result/FemboyLover/FemboyLover_portfolios_transaction_summary.csv')
+    results = pd.read_csv(TRANSACTION_SUMMARY)
     results = results[results['Symbol'] != 'TOTAL']
 
     # Calculate profit per symbol
@@ -702,43 +689,38 @@ def plot_sensitivity_analysis():
     print("Saved: 31_sensitivity_analysis.png")
 
 
-def main():
+# Report steps (see build_report.py): cost, intraday, reversion and metrics data, then figures 26-31.
+JOBS = [
+    Pipeline.Job('cost_data', analyze_transaction_costs_detailed, inputs=[TRANSACTION_SUMMARY]),
+    Pipeline.Job('hourly_df', analyze_intraday_patterns, inputs=Replay.tick_files(INTRADAY_DATES, TICKS_DIR)),
+    Pipeline.Job('reversion', analyze_mean_reversion_statistics, inputs=Replay.tick_files(REVERSION_DATES, TICKS_DIR)),
+    Pipeline.Job('metrics', calculate_advanced_metrics, inputs=[PORTFOLIO_SUMMARY]),
+    Pipeline.figure(FIGURES_DIR, '26_transaction_cost_analysis.png', plot_transaction_cost_breakdown, ['cost_data']),
+    Pipeline.figure(FIGURES_DIR, '27_intraday_patterns.png', plot_intraday_patterns, ['hourly_df']),
+    Pipeline.figure(FIGURES_DIR, '28_mean_reversion_stats.png', plot_first_reversions, ['reversion']),
+    Pipeline.figure(FIGURES_DIR, '29_advanced_metrics.png', plot_advanced_metrics, ['metrics'],
+                    inputs=[PORTFOLIO_SUMMARY]),
+    Pipeline.figure(FIGURES_DIR, '30_profit_attribution.png', plot_profit_attribution, inputs=[TRANSACTION_SUMMARY]),
+    Pipeline.figure(FIGURES_DIR, '31_sensitivity_analysis.png', plot_sensitivity_analysis),
+]
+
+
+def main(workers=None):
     print("=" * 70)
     print("REFINED REPORT ANALYSIS - Committee Quality Standards")
     print("=" * 70)
 
-    # 1. Transaction cost analysis
-    print("\n[1/6] Analyzing transaction costs...")
-    cost_data = analyze_transaction_costs_detailed()
-    plot_transaction_cost_breakdown(cost_data)
+    results = Pipeline.run(JOBS, workers)
 
-    # 2. Intraday patterns
-    print("\n[2/6] Analyzing intraday patterns...")
-    hourly_df = analyze_intraday_patterns()
-    if len(hourly_df) > 0:
-        plot_intraday_patterns(hourly_df)
-
-    # 3. Mean reversion statistics
-    print("\n[3/6] Analyzing mean reversion statistics...")
-    reversion_df = analyze_mean_reversion_statistics()
-    if len(reversion_df) > 0:
-        plot_mean_reversion_statistics(reversion_df)
+    _, threshold_df = results['reversion']
+    if len(threshold_df) > 0:
+        print("\nReversion by entry threshold (% below VWAP, within 100 ticks):")
+        print(threshold_df.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
 
-    # 4. Advanced metrics
-    print("\n[4/6] Calculating advanced metrics...")
-    metrics = calculate_advanced_metrics()
-    plot_advanced_metrics(metrics)
-    print(f"   Sharpe Ratio: {metrics['sharpe_ratio']:.2f}")
-    print(f"   Sortino Ratio: {metrics['sortino_ratio']:.2f}")
-    print(f"   Profit Factor: {metrics['profit_factor']:.2f}")
-
-    # 5. Profit attribution
-    print("\n[5/6] Analyzing profit attribution...")
-    plot_profit_attribution()
-
-    # 6. Sensitivity analysis
-    print("\n[6/6] Running sensitivity analysis...")
-    plot_sensitivity_analysis()
+    metrics = results['metrics']
+    print(f"\nSharpe Ratio: {metrics['sharpe_ratio']:.2f}")
+    print(f"Sortino Ratio: {metrics['sortino_ratio']:.2f}")
+    print(f"Profit Factor: {metrics['profit_factor']:.2f}")
 
     print("\n" + "=" * 70)
     print("All refined visualizations generated!")
@@ -0,0 +1,16 @@
+"""
+Report Cache - the memo cache shared by the report analyses
+
+Intermediate results of the final, refined and normal-day analyses are reused
+while their code, parameters and tick files are unchanged (size-bounded, least
+recently used results evicted). Their memoized steps list the tick files they
+read with Replay.tick_files().
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from tradeSim import Memo
+
+MEMO = Memo.MemoCache(Path(__file__).parent / "cache")
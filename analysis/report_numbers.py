@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Report Numbers - refreshes the performance summary of the markdown reports
+
+The "Competition Performance Summary" tables of FINAL_COMPETITION_REPORT*.md
+are filled from the portfolio summary CSV (return, drawdown, trades, win rate,
+Calmar ratio, data period) and the advanced metrics of
+refined_report_analysis.calculate_advanced_metrics() (Sharpe, Sortino, profit
+factor). Only the value cells change; the text around them is left as written.
+"""
+
+import re
+import pandas as pd
+
+# Summary table metric -> value cell, from the last portfolio summary row (s) and the advanced metrics (m)
+REPORT_VALUES = {
+    'Return Rate': lambda s, m: f"{s['Return rate']:.2f}%",
+    'Max Drawdown': lambda s, m: f"{s['Max Drawdown (%)']:.2f}%",
+    'Total Trades': lambda s, m: f"{s['Number of Sells']:,}",
+    'Win Rate': lambda s, m: f"{s['Win Rate']:.1f}%",
+    'Calmar Ratio': lambda s, m: f"{s['Calmar Ratio']:.2f}",
+    'Sharpe Ratio': lambda s, m: f"{m['sharpe_ratio']:.2f}",
+    'Sortino Ratio': lambda s, m: f"{m['sortino_ratio']:.2f}",
+    'Profit Factor': lambda s, m: f"{m['profit_factor']:.2f}",
+}
+
+
+def report_text(text, summary, metrics):
+    """
+    `text` with the summary table values and the data period replaced.
+    """
+    last = summary.iloc[-1]
+    for metric, value in REPORT_VALUES.items():
+        text = re.sub(rf"(\| \*\*{metric}\*\* \| \*\*)[^*]*(\*\* \|)",
+                      lambda match: match.group(1) + value(last, metrics) + match.group(2), text)
+
+    days = summary['Daily Ticks Time'].str[:10]
+    period = f"{days.iloc[0]} to {days.iloc[-1]} ({len(days)} trading days)"
+    return re.sub(r"(\*Data \w+: )\S+ to \S+ \(\d+ trading days\)", lambda match: match.group(1) + period, text)
+
+
+def update_report(report, summary_csv, metrics):
+    """
+    Refresh the numbers of a markdown report in place.
+    """
+    with open(report, encoding='utf-8', newline='') as file:
+        text = file.read()
+    updated = report_text(text, pd.read_csv(summary_csv), metrics)
+    if updated != text:
+        with open(report, 'w', encoding='utf-8', newline='') as file:
+            file.write(updated)
+        print(f"Updated: {report}")
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Fast what-if run: every competition day starts flat from the same cash level and
+all days run concurrently. Per-day results are stitched into one portfolio summary.
+Only meaningful for strategies that liquidate before the close.
+"""
+
+from tradeSim import Backtest
+
+team_name = "FemboyLover_FlatStart"
+strategy_name = "IntradayMeanReversion"
+start_cash = 10_000_000.0
+
+if __name__ == "__main__":
+    Backtest.main([
+        "--strategy", strategy_name,
+        "--team", team_name,
+        "--start", "2025-11-10",
+        "--end", "2025-11-27",
+        "--flat-start",
+        "--start-cash", str(start_cash),
+        "--fresh",
+    ])
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Compare several strategies over the competition period with one pass over the ticks.
+Every strategy trades its own isolated portfolio (result/<team>_<strategy>/).
+"""
+
+from tradeSim import Backtest
+
+team_name = "FemboyLover"
+strategy_names = ["IntradayMeanReversion", "HybridVWAP"]
+
+if __name__ == "__main__":
+    argv = ["--team", team_name, "--start", "2025-11-10", "--end", "2025-11-27", "--fresh"]
+    for strategy_name in strategy_names:
+        argv += ["--strategy", strategy_name]
+    Backtest.main(argv)
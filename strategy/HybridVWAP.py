@@ -1,4 +1,9 @@
 from strategy.Strategies_template import Strategy_template
+from strategy.indicators import CumulativeVWAP, DistinctPrices
+from tradeSim import Features
+from tradeSim.StrategyHandler import SharedStrategyHandler
+from tradeSim import Universe
+import numpy as np
 import datetime
 
 class HybridVWAP(Strategy_template):
@@ -12,6 +17,10 @@ class HybridVWAP(Strategy_template):
     (TCR = % of stocks trading at <= 2 unique price levels)
     """
 
+    # attributes that change during the day, restored when a day resumes mid-day
+    state_fields = ("is_anomaly_mode", "mode_checked_today", "current_date", "position_size_thb",
+                    "buy_trigger_pct", "take_profit_pct", "stop_loss_pct", "buy_price", "vwap", "unique_prices")
+
     def __init__(self, handler):
         team_name = "FemboyLover"
         strategy_name = "HybridVWAP"
@@ -21,6 +30,7 @@ class HybridVWAP(Strategy_template):
         # Mode tracking
         self.is_anomaly_mode = False
         self.mode_check_time = datetime.time(10, 30)  # Check at 10:30
+        self.mode_check_after = Features.seconds_after_open(self.mode_check_time)
         self.mode_checked_today = False
         self.current_date = None
 
@@ -44,32 +54,38 @@ class HybridVWAP(Strategy_template):
 
         self.stop_new_trades_time = datetime.time(16, 20)
         self.liquidate_time = datetime.time(16, 25)
-
-        self.symbol_data = {}
-
-    def _init_symbol_data(self, symbol):
-        if symbol not in self.symbol_data:
-            self.symbol_data[symbol] = {
-                'vwap_num': 0.0,
-                'vwap_den': 0.0,
-                'vwap': 0.0,
-                'buy_price': 0.0,
-                'unique_prices': set(),
-            }
+        self.stop_new_trades_after = Features.seconds_after_open(self.stop_new_trades_time)
+        self.liquidate_after = Features.seconds_after_open(self.liquidate_time)
+
+        # per-symbol state, indexed by universe id (names only in orders and logs)
+        self.buy_price = []
+        self.vwap = CumulativeVWAP()
+        self.unique_prices = DistinctPrices()
+
+        # With one shared handler the engine's MarketState already sees every symbol
+        # and counts the same clustered/traded symbols; per-symbol handlers see one
+        # symbol each and a hand-written loop has no engine, so those count their own.
+        market_state = handler.get_market_state() if isinstance(handler, SharedStrategyHandler) else None
+        self.market_state = market_state if market_state is not None and market_state.cluster_levels == 2 else None
+
+    def _symbol_id(self, row):
+        sid = row.get(Universe.SYMBOL_ID_COLUMN)
+        if sid is None:
+            sid = Universe.default_universe().intern(row['ShareCode'])
+        sid = int(sid)
+        while len(self.buy_price) <= sid:
+            self.buy_price.append(0.0)
+        return sid
 
     def _calculate_tcr(self):
         """Calculate Tick Clustering Ratio - % of stocks at <= 2 price levels"""
-        if not self.symbol_data:
-            return 0
-
-        clustered = 0
-        total = 0
+        if self.market_state is not None:
+            return self.market_state.tcr
 
-        for symbol, data in self.symbol_data.items():
-            if data['vwap_den'] > 0:  # Has been traded
-                total += 1
-                if len(data['unique_prices']) <= 2:
-                    clustered += 1
+        counts = self.unique_prices.counts
+        traded = counts > 0
+        total = np.count_nonzero(traded)
+        clustered = np.count_nonzero(counts[traded] <= 2)
 
         return (clustered / total * 100) if total > 0 else 0
 
@@ -94,8 +110,10 @@ class HybridVWAP(Strategy_template):
         price = row['LastPrice']
         volume = row['Volume']
         timestamp = row['TradeDateTime']
-        current_time = timestamp.time()
         current_date = timestamp.date()
+        elapsed = row.get(Features.SECONDS_SINCE_OPEN)
+        if elapsed is None:
+            elapsed = Features.seconds_since_open(timestamp)
 
         if price <= 0 or volume <= 0:
             return
@@ -107,26 +125,23 @@ class HybridVWAP(Strategy_template):
             self.is_anomaly_mode = False
             self._switch_to_normal_mode()
             # Reset unique prices tracking for new day
-            for sym_data in self.symbol_data.values():
-                sym_data['unique_prices'] = set()
+            self.unique_prices.reset()
 
-        if symbol not in self.symbol_data:
-            self._init_symbol_data(symbol)
-        data = self.symbol_data[symbol]
+        sid = self._symbol_id(row)
 
         # Track unique prices for TCR calculation
-        data['unique_prices'].add(price)
-
-        # Update VWAP
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        if data['vwap_den'] > 0:
-            data['vwap'] = data['vwap_num'] / data['vwap_den']
-        else:
-            return
+        if self.market_state is None:
+            self.unique_prices.update(sid, price)
+
+        # Update VWAP (precomputed by the replay engine; a hand-written loop updates the indicator)
+        vwap = row.get(Features.CUM_VWAP)
+        if vwap is None:
+            vwap = self.vwap.update(sid, price, volume)
+            if self.vwap.den[sid] <= 0:
+                return
 
         # Check for anomaly mode at 10:30
-        if not self.mode_checked_today and current_time >= self.mode_check_time:
+        if not self.mode_checked_today and elapsed >= self.mode_check_after:
             self.mode_checked_today = True
             tcr = self._calculate_tcr()
 
@@ -138,25 +153,25 @@ class HybridVWAP(Strategy_template):
 
         # Sell Logic
         if currently_has_position:
-            if data['buy_price'] == 0.0:
+            if self.buy_price[sid] == 0.0:
                 stocks = self.handler.get_stock_by_symbol(symbol)
                 if stocks:
                     total_cost = sum(s.get_buy_price() * s.get_start_vol() for s in stocks)
                     total_vol = sum(s.get_start_vol() for s in stocks)
                     if total_vol > 0:
-                        data['buy_price'] = total_cost / total_vol
+                        self.buy_price[sid] = total_cost / total_vol
                     else:
                         return
                 else:
                     return
 
-            take_profit_price = data['vwap'] * self.take_profit_pct
-            stop_loss_price = data['buy_price'] * self.stop_loss_pct
+            take_profit_price = vwap * self.take_profit_pct
+            stop_loss_price = self.buy_price[sid] * self.stop_loss_pct
 
             sell = False
 
             # EOD Liquidation
-            if current_time >= self.liquidate_time:
+            if elapsed >= self.liquidate_after:
                 sell = True
 
             # Take Profit
@@ -169,18 +184,18 @@ class HybridVWAP(Strategy_template):
 
             if sell:
                 self.handler.create_order_to_limit(total_volume_held, price, "Sell", symbol)
-                data['buy_price'] = 0.0
+                self.buy_price[sid] = 0.0
 
         # Buy Logic
         else:
-            if data['buy_price'] != 0.0:
-                data['buy_price'] = 0.0
+            if self.buy_price[sid] != 0.0:
+                self.buy_price[sid] = 0.0
 
             # Don't trade near market close
-            if current_time >= self.stop_new_trades_time:
+            if elapsed >= self.stop_new_trades_after:
                 return
 
-            buy_trigger_price = data['vwap'] * self.buy_trigger_pct
+            buy_trigger_price = vwap * self.buy_trigger_pct
 
             if price <= buy_trigger_price:
                 if self.handler.get_cash_balance() > self.position_size_thb:
@@ -188,4 +203,4 @@ class HybridVWAP(Strategy_template):
 
                     if volume_to_buy >= 100:
                         self.handler.create_order_to_limit(volume_to_buy, price, "Buy", symbol)
-                        data['buy_price'] = 1.0
+                        self.buy_price[sid] = 1.0
@@ -1,7 +1,13 @@
 from strategy.Strategies_template import Strategy_template
+from strategy.indicators import CumulativeVWAP
+from tradeSim import Features
+from tradeSim import Universe
 import datetime
 
 class IntradayMeanReversion(Strategy_template):
+    # attributes that change during the day, restored when a day resumes mid-day
+    state_fields = ("buy_price", "vwap")
+
     def __init__(self, handler):
 
         team_name = "FemboyLover"  
@@ -15,63 +21,66 @@ class IntradayMeanReversion(Strategy_template):
         
         self.stop_new_trades_time = datetime.time(16, 20)
         self.liquidate_time = datetime.time(16, 25)
+        self.stop_new_trades_after = Features.seconds_after_open(self.stop_new_trades_time)
+        self.liquidate_after = Features.seconds_after_open(self.liquidate_time)
         
-        self.symbol_data = {}
+        # per-symbol state, indexed by universe id (names only in orders and logs)
+        self.buy_price = []
+        self.vwap = CumulativeVWAP()
 
-    def _init_symbol_data(self, symbol):
-        if symbol not in self.symbol_data:
-            self.symbol_data[symbol] = {
-                'vwap_num': 0.0,
-                'vwap_den': 0.0,
-                'vwap': 0.0,
-                'buy_price': 0.0,
-            }
+    def _symbol_id(self, row):
+        sid = row.get(Universe.SYMBOL_ID_COLUMN)
+        if sid is None:
+            sid = Universe.default_universe().intern(row['ShareCode'])
+        sid = int(sid)
+        while len(self.buy_price) <= sid:
+            self.buy_price.append(0.0)
+        return sid
 
     def on_data(self, row):
         symbol = row['ShareCode']
         price = row['LastPrice']
         volume = row['Volume']
-        timestamp = row['TradeDateTime']
-        current_time = timestamp.time()
+        elapsed = row.get(Features.SECONDS_SINCE_OPEN)
+        if elapsed is None:
+            elapsed = Features.seconds_since_open(row['TradeDateTime'])
         
         if price <= 0 or volume <= 0:
             return
         
-        if symbol not in self.symbol_data:
-            self._init_symbol_data(symbol)
-        data = self.symbol_data[symbol]
+        sid = self._symbol_id(row)
 
-        data['vwap_num'] += price * volume
-        data['vwap_den'] += volume
-        if data['vwap_den'] > 0:
-            data['vwap'] = data['vwap_num'] / data['vwap_den']
-        else:
-            return
+        # precomputed by the replay engine; a hand-written loop updates the indicator
+        vwap = row.get(Features.CUM_VWAP)
+        if vwap is None:
+            vwap = self.vwap.update(sid, price, volume)
+            if self.vwap.den[sid] <= 0:
+                return
 
         total_volume_held = self.handler.get_total_stock_volume_by_symbol(symbol)
         currently_has_position = total_volume_held > 0
 
         # Sell Logic
         if currently_has_position:
-            if data['buy_price'] == 0.0:
+            if self.buy_price[sid] == 0.0:
                 stocks = self.handler.get_stock_by_symbol(symbol)
                 if stocks:
                     total_cost = sum(s.get_buy_price() * s.get_start_vol() for s in stocks)
                     total_vol = sum(s.get_start_vol() for s in stocks)
                     if total_vol > 0:
-                        data['buy_price'] = total_cost / total_vol
+                        self.buy_price[sid] = total_cost / total_vol
                     else:
                         return
                 else:
                     return
             
-            take_profit_price = data['vwap']
-            stop_loss_price = data['buy_price'] * self.stop_loss_pct
+            take_profit_price = vwap
+            stop_loss_price = self.buy_price[sid] * self.stop_loss_pct
             
             sell = False
             
             # EOD Liquidation
-            if current_time >= self.liquidate_time:
+            if elapsed >= self.liquidate_after:
                 sell = True
             
             # Take Profit
@@ -84,19 +93,19 @@ class IntradayMeanReversion(Strategy_template):
 
             if sell:
                 self.handler.create_order_to_limit(total_volume_held, price, "Sell", symbol)
-                data['buy_price'] = 0.0
+                self.buy_price[sid] = 0.0
 
         # Buy Logic
         else:
-            if data['buy_price'] != 0.0:
-                data['buy_price'] = 0.0
+            if self.buy_price[sid] != 0.0:
+                self.buy_price[sid] = 0.0
                 
             # Don't trade near market close
-            if current_time >= self.stop_new_trades_time:
+            if elapsed >= self.stop_new_trades_after:
                 return # Too late to open a new position
                 
             # Check Buy Signal : Price 1.5% below VWAP
-            buy_trigger_price = data['vwap'] * self.buy_trigger_pct
+            buy_trigger_price = vwap * self.buy_trigger_pct
             
             if price <= buy_trigger_price:
                 if self.handler.get_cash_balance() > self.position_size_thb:
@@ -104,4 +113,4 @@ class IntradayMeanReversion(Strategy_template):
                     
                     if volume_to_buy >= 100:
                         self.handler.create_order_to_limit(volume_to_buy, price, "Buy", symbol)
-                        data['buy_price'] = 1.0
\ No newline at end of file
+                        self.buy_price[sid] = 1.0
\ No newline at end of file
@@ -0,0 +1,427 @@
+"""
+Streaming indicators for strategies.
+
+Every indicator keeps its state per symbol in NumPy arrays indexed by an integer
+symbol id (0, 1, 2, ...) and is updated in O(1) per tick:
+
+    vwap = CumulativeVWAP()
+    value = vwap.update(sid, price, volume)      # inside on_data
+
+The same indicator can be evaluated over whole NumPy columns of a day:
+
+    values = CumulativeVWAP.batch(sids, prices, volumes)
+
+batch() returns, for every row, exactly the value update() would have returned
+for that row when the rows are fed in order. Cumulative indicators and rolling
+min/max are vectorized per symbol; indicators whose value depends on the order
+of floating point additions (EMA, windowed VWAP, rolling mean/std) replay the
+streaming update so both paths stay bit-identical.
+
+get_state() returns the state as plain lists (JSON-friendly) and set_state()
+restores it, e.g. to resume a strategy mid-day (see tradeSim/Journal.py).
+"""
+
+from collections import deque
+import numpy as np
+
+
+def _segments(sids):
+    """
+    Stable grouping of row positions by symbol id: yields (sid, positions).
+    """
+    sids = np.asarray(sids)
+    order = np.argsort(sids, kind="stable")
+    sorted_sids = sids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_sids[1:] != sorted_sids[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    for start, end in zip(starts, ends):
+        yield sorted_sids[start], order[start:end]
+
+
+def _group_cumsum(sids, values):
+    """
+    Running sum of `values` per symbol, summed in row order (same rounding as +=).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    for _, idx in _segments(sids):
+        out[idx] = np.cumsum(values[idx])
+    return out
+
+
+class _PerSymbol:
+    """
+    Base class: named float64 state arrays that grow with the largest symbol id.
+    """
+
+    _fields = ()
+    # extra per-symbol arrays that are part of the state (e.g. ring buffers)
+    _buffers = ()
+    _initial = {}
+
+    def __init__(self, n_symbols=0):
+        self._capacity = 0
+        for name in self._fields:
+            setattr(self, name, np.zeros(0))
+        self._grow(max(n_symbols, 1))
+
+    def _grow(self, capacity):
+        old = self._capacity
+        for name in self._fields:
+            arr = np.resize(getattr(self, name), capacity)
+            arr[old:] = self._initial.get(name, 0.0)
+            setattr(self, name, arr)
+        self._capacity = capacity
+
+    def _ensure(self, sid):
+        if sid >= self._capacity:
+            self._grow(max(sid + 1, 2 * self._capacity))
+
+    def reset(self, sid=None):
+        """
+        Clear the state of one symbol, or of every symbol when sid is None.
+        """
+        for name in self._fields:
+            arr = getattr(self, name)
+            if sid is None:
+                arr[:] = self._initial.get(name, 0.0)
+            elif sid < self._capacity:
+                arr[sid] = self._initial.get(name, 0.0)
+
+    def get_state(self):
+        return {name: getattr(self, name).tolist() for name in self._fields + self._buffers}
+
+    def set_state(self, state):
+        for name in self._fields + self._buffers:
+            setattr(self, name, np.array(state[name], dtype=np.float64))
+        self._capacity = len(state[self._fields[0]])
+
+    @classmethod
+    def _replay(cls, sids, *columns, **kwargs):
+        """
+        batch() fallback: feed the rows through update() in order.
+        """
+        sids = np.asarray(sids)
+        indicator = cls(int(sids.max()) + 1 if len(sids) else 0, **kwargs)
+        out = np.empty(len(sids))
+        update = indicator.update
+        for i, row in enumerate(zip(sids.tolist(), *(np.asarray(c).tolist() for c in columns))):
+            out[i] = update(*row)
+        return out
+
+
+class CumulativeVWAP(_PerSymbol):
+    """
+    Volume weighted average price since the start of the day.
+    """
+
+    _fields = ("num", "den", "vwap")
+
+    def update(self, sid, price, volume):
+        self._ensure(sid)
+        self.num[sid] += price * volume
+        self.den[sid] += volume
+        if self.den[sid] > 0:
+            self.vwap[sid] = self.num[sid] / self.den[sid]
+        return self.vwap[sid]
+
+    @staticmethod
+    def batch(sids, prices, volumes):
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        num = _group_cumsum(sids, prices * volumes)
+        den = _group_cumsum(sids, volumes)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = num / den
+        # before the first traded volume update() keeps returning 0
+        return np.where(den > 0, vwap, 0.0)
+
+
+class WindowedVWAP(_PerSymbol):
+    """
+    VWAP of the last `window` ticks of each symbol (ring buffer of price*volume, volume).
+    """
+
+    _fields = ("num", "den", "count")
+    _buffers = ("_pv", "_v")
+
+    def __init__(self, n_symbols=0, window=30):
+        self.window = window
+        self._pv = np.zeros((0, window))
+        self._v = np.zeros((0, window))
+        super().__init__(n_symbols)
+
+    def _grow(self, capacity):
+        old = self._capacity
+        super()._grow(capacity)
+        for name in ("_pv", "_v"):
+            buf = np.zeros((capacity, self.window))
+            buf[:old] = getattr(self, name)[:old]
+            setattr(self, name, buf)
+
+    def reset(self, sid=None):
+        super().reset(sid)
+        if sid is None:
+            self._pv[:] = 0.0
+            self._v[:] = 0.0
+        elif sid < self._capacity:
+            self._pv[sid] = 0.0
+            self._v[sid] = 0.0
+
+    def update(self, sid, price, volume):
+        self._ensure(sid)
+        slot = int(self.count[sid]) % self.window
+        pv = price * volume
+        self.num[sid] += pv - self._pv[sid, slot]
+        self.den[sid] += volume - self._v[sid, slot]
+        self._pv[sid, slot] = pv
+        self._v[sid, slot] = volume
+        self.count[sid] += 1
+        return self.num[sid] / self.den[sid] if self.den[sid] > 0 else 0.0
+
+    @classmethod
+    def batch(cls, sids, prices, volumes, window=30):
+        return cls._replay(sids, prices, volumes, window=window)
+
+
+class EMA(_PerSymbol):
+    """
+    Exponential moving average of price with alpha = 2 / (span + 1), seeded with
+    the first price of each symbol.
+    """
+
+    _fields = ("ema", "seen")
+
+    def __init__(self, n_symbols=0, span=20):
+        self.alpha = 2.0 / (span + 1)
+        super().__init__(n_symbols)
+
+    def update(self, sid, price):
+        self._ensure(sid)
+        if self.seen[sid]:
+            self.ema[sid] += self.alpha * (price - self.ema[sid])
+        else:
+            self.ema[sid] = price
+            self.seen[sid] = 1.0
+        return self.ema[sid]
+
+    @classmethod
+    def batch(cls, sids, prices, span=20):
+        return cls._replay(sids, prices, span=span)
+
+
+class RollingMeanStd(_PerSymbol):
+    """
+    Mean and sample standard deviation of the last `window` prices (windowed
+    Welford update). update() returns (mean, std); std is 0 until 2 values.
+    """
+
+    _fields = ("mean", "m2", "count")
+    _buffers = ("_buf",)
+
+    def __init__(self, n_symbols=0, window=20):
+        self.window = window
+        self._buf = np.zeros((0, window))
+        super().__init__(n_symbols)
+
+    def _grow(self, capacity):
+        old = self._capacity
+        super()._grow(capacity)
+        buf = np.zeros((capacity, self.window))
+        buf[:old] = self._buf[:old]
+        self._buf = buf
+
+    def reset(self, sid=None):
+        super().reset(sid)
+        if sid is None:
+            self._buf[:] = 0.0
+        elif sid < self._capacity:
+            self._buf[sid] = 0.0
+
+    def update(self, sid, price):
+        self._ensure(sid)
+        count = int(self.count[sid])
+        slot = count % self.window
+        mean = self.mean[sid]
+        if count < self.window:
+            n = count + 1
+            delta = price - mean
+            mean += delta / n
+            self.m2[sid] += delta * (price - mean)
+        else:
+            n = self.window
+            old = self._buf[sid, slot]
+            new_mean = mean + (price - old) / n
+            self.m2[sid] += (price - old) * (price - new_mean + old - mean)
+            mean = new_mean
+        self.mean[sid] = mean
+        self._buf[sid, slot] = price
+        self.count[sid] = count + 1
+        std = np.sqrt(max(self.m2[sid], 0.0) / (n - 1)) if n > 1 else 0.0
+        return mean, std
+
+    @classmethod
+    def batch(cls, sids, prices, window=20):
+        """
+        Returns (means, stds) arrays.
+        """
+        sids = np.asarray(sids)
+        indicator = cls(int(sids.max()) + 1 if len(sids) else 0, window=window)
+        means = np.empty(len(sids))
+        stds = np.empty(len(sids))
+        for i, (sid, price) in enumerate(zip(sids.tolist(), np.asarray(prices).tolist())):
+            means[i], stds[i] = indicator.update(sid, price)
+        return means, stds
+
+
+class RollingMinMax:
+    """
+    Minimum and maximum of the last `window` prices with monotonic deques
+    (amortised O(1) per tick). update() returns (min, max).
+    """
+
+    def __init__(self, n_symbols=0, window=30):
+        self.window = window
+        self._count = []
+        self._min = []
+        self._max = []
+        self._ensure(max(n_symbols, 1) - 1)
+
+    def _ensure(self, sid):
+        while len(self._count) <= sid:
+            self._count.append(0)
+            self._min.append(deque())
+            self._max.append(deque())
+
+    def reset(self, sid=None):
+        for s in (range(len(self._count)) if sid is None else [sid] if sid < len(self._count) else []):
+            self._count[s] = 0
+            self._min[s].clear()
+            self._max[s].clear()
+
+    def get_state(self):
+        return {"count": list(self._count),
+                "min": [[list(entry) for entry in lows] for lows in self._min],
+                "max": [[list(entry) for entry in highs] for highs in self._max]}
+
+    def set_state(self, state):
+        self._count = list(state["count"])
+        self._min = [deque(tuple(entry) for entry in lows) for lows in state["min"]]
+        self._max = [deque(tuple(entry) for entry in highs) for highs in state["max"]]
+
+    def update(self, sid, price):
+        self._ensure(sid)
+        i = self._count[sid]
+        self._count[sid] = i + 1
+        lows, highs = self._min[sid], self._max[sid]
+        while lows and lows[-1][1] >= price:
+            lows.pop()
+        lows.append((i, price))
+        while highs and highs[-1][1] <= price:
+            highs.pop()
+        highs.append((i, price))
+        expired = i - self.window
+        if lows[0][0] <= expired:
+            lows.popleft()
+        if highs[0][0] <= expired:
+            highs.popleft()
+        return lows[0][1], highs[0][1]
+
+    @staticmethod
+    def batch(sids, prices, window=30):
+        """
+        Returns (mins, maxs) arrays.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        mins = np.empty_like(prices)
+        maxs = np.empty_like(prices)
+        for _, idx in _segments(sids):
+            p = prices[idx]
+            head = min(window - 1, len(p))
+            mins[idx[:head]] = np.minimum.accumulate(p[:head])
+            maxs[idx[:head]] = np.maximum.accumulate(p[:head])
+            if len(p) >= window:
+                view = np.lib.stride_tricks.sliding_window_view(p, window)
+                mins[idx[window - 1:]] = view.min(axis=1)
+                maxs[idx[window - 1:]] = view.max(axis=1)
+        return mins, maxs
+
+
+class DistinctPrices:
+    """
+    Number of distinct prices traded per symbol (tick clustering input).
+    """
+
+    def __init__(self, n_symbols=0):
+        self._prices = []
+        self.counts = np.zeros(max(n_symbols, 1), dtype=np.int64)
+        self._ensure(max(n_symbols, 1) - 1)
+
+    def _ensure(self, sid):
+        while len(self._prices) <= sid:
+            self._prices.append(set())
+        if sid >= len(self.counts):
+            counts = np.zeros(max(sid + 1, 2 * len(self.counts)), dtype=np.int64)
+            counts[:len(self.counts)] = self.counts
+            self.counts = counts
+
+    def reset(self, sid=None):
+        for s in (range(len(self._prices)) if sid is None else [sid] if sid < len(self._prices) else []):
+            self._prices[s].clear()
+            self.counts[s] = 0
+
+    def get_state(self):
+        return {"prices": [sorted(prices) for prices in self._prices]}
+
+    def set_state(self, state):
+        self._prices = [set(prices) for prices in state["prices"]]
+        self.counts = np.array([len(prices) for prices in self._prices], dtype=np.int64)
+
+    def update(self, sid, price):
+        self._ensure(sid)
+        prices = self._prices[sid]
+        if price not in prices:
+            prices.add(price)
+            self.counts[sid] += 1
+        return self.counts[sid]
+
+    @staticmethod
+    def batch(sids, prices):
+        sids = np.asarray(sids)
+        prices = np.asarray(prices, dtype=np.float64)
+        order = np.lexsort((prices, sids))
+        s, p = sids[order], prices[order]
+        first = np.r_[True, (s[1:] != s[:-1]) | (p[1:] != p[:-1])]
+        is_new = np.zeros(len(sids))
+        # lexsort is stable, so the first of equal keys is the earliest row
+        is_new[order[first]] = 1.0
+        return _group_cumsum(sids, is_new).astype(np.int64)
+
+
+class FlagImbalance(_PerSymbol):
+    """
+    Cumulative Buy/Sell flagged volume per symbol. update() returns the buy
+    share of flagged volume in percent (50 before any flagged volume).
+    """
+
+    _fields = ("buy_volume", "sell_volume")
+
+    def update(self, sid, flag, volume):
+        self._ensure(sid)
+        if flag == "Buy":
+            self.buy_volume[sid] += volume
+        elif flag == "Sell":
+            self.sell_volume[sid] += volume
+        total = self.buy_volume[sid] + self.sell_volume[sid]
+        return self.buy_volume[sid] / total * 100 if total > 0 else 50.0
+
+    @staticmethod
+    def batch(sids, flags, volumes):
+        flags = np.asarray(flags)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        buy = _group_cumsum(sids, np.where(flags == "Buy", volumes, 0.0))
+        sell = _group_cumsum(sids, np.where(flags == "Sell", volumes, 0.0))
+        total = buy + sell
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = buy / total * 100
+        return np.where(total > 0, pct, 50.0)
@@ -0,0 +1,379 @@
+import argparse
+import contextlib
+import importlib
+import os
+import re
+import shutil
+import pandas as pd
+from . import TradeSim
+from . import Replay
+from . import Snapshot
+from . import Journal
+from . import Timestamps
+from . import DayParallel
+from . import Profiling
+from . import Universe
+from . import Streaming
+from . import Catalog
+
+NAME_PATTERN = r'^[A-Za-z0-9-_]{1,30}$'
+OUTPUTS = ("json", "snapshot", "both")
+
+
+def resolve_strategy(spec):
+    """
+    Turn a strategy spec into (module path, class name).
+
+    "HybridVWAP"                 -> strategy.HybridVWAP, HybridVWAP
+    "strategy.HybridVWAP"        -> strategy.HybridVWAP, HybridVWAP
+    "my_pkg.my_mod:MyStrategy"   -> my_pkg.my_mod, MyStrategy
+    """
+    if ":" in spec:
+        module_name, class_name = spec.split(":", 1)
+    elif "." in spec:
+        module_name, class_name = spec, spec.rsplit(".", 1)[1]
+    else:
+        module_name, class_name = f"strategy.{spec}", spec
+    return module_name, class_name
+
+
+def load_strategy(spec):
+    module_name, class_name = resolve_strategy(spec)
+    strategy_module = importlib.import_module(module_name)
+    importlib.reload(strategy_module)
+    strategy_class = getattr(strategy_module, class_name, None)
+    if strategy_class is None:
+        raise ValueError(f"Strategy class {class_name} not found in module {module_name}")
+    return strategy_class
+
+
+def _open_sim(team_name, output, journal):
+    if output in ("snapshot", "both") and os.path.exists(Snapshot.snapshot_path(team_name)):
+        trading_Sim = TradeSim.tradeSim.from_snapshot(team_name)
+        trading_Sim.start_new_day()
+        if journal:
+            trading_Sim.enable_journal()
+        print(f"[INFO] Loaded existing portfolio from '{Snapshot.snapshot_path(team_name)}'")
+        return trading_Sim
+    return TradeSim.tradeSim(team_name, journal=journal)
+
+
+def summary_path(team_name):
+    return os.path.join("result", team_name, f"{team_name}_portfolio_summary.csv")
+
+
+def closed_days(team_name):
+    """
+    Daily results of the days already in the team's portfolio summary, by date.
+    """
+    if not os.path.exists(summary_path(team_name)):
+        return {}
+    summary = pd.read_csv(summary_path(team_name))
+    return {
+        row['Daily Ticks Time'][:10]: {'date': row['Daily Ticks Time'][:10], 'nav': row['Net Asset Value'],
+                                       'return_pct': row['Return rate'], 'wins': row['Number of Wins'],
+                                       'sells': row['Number of Sells']}
+        for _, row in summary.iterrows()
+    }
+
+
+def _resume_sim(team_name, output, closed):
+    """
+    Simulation to continue an interrupted journaled run with: the last snapshot
+    plus the journal up to its last resume point (Journal.recover), or the
+    last closed day rolled over to the next one.
+    """
+    if not os.path.exists(Snapshot.snapshot_path(team_name)):
+        return _open_sim(team_name, output, journal=True)
+
+    fills = [r for r in Journal.read_journal(Journal.journal_path(team_name)) if Journal.is_fill(r)]
+    if fills:
+        day = Timestamps.format_ns(Timestamps.normalize(fills[-1]["timestamp"]), "%Y-%m-%d")
+        if day in closed:
+            raise SystemExit(f"{team_name}: {day} is in the portfolio summary but its fills are still journaled "
+                             f"(interrupted while closing the day); rerun it from the previous day's results.")
+
+    trading_Sim, last_timestamp = Journal.recover(team_name, resume=True)
+    if trading_Sim.resume_point is None:
+        trading_Sim.start_new_day()
+        print(f"[INFO] {team_name}: resuming at the start of a day")
+    else:
+        print(f"[INFO] {team_name}: resuming after tick {trading_Sim.resume_point.tick} "
+              f"(last fill at {Timestamps.format_ns(last_timestamp)})")
+    return trading_Sim
+
+
+def print_final_report(port_info):
+    print(f"\nTeam: {port_info['Owner']}")
+    print(f"Initial Capital: 10,000,000.00 THB")
+    print(f"Final NAV: {port_info['Net Asset Value']:,.2f} THB")
+    print(f"Cash Balance: {port_info['Cash Balance']:,.2f} THB")
+    print(f"Stocks Held: {port_info['Number of Stocks']}")
+    print(f"\n--- Performance Metrics ---")
+    print(f"Return Rate: {port_info['Return rate']:.4f}%")
+    print(f"Max Drawdown: {port_info['Max Drawdown (%)']:.2f}%" if port_info['Max Drawdown (%)'] else "Max Drawdown: N/A")
+    print(f"Calmar Ratio: {port_info['Calmar Ratio']:.4f}" if port_info['Calmar Ratio'] else "Calmar Ratio: N/A")
+    print(f"Total Trades (Sells): {port_info['Number of Sells']}")
+    print(f"Winning Trades: {port_info['Number of Wins']}")
+    print(f"Win Rate: {port_info['Win Rate']:.2f}%")
+
+    print(f"\n--- Competition Minimum Requirements Check ---")
+    return_ok = port_info['Return rate'] > 5
+    dd_ok = port_info['Max Drawdown (%)'] is None or abs(port_info['Max Drawdown (%)']) < 30
+    trades_ok = port_info['Number of Sells'] > 20
+    wr_ok = port_info['Win Rate'] > 20
+
+    print(f"[{'PASS' if return_ok else 'FAIL'}] Return > 5%: {port_info['Return rate']:.4f}%")
+    print(f"[{'PASS' if dd_ok else 'FAIL'}] Max Drawdown < 30%: {abs(port_info['Max Drawdown (%)'] or 0):.2f}%")
+    print(f"[{'PASS' if trades_ok else 'FAIL'}] Trades > 20: {port_info['Number of Sells']}")
+    print(f"[{'PASS' if wr_ok else 'FAIL'}] Win Rate > 20%: {port_info['Win Rate']:.2f}%")
+
+    if all([return_ok, dd_ok, trades_ok, wr_ok]):
+        print(f"\n*** ALL MINIMUM REQUIREMENTS MET ***")
+    else:
+        print(f"\n*** SOME REQUIREMENTS NOT MET ***")
+
+
+def run(
+    strategies,
+    team_name,
+    dates,
+    engine="vectorized",
+    output="json",
+    journal=False,
+    ticks_dir=Replay.TICKS_DIR,
+    shared_handler=None,
+    profile=None,
+    trace_memory=False,
+    chunk_rows=None,
+    resume=False,
+):
+    """
+    Replay `dates` sequentially for one or more strategies in a single pass per day.
+
+    With one strategy the results go to result/<team_name>/; with several, every
+    strategy trades its own portfolio in result/<team_name>_<strategy>/.
+
+    profile ("cprofile" or "sample") and trace_memory profile the load, replay and
+    close stages of every day into result/<team_name>/profile/ (see Profiling.py).
+
+    chunk_rows streams every day from disk in blocks of about that many rows
+    (see Streaming.TickStream) instead of loading it whole; the fills are the same.
+
+    resume=True continues an interrupted run (journaled, so resume implies
+    journal=True): the days already in the portfolio summary are skipped and the
+    unfinished day continues from its last resume point (see Journal.recover),
+    giving the same fills and summary as an uninterrupted run.
+
+    Returns
+    -------
+    dict
+        team name -> list of daily result dicts (date, nav, return_pct, wins, sells).
+    """
+    books = []
+    daily_results = {}
+    for spec in strategies:
+        strategy_class = load_strategy(spec)
+        book_team = team_name if len(strategies) == 1 else f"{team_name}_{strategy_class.__name__}"
+        if resume:
+            journal = True
+            closed = closed_days(book_team)
+            remaining = [d for d in dates if d not in closed]
+            if books and remaining != dates_left:
+                raise SystemExit("The strategies stopped on different days; resume them one by one.")
+            dates_left = remaining
+            trading_Sim = _resume_sim(book_team, output, closed)
+            daily_results[book_team] = [closed[d] for d in dates if d in closed]
+        else:
+            trading_Sim = _open_sim(book_team, output, journal)
+            daily_results[book_team] = []
+        books.append(Replay.StrategyBook(book_team, strategy_class, trading_Sim=trading_Sim,
+                                         shared_handler=shared_handler, resume=trading_Sim.resume_point))
+    if resume:
+        print(f"[INFO] {len(dates) - len(dates_left)} of {len(dates)} days already done")
+        dates = dates_left
+
+    profiler = None
+    if profile or trace_memory:
+        profiler = Profiling.DayProfiler(os.path.join("result", team_name, "profile"), profile,
+                                         trace_memory=trace_memory)
+
+    for i, date in enumerate(dates):
+        print(f"\n[Day {i+1}/{len(dates)}] {date}")
+        if profiler:
+            profiler.start_day(date)
+
+        with _stage(profiler, "load"):
+            if chunk_rows:
+                df = Streaming.TickStream(Replay.tick_file(date, ticks_dir), chunk_rows)
+                trading_date = df.trading_date
+            else:
+                df = Replay.load_day(Replay.tick_file(date, ticks_dir))
+                trading_date = df['TradeDateTime'].dt.date.iloc[0]
+
+        for book in books:
+            if i > 0:
+                book.trading_Sim.start_new_day()
+            if journal and book.resume is None:
+                # day-start checkpoint: Journal.recover() rebuilds from here plus today's fills
+                book.trading_Sim.save_snapshot()
+
+        with _stage(profiler, "replay"):
+            try:
+                if len(books) == 1:
+                    Replay.run_day(books[0].trading_Sim, df, books[0].strategy_class, engine,
+                                   books[0].shared_handler, resume=books[0].resume)
+                else:
+                    Replay.run_day_multi(books, df, engine)
+            finally:
+                if chunk_rows:
+                    df.close()
+            for book in books:
+                book.resume = None
+
+        with _stage(profiler, "close"):
+            for book in books:
+                Replay.close_day(book.trading_Sim, book.team_name, trading_date, output)
+
+        if profiler:
+            profiler.print_day()
+            for path in profiler.end_day():
+                print(f"  [profile] wrote {path}")
+
+        for book in books:
+            port_info = book.trading_Sim.get_strategy_runner().get_portfolio_info()
+            print(f"  {book.team_name}: NAV: {port_info['Net Asset Value']:,.2f} THB | "
+                  f"Return: {port_info['Return rate']:.4f}% | "
+                  f"W/S: {port_info['Number of Wins']}/{port_info['Number of Sells']}")
+            daily_results[book.team_name].append({
+                'date': date, 'nav': port_info['Net Asset Value'],
+                'return_pct': port_info['Return rate'],
+                'wins': port_info['Number of Wins'], 'sells': port_info['Number of Sells']
+            })
+
+    for book in books:
+        print(f"\n{'=' * 60}")
+        print(f"FINAL RESULTS - {book.team_name}")
+        print(f"{'=' * 60}")
+        print_final_report(book.trading_Sim.get_strategy_runner().get_portfolio_info())
+        pd.DataFrame(daily_results[book.team_name]).to_csv(
+            os.path.join("result", book.team_name, "daily_results.csv"), index=False
+        )
+        print(f"\nResults saved to: result/{book.team_name}/")
+
+    return daily_results
+
+
+def _stage(profiler, name):
+    return profiler.stage(name) if profiler else contextlib.nullcontext()
+
+
+def run_flat_start(strategies, team_name, dates, start_cash, workers, engine="vectorized", ticks_dir=Replay.TICKS_DIR,
+                   shared_handler=None):
+    """
+    Flat-start what-if run (see DayParallel.run_flat_start_days) for each strategy.
+    """
+    daily_results = {}
+    for spec in strategies:
+        module_name, class_name = resolve_strategy(spec)
+        book_team = team_name if len(strategies) == 1 else f"{team_name}_{class_name}"
+        results = DayParallel.run_flat_start_days(
+            book_team, module_name, class_name, dates,
+            start_cash=start_cash, workers=workers, ticks_dir=ticks_dir, engine=engine,
+            shared_handler=shared_handler,
+        )
+        for day in results:
+            print(f"  {book_team} {day['date']}: NAV: {day['nav']:,.2f} THB | Return: {day['return_pct']:.4f}% | "
+                  f"MaxDD: {day['max_dd']:.2f}% | W/S: {day['wins']}/{day['sells']}")
+        pd.DataFrame(results).to_csv(os.path.join("result", book_team, "daily_results.csv"), index=False)
+        daily_results[book_team] = results
+    return daily_results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m tradeSim",
+        description="Replay tick days through one or more strategies.",
+    )
+    parser.add_argument("-s", "--strategy", action="append", required=True,
+                        help="Strategy to run: class name in strategy/, module path, or module:Class. "
+                             "Repeat to compare several strategies in one pass.")
+    parser.add_argument("-t", "--team", required=True, help="Team name (result folder).")
+    parser.add_argument("--start", help="First trading day (YYYY-MM-DD), inclusive.")
+    parser.add_argument("--end", help="Last trading day (YYYY-MM-DD), inclusive.")
+    parser.add_argument("--dates", nargs="+", help="Explicit trading days instead of a range.")
+    parser.add_argument("--days", choices=("all", "normal", "anomaly"), default="all",
+                        help="Only replay normal or anomaly days, as classified by the tick catalog "
+                             "(python -m tradeSim.Catalog).")
+    parser.add_argument("--ticks-dir", default=Replay.TICKS_DIR, help="Folder with <date>.csv tick files.")
+    parser.add_argument("--universe", help="Symbol list CSV to trade instead of SET50 (e.g. the universe.csv "
+                                           "written by python -m tradeSim.Synthetic).")
+    parser.add_argument("--engine", choices=Replay.ENGINES, default="vectorized",
+                        help="Replay engine. All engines produce the same fills; legacy is the reference loop.")
+    parser.add_argument("--shared-handler", action="store_true", default=None,
+                        help="Feed all symbols to one strategy instance instead of one instance per symbol.")
+    parser.add_argument("--output", choices=OUTPUTS, default="json",
+                        help="Portfolio file written at the end of each day (the CSV logs are always written).")
+    parser.add_argument("--journal", action="store_true", help="Write a crash-safe fill journal.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --journal run: skip the days already in the portfolio "
+                             "summary and continue the unfinished day from its last journaled tick.")
+    parser.add_argument("--fresh", action="store_true", help="Delete previous results of the team(s) first.")
+    parser.add_argument("--flat-start", action="store_true",
+                        help="Run days independently and in parallel, each starting flat with --start-cash.")
+    parser.add_argument("--start-cash", type=float, default=10000000.0, help="Starting cash per flat-start day.")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Worker processes for --flat-start (default: one per CPU core).")
+    parser.add_argument("--profile", choices=Profiling.PROFILERS,
+                        help="Profile every day (deterministic cProfile or low-overhead stack sampling) and write "
+                             "<date>.pstats and <date>.collapsed (flamegraph input) to result/<team>/profile/.")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record the tracemalloc peak memory of each stage (load, replay, close) per day.")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="Stream each day from disk in blocks of about this many rows instead of loading it "
+                             "whole, to bound memory on very large days (fast/vectorized engines, same fills).")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    names = [args.team] + [resolve_strategy(s)[1] for s in args.strategy]
+    if not all(re.match(NAME_PATTERN, name) for name in names):
+        raise ValueError("Team name or strategy name is invalid.")
+    if args.universe:
+        Universe.set_default_universe(Universe.Universe.from_csv(args.universe))
+
+    if args.dates:
+        dates = [d for d in args.dates if os.path.exists(Replay.tick_file(d, args.ticks_dir))]
+        for d in sorted(set(args.dates) - set(dates)):
+            print(f"[WARNING] Tick file not found for {d}")
+    else:
+        dates = Replay.discover_dates(args.ticks_dir, args.start, args.end)
+    if args.days != "all":
+        catalog = Catalog.TickCatalog.build(args.ticks_dir)
+        dates = [d for d in dates if d in catalog and catalog[d].anomaly == (args.days == "anomaly")]
+    if not dates:
+        raise SystemExit(f"No tick files found in {args.ticks_dir} for the requested days.")
+
+    if args.resume and (args.fresh or args.flat_start):
+        raise SystemExit("--resume cannot be combined with --fresh or --flat-start.")
+    if args.fresh:
+        teams = [args.team] if len(args.strategy) == 1 else [f"{args.team}_{n}" for n in names[1:]]
+        for team in teams:
+            shutil.rmtree(os.path.join("result", team), ignore_errors=True)
+
+    print(f"=" * 60)
+    print(f"Team: {args.team} | Strategy: {', '.join(names[1:])} | Engine: {args.engine}")
+    print(f"Trading days: {len(dates)} ({dates[0]} to {dates[-1]})")
+    print(f"=" * 60)
+
+    if args.flat_start:
+        if args.profile or args.trace_memory or args.chunk_rows:
+            print("[WARNING] --profile, --trace-memory and --chunk-rows only apply to sequential runs; ignoring them.")
+        return run_flat_start(args.strategy, args.team, dates, args.start_cash, args.workers,
+                              args.engine, args.ticks_dir, args.shared_handler)
+    if args.workers is not None:
+        print("[WARNING] --workers only applies to --flat-start runs; replaying days sequentially.")
+    return run(args.strategy, args.team, dates, args.engine, args.output, args.journal, args.ticks_dir,
+               args.shared_handler, args.profile, args.trace_memory, args.chunk_rows, args.resume)
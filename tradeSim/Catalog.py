@@ -0,0 +1,201 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import namedtuple
+import pandas as pd
+from . import Replay
+from . import MarketState
+
+# end-of-day tick clustering ratio (%) from which a day counts as an anomaly day
+ANOMALY_TCR = 50.0
+
+CATALOG_NAME = "catalog.json"
+
+# Metadata of one tick file. TCR, traded and clustered are the end-of-day
+# MarketState values over the continuous-session ticks (opening auction
+# excluded), as the analysis scripts compute them.
+DayInfo = namedtuple("DayInfo", [
+    "date", "rows", "symbols", "first_time", "last_time", "sha256", "size", "mtime_ns",
+    "tcr", "traded", "clustered", "anomaly",
+])
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_day(path, anomaly_tcr=ANOMALY_TCR):
+    """
+    DayInfo of one tick file, read in a single pass over the columns it needs.
+    """
+    stat = os.stat(path)
+    df = pd.read_csv(path, usecols=['ShareCode', 'TradeDateTime', 'LastPrice', 'Volume', 'Flag'])
+    times = pd.to_datetime(df['TradeDateTime'])
+
+    session = ~df['Flag'].astype(str).str.contains("OPEN", regex=False).to_numpy()
+    state = MarketState.MarketState.batch(df['ShareCode'].to_numpy()[session], df['LastPrice'].to_numpy()[session],
+                                          df['Volume'].to_numpy()[session])
+    traded = int(state['traded'][-1]) if len(state['tcr']) else 0
+    clustered = int(state['clustered'][-1]) if len(state['tcr']) else 0
+    tcr = float(state['tcr'][-1]) if len(state['tcr']) else 0.0
+
+    return DayInfo(
+        date=os.path.splitext(os.path.basename(path))[0],
+        rows=len(df),
+        symbols=sorted(df['ShareCode'].astype(str).unique()),
+        first_time=str(times.min()) if len(df) else None,
+        last_time=str(times.max()) if len(df) else None,
+        sha256=file_hash(path),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        tcr=tcr,
+        traded=traded,
+        clustered=clustered,
+        anomaly=tcr >= anomaly_tcr,
+    )
+
+
+class TickCatalog:
+    """
+    Index of the tick files of a folder with per-day metadata, kept in
+    <ticks_dir>/catalog.json so runners and analysis scripts can pick days
+    (date range, normal / anomaly) and size work without loading any ticks.
+
+    refresh() scans only the days that are new or whose file changed (size or
+    modification time) and drops the days whose file is gone.
+
+        catalog = TickCatalog.build()
+        normal_days = catalog.dates(anomaly=False)
+    """
+
+    def __init__(self, ticks_dir=Replay.TICKS_DIR, days=None):
+        self.ticks_dir = ticks_dir
+        self.days = dict(days or {})
+
+    @property
+    def path(self):
+        return os.path.join(self.ticks_dir, CATALOG_NAME)
+
+    @classmethod
+    def load(cls, ticks_dir=Replay.TICKS_DIR):
+        """
+        The saved catalog as it is, without scanning (empty if there is none).
+        """
+        catalog = cls(ticks_dir)
+        if os.path.exists(catalog.path):
+            with open(catalog.path, encoding="utf-8") as file:
+                for entry in json.load(file)["days"]:
+                    catalog.days[entry["date"]] = DayInfo(**entry)
+        return catalog
+
+    @classmethod
+    def build(cls, ticks_dir=Replay.TICKS_DIR, rebuild=False):
+        """
+        The catalog of `ticks_dir`, brought up to date and saved.
+        """
+        catalog = cls(ticks_dir) if rebuild else cls.load(ticks_dir)
+        if catalog.refresh():
+            catalog.save()
+        return catalog
+
+    def refresh(self):
+        """
+        Rescan new and changed tick files. Returns True if anything changed.
+        """
+        changed = False
+        dates = Replay.discover_dates(self.ticks_dir)
+        for date in set(self.days) - set(dates):
+            del self.days[date]
+            changed = True
+        for date in dates:
+            path = Replay.tick_file(date, self.ticks_dir)
+            stat = os.stat(path)
+            info = self.days.get(date)
+            if info is None or (info.size, info.mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                self.days[date] = scan_day(path)
+                changed = True
+        return changed
+
+    def save(self):
+        os.makedirs(self.ticks_dir, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump({"days": [info._asdict() for _, info in sorted(self.days.items())]}, file, indent=1)
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self.days)
+
+    def __contains__(self, date):
+        return date in self.days
+
+    def __getitem__(self, date):
+        return self.days[date]
+
+    def dates(self, start=None, end=None, anomaly=None):
+        """
+        Cataloged days in order, optionally limited to the inclusive range
+        [start, end] and to anomaly (True) or normal (False) days.
+        """
+        return [
+            date for date, info in sorted(self.days.items())
+            if (start is None or date >= start) and (end is None or date <= end)
+            and (anomaly is None or info.anomaly == anomaly)
+        ]
+
+    def work_order(self, dates):
+        """
+        `dates` heaviest first, for schedulers that hand out one day per worker:
+        starting the longest days first keeps the last worker from finishing
+        alone. Days missing from the catalog are weighed by file size at the
+        catalog's average bytes per row.
+        """
+        known = [info for info in self.days.values() if info.rows]
+        bytes_per_row = sum(info.size for info in known) / sum(info.rows for info in known) if known else 1.0
+
+        def weight(date):
+            if date in self.days:
+                return self.days[date].rows
+            path = Replay.tick_file(date, self.ticks_dir)
+            return os.path.getsize(path) / bytes_per_row if os.path.exists(path) else 0
+
+        return sorted(dates, key=weight, reverse=True)
+
+    def to_frame(self):
+        """
+        One row per day (symbols as a count), for analysis.
+        """
+        rows = [dict(info._asdict(), symbols=len(info.symbols)) for _, info in sorted(self.days.items())]
+        return pd.DataFrame(rows, columns=DayInfo._fields)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m tradeSim.Catalog",
+        description="Build or refresh the tick catalog and list the cataloged days.",
+    )
+    parser.add_argument("--ticks-dir", default=Replay.TICKS_DIR, help="Folder with <date>.csv tick files.")
+    parser.add_argument("--rebuild", action="store_true", help="Rescan every day instead of only changed ones.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    catalog = TickCatalog.build(args.ticks_dir, args.rebuild)
+    print(f"{'Date':<12}{'Rows':>10}{'Symbols':>9}  {'First':<9}{'Last':<9}{'TCR %':>7}  Day")
+    for date in catalog.dates():
+        info = catalog[date]
+        print(f"{date:<12}{info.rows:>10,}{len(info.symbols):>9}  {(info.first_time or '')[11:]:<9}"
+              f"{(info.last_time or '')[11:]:<9}{info.tcr:>7.1f}  {'ANOMALY' if info.anomaly else 'normal'}")
+    print(f"{len(catalog)} day(s), catalog: {catalog.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
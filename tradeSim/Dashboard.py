@@ -0,0 +1,202 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+# Immutable view of one frame: the market stream (symbol, price, volume, flag)
+# and the portfolio, as the replay left them when the frame was published.
+DashboardSnapshot = namedtuple(
+    "DashboardSnapshot",
+    ["owner", "market", "stocks", "cash", "roi", "max_drawdown", "wins", "sells", "ticks"],
+)
+
+_STOP = object()
+
+
+class LiveDashboard:
+    """
+    Live view of a replay, drawn on its own thread at a fixed frame rate.
+
+    The replay calls on_tick() (or on_row() with the tick row) for every tick.
+    That only records the last trade of the symbol; at most `fps` times per
+    second it also publishes a DashboardSnapshot to a one-slot queue, replacing
+    a frame not drawn yet. The drawing thread renders the latest snapshot with
+    `draw` (by default a rich Live layout of render_layout()), so tables are
+    never built inside the replay loop and a slow terminal cannot slow the
+    replay down.
+
+        with LiveDashboard(strategy_runner, fps=4) as dashboard:
+            Replay.run_day(trading_Sim, df, strategy_class, on_tick=dashboard.on_row)
+    """
+
+    def __init__(self, strategy_runner, fps=4, draw=None):
+        self._runner = strategy_runner
+        self.interval = 1.0 / fps
+        self._draw = draw
+        self._live = None
+        self._latest = {}
+        self._queue = queue.Queue(maxsize=1)
+        self._thread = None
+        self._next_publish = 0.0
+        self.ticks = 0
+        self.frames = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        if self._draw is None:
+            from rich.live import Live
+
+            self._live = Live(auto_refresh=False)
+            self._live.start()
+            self._draw = lambda snapshot: self._live.update(render_layout(snapshot), refresh=True)
+
+        self._thread = threading.Thread(target=self._run, name="LiveDashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Draw the final state, then stop the drawing thread.
+        """
+        if self._thread is None:
+            return
+        self.publish()
+        # waits until the final frame has been taken, unless drawing failed
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=self.interval)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        self._thread = None
+        if self._live is not None:
+            self._live.stop()
+
+    def on_tick(self, symbol, price, volume, flag):
+        self._latest[symbol] = (price, volume, flag)
+        self.ticks += 1
+
+        now = time.monotonic()
+        if now >= self._next_publish:
+            self._next_publish = now + self.interval
+            self.publish()
+
+    def on_row(self, row):
+        """
+        on_tick() for a tick row, the on_tick callback of Replay.run_day.
+        """
+        self.on_tick(row['ShareCode'], row['LastPrice'], row['Volume'], row['Flag'])
+
+    def snapshot(self):
+        runner = self._runner
+        return DashboardSnapshot(
+            owner=runner.get_owner(),
+            market=tuple((symbol,) + trade for symbol, trade in self._latest.items()),
+            stocks=tuple(MappingProxyType(info) for info in runner.get_all_stocks_info()),
+            cash=runner.get_cash_balance(),
+            roi=runner.get_roi(),
+            max_drawdown=runner.get_max_draw_down(),
+            wins=runner.get_number_of_wins(),
+            sells=runner.get_number_of_sells(),
+            ticks=self.ticks,
+        )
+
+    def publish(self):
+        snapshot = self.snapshot()
+        try:
+            self._queue.get_nowait()  # drop the frame the drawing thread has not reached
+        except queue.Empty:
+            pass
+        self._queue.put_nowait(snapshot)
+
+    def _run(self):
+        while True:
+            snapshot = self._queue.get()
+            if snapshot is _STOP:
+                return
+            self._draw(snapshot)
+            self.frames += 1
+
+
+# === Render Helpers ===
+def render_market_table(snapshot):
+    from rich.table import Table
+
+    table = Table(title="📈 Market Stream")
+    table.add_column("Symbol")
+    table.add_column("Last Price", justify="right")
+    table.add_column("Volume", justify="right")
+    table.add_column("Flag", justify="right")
+
+    for symbol, price, volume, flag in snapshot.market:
+        table.add_row(symbol, f"{price:.2f}", str(volume), flag)
+    return table
+
+
+def render_portfolio_table(snapshot):
+    from rich.table import Table
+
+    table = Table(title=f"💼 Portfolio: {snapshot.owner}", expand=True)
+    table.add_column("Cash Balance", no_wrap=True, width=18)
+    table.add_column("Symbol")
+    table.add_column("Actual Vol", justify="right")
+    table.add_column("Buy Price", justify="right")
+    table.add_column("Market Price", justify="right")
+    table.add_column("Average Cost", justify="right")
+    table.add_column("Amount Cost", justify="right")
+    table.add_column("Market Value", justify="right")
+    table.add_column("Unrealized", justify="right")
+    table.add_column("Unreal. %", justify="right")
+    table.add_column("Realized", justify="right")
+    table.add_column("Buy Time", justify="center")
+
+    cash_str = f"{snapshot.cash:,.2f}"
+    cash_displayed = False
+
+    if not snapshot.stocks:
+        table.add_row(cash_str, "-", "0", "-", "-", "-", "-", "-", "-", "-", "-", "-")
+    else:
+        for stock in snapshot.stocks:
+            table.add_row(
+                cash_str if not cash_displayed else "",
+                stock["Symbol"],
+                str(stock["Actual Volume"]),
+                f"{stock['Buy Price']:.2f}",
+                f"{stock['Market Price']:.2f}",
+                f"{stock['Average Cost']:.2f}",
+                f"{stock['Amount Cost']:.2f}",
+                f"{stock['Market Value']:.2f}",
+                f"{stock['Unrealized P&L']:.2f}",
+                f"{stock['Unrealized %']:.2f}%",
+                f"{stock['Realized P&L']:.2f}",
+                stock["Buy time"]
+            )
+            cash_displayed = True
+
+    # Add metrics summary
+    table.add_section()
+    table.add_row("🔢 Metrics", "", "", "", "", "", "", "", "", "", "", "")
+    table.add_row("ROI (%)", f"{snapshot.roi:.2f}%", "", "", "", "", "", "", "", "", "", "")
+    table.add_row("Max Drawdown (%)", f"{snapshot.max_drawdown:.2f}%", "", "", "", "", "", "", "", "", "", "")
+    table.add_row("Win Count", str(snapshot.wins), "", "", "", "", "", "", "", "", "", "")
+    table.add_row("Sell Count", str(snapshot.sells), "", "", "", "", "", "", "", "", "", "")
+    return table
+
+
+def render_layout(snapshot):
+    from rich.layout import Layout
+    from rich.panel import Panel
+
+    layout = Layout()
+    layout.split_column(
+        Layout(Panel(render_market_table(snapshot), expand=True), name="market"),
+        Layout(Panel(render_portfolio_table(snapshot), expand=True), name="portfolio")
+    )
+    return layout
@@ -0,0 +1,176 @@
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from . import Portfolio
+from . import TradeSim
+from . import Order
+from . import Replay
+from . import Catalog
+
+
+class _DrawdownTrackingPortfolio(Portfolio.portfolio):
+    """
+    Portfolio that also keeps every (peak NAV, lowest NAV after it) pair of the day.
+
+    A flat-start day only knows its NAV relative to its own starting cash. When the
+    day is stitched onto the cumulative NAV curve every level moves by a constant,
+    and the drawdown of each peak has to be recomputed at the shifted level, which
+    needs all of the pairs rather than only the worst percentage.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.nav_peaks = []
+
+    def _update_max_min_nav(self):
+        prev_max = self.max_nav
+        super()._update_max_min_nav()
+        if self.max_nav != prev_max or not self.nav_peaks:
+            self.nav_peaks.append([self.max_nav, self.min_nav])
+        else:
+            self.nav_peaks[-1][1] = self.min_nav
+
+
+def _run_flat_day(team_name, strategy_module, strategy_name, date, start_cash, ticks_dir, engine, shared_handler):
+    strategy_class = getattr(importlib.import_module(strategy_module), strategy_name)
+    df = Replay.load_day(Replay.tick_file(date, ticks_dir))
+
+    port = _DrawdownTrackingPortfolio(team_name, cashbalance=start_cash, cashbalance_start=start_cash)
+    Order.order._order_counter = 1
+    trading_Sim = TradeSim.tradeSim(team_name, portfolio=port)
+
+    Replay.run_day(trading_Sim, df, strategy_class, engine, shared_handler)
+
+    return {
+        "date": date,
+        "trading_date": df['TradeDateTime'].dt.date.iloc[0] if len(df) else pd.Timestamp(date).date(),
+        "orders_created": Order.order._order_counter - 1,
+        "transactions": list(trading_Sim.execution.tranLog.transaction_log),
+        "errors": list(trading_Sim.error_logger.error_log),
+        "stocksList": port.stocksList,
+        "cashbalance": port.cashbalance,
+        "realized": port.realized,
+        "nav": port.nav,
+        "max_nav": port.max_nav,
+        "min_nav": port.min_nav,
+        "nav_peaks": port.nav_peaks,
+        "No_win": port.No_win,
+        "No_sell": port.No_sell,
+    }
+
+
+def _shifted_drawdown(nav_peaks, shift):
+    worst = 0.0
+    for peak, trough in nav_peaks:
+        peak += shift
+        if peak:
+            worst = min(worst, ((trough + shift) - peak) / peak * 100)
+    return worst
+
+
+def run_flat_start_days(
+    team_name,
+    strategy_module,
+    strategy_name,
+    dates,
+    start_cash=10000000.0,
+    workers=None,
+    ticks_dir=Replay.TICKS_DIR,
+    engine="vectorized",
+    shared_handler=None,
+):
+    """
+    Run independent trading days concurrently and stitch them into one result.
+
+    Every day starts flat with `start_cash`, which is a good approximation for
+    strategies that liquidate before the close (IntradayMeanReversion, HybridVWAP).
+    Days run in a process pool; their P&L is then chained in date order onto the
+    10M initial balance, so the portfolio summary CSV gets cumulative NAV, return,
+    max drawdown (each day's NAV peaks re-evaluated at the cumulative level) and
+    Calmar ratio, just like a sequential run would report them.
+
+    The transaction log, error log, portfolio summary, transaction summary and final
+    portfolio JSON are written to result/<team_name>/. Order numbers are
+    renumbered so they stay unique and increasing across days.
+
+    Returns
+    -------
+    list of dict
+        One dict per day with date, nav, return_pct, max_dd, wins and sells.
+    """
+    # create the result folder and log headers once, before workers touch them
+    setup = TradeSim.tradeSim(team_name, portfolio=Portfolio.portfolio(team_name))
+
+    # longest days (by cataloged row count) start first, results are stitched in date order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            date: pool.submit(_run_flat_day, team_name, strategy_module, strategy_name, date, start_cash, ticks_dir,
+                              engine, shared_handler)
+            for date in Catalog.TickCatalog.load(ticks_dir).work_order(dates)
+        }
+        days = [futures[date].result() for date in dates]
+
+    initial_cash = setup.portfolio.get_initial_cash()
+    start_nav = initial_cash
+    realized = 0.0
+    no_win = no_sell = 0
+    order_offset = 0
+    prev_dd = None
+    stitched = None
+    results = []
+
+    for day in days:
+        shift = start_nav - start_cash
+
+        for txn in day["transactions"]:
+            txn = dict(txn)
+            txn["Order Number"] = f"ORD{int(txn['Order Number'][3:]) + order_offset:05d}"
+            setup.execution.tranLog.transaction_log.append(txn)
+        for err in day["errors"]:
+            setup.error_logger.log_error(err["message"])
+        order_offset += day["orders_created"]
+
+        realized += day["realized"]
+        no_win += day["No_win"]
+        no_sell += day["No_sell"]
+        prev_dd = min(prev_dd or 0, _shifted_drawdown(day["nav_peaks"], shift))
+
+        if day["max_nav"] is None:
+            # no tick reached the portfolio (e.g. an empty tick file): flat at the start NAV
+            nav = max_nav = min_nav = start_nav
+        else:
+            nav, max_nav, min_nav = day["nav"] + shift, day["max_nav"] + shift, day["min_nav"] + shift
+
+        stitched = Portfolio.portfolio(
+            team_name,
+            stocksList=day["stocksList"],
+            realized=realized,
+            cashbalance=day["cashbalance"] + shift,
+            cashbalance_start=start_nav,
+            prevousDay_maxDD=prev_dd,
+            nav=nav,
+            max_nav=max_nav,
+            min_nav=min_nav,
+            max_Draw_down=prev_dd,
+            No_win=no_win,
+            No_sell=no_sell,
+        )
+        stitched.save_summary_csv(day["trading_date"])
+
+        results.append({
+            "date": day["date"],
+            "nav": float(stitched.get_nav()),
+            "return_pct": float(stitched.calculate_roi()),
+            "max_dd": float(prev_dd),
+            "wins": no_win,
+            "sells": no_sell,
+        })
+        start_nav = stitched.get_nav()
+
+    setup.flushTransactionLog()
+    setup.flushErrorLogger()
+    if stitched is not None:
+        stitched.save_to_file(team_name)
+        setup.create_transaction_summarize(team_name)
+
+    return results
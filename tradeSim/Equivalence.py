@@ -0,0 +1,286 @@
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import sys
+from collections import namedtuple
+from . import TradeSim
+from . import Replay
+from . import Order
+from . import Timestamps
+from . import Features
+from . import Universe
+
+# Columns that legitimately differ between two runs (team name, wall-clock save time).
+IGNORED_FIELDS = frozenset({"owner", "Owner", "Saved At"})
+
+# kind: "tick" (portfolio state after a tick), "transaction_log", "portfolio_summary"
+#       or "portfolio"
+# where: tick number within the day, or "row <n> / <column>" / JSON path in the file
+# tick: "<time> <symbol>" of the first diverging tick when it is known
+Divergence = namedtuple("Divergence", ["date", "kind", "where", "reference", "candidate", "tick"])
+
+
+class EquivalenceReport:
+    def __init__(self, reference, candidate):
+        self.reference = reference
+        self.candidate = candidate
+        self.days = 0
+        self.ticks = 0
+        self.fills = 0
+        self.divergence = None
+
+    @property
+    def ok(self):
+        return self.divergence is None
+
+    def __str__(self):
+        lines = [f"{self.reference} vs {self.candidate}: {self.days} day(s), {self.ticks} ticks, {self.fills} fills"]
+        if self.ok:
+            lines.append("EQUIVALENT")
+        else:
+            d = self.divergence
+            lines.append(f"DIVERGED on {d.date} in {d.kind} at {d.where}")
+            if d.tick:
+                lines.append(f"  first diverging tick: {d.tick}")
+            lines.append(f"  {self.reference}: {d.reference}")
+            lines.append(f"  {self.candidate}: {d.candidate}")
+        return "\n".join(lines)
+
+
+def values_equal(a, b, rel_tol=1e-9, abs_tol=1e-6):
+    """
+    Field equality for CSV/JSON values: numbers within tolerance, anything else
+    exactly (as text).
+    """
+    try:
+        x, y = float(a), float(b)
+    except (TypeError, ValueError):
+        return str(a) == str(b)
+    if math.isnan(x) or math.isnan(y):
+        return math.isnan(x) and math.isnan(y)
+    return math.isclose(x, y, rel_tol=rel_tol, abs_tol=abs_tol)
+
+
+def diff_csv(reference_path, candidate_path, rel_tol=1e-9, abs_tol=1e-6, ignore=IGNORED_FIELDS):
+    """
+    First differing field of two CSV files as (where, reference, candidate), or None.
+    """
+    reference, candidate = _read_csv(reference_path), _read_csv(candidate_path)
+    for i, (ref_row, cand_row) in enumerate(zip(reference, candidate)):
+        for column in ref_row:
+            if column in ignore:
+                continue
+            if not values_equal(ref_row[column], cand_row.get(column), rel_tol, abs_tol):
+                return f"row {i + 1} / {column}", ref_row, cand_row
+    if len(reference) != len(candidate):
+        return "row count", len(reference), len(candidate)
+    return None
+
+
+def _read_csv(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as file:
+        return list(csv.DictReader(file))
+
+
+def diff_json(reference, candidate, rel_tol=1e-9, abs_tol=1e-6, ignore=IGNORED_FIELDS, path="$"):
+    """
+    First differing value of two JSON documents as (path, reference, candidate), or None.
+    """
+    if isinstance(reference, dict) and isinstance(candidate, dict):
+        for key in sorted(set(reference) | set(candidate)):
+            if key in ignore:
+                continue
+            if key not in reference or key not in candidate:
+                return f"{path}.{key}", reference.get(key), candidate.get(key)
+            found = diff_json(reference[key], candidate[key], rel_tol, abs_tol, ignore, f"{path}.{key}")
+            if found:
+                return found
+        return None
+    if isinstance(reference, list) and isinstance(candidate, list):
+        for i, (a, b) in enumerate(zip(reference, candidate)):
+            found = diff_json(a, b, rel_tol, abs_tol, ignore, f"{path}[{i}]")
+            if found:
+                return found
+        if len(reference) != len(candidate):
+            return f"{path} length", len(reference), len(candidate)
+        return None
+    if not values_equal(reference, candidate, rel_tol, abs_tol):
+        return path, reference, candidate
+    return None
+
+
+class _Lane:
+    """
+    One side of the comparison: its own tradeSim, order numbering and tick trace.
+    features=False replays the raw ticks, without the feature columns.
+    """
+
+    def __init__(self, name, team_name, engine, features=True):
+        self.name = name
+        self.team_name = team_name
+        self.engine = engine
+        self.features = features
+        shutil.rmtree(os.path.join("result", team_name), ignore_errors=True)
+        self.trading_Sim = TradeSim.tradeSim(team_name, load_existing=False)
+        self.order_counter = 1
+        self.trace = []
+
+    def on_tick(self, row):
+        sim = self.trading_Sim
+        port = sim.portfolio
+        self.trace.append((row['ShareCode'], Timestamps.row_epoch_ns(row), sim.execution.fill_count,
+                           len(sim.execution.Orders_Book), port.get_cash_balance(), port.get_nav()))
+
+    def run_day(self, df, strategy_class, shared_handler, first_day):
+        Order.order._order_counter = self.order_counter
+        if not first_day:
+            self.trading_Sim.start_new_day()
+        self.trace = []
+        if callable(self.engine):
+            if not self.features:
+                df = df.drop(columns=list(Features.COLUMNS))
+            self.engine(self.trading_Sim, df, strategy_class, shared_handler=shared_handler, on_tick=self.on_tick)
+        else:
+            Replay.run_day(self.trading_Sim, df, strategy_class, self.engine, shared_handler, on_tick=self.on_tick,
+                           features=self.features)
+        trading_date = df['TradeDateTime'].dt.date.iloc[0]
+        Replay.close_day(self.trading_Sim, self.team_name, trading_date)
+        self.order_counter = Order.order._order_counter
+
+    def file(self, suffix):
+        return os.path.join("result", self.team_name, f"{self.team_name}_{suffix}")
+
+
+def _engine_name(engine):
+    return engine if isinstance(engine, str) else getattr(engine, "__name__", "candidate")
+
+
+def _first_tick_divergence(reference, candidate, rel_tol, abs_tol):
+    labels = ("fills", "resting orders", "cash", "NAV")
+    for i, (ref, cand) in enumerate(zip(reference, candidate)):
+        tick = f"{Timestamps.format_ns(ref[1])} {ref[0]}"
+        if ref[:2] != cand[:2]:
+            return i, "tick order", ref[:2], cand[:2], tick
+        for label, a, b in zip(labels, ref[2:], cand[2:]):
+            if not values_equal(a, b, rel_tol, abs_tol):
+                return i, label, a, b, tick
+    if len(reference) != len(candidate):
+        return min(len(reference), len(candidate)), "tick count", len(reference), len(candidate), None
+    return None
+
+
+def compare_engines(strategy_class, dates, candidate="vectorized", reference="legacy", ticks_dir=Replay.TICKS_DIR,
+                    team_name="Equivalence", shared_handler=None, rel_tol=1e-9, abs_tol=1e-6, keep=False,
+                    raw_reference=True):
+    """
+    Replay `dates` through a reference and a candidate engine side by side and
+    report the first divergence.
+
+    Engines are Replay.ENGINES names or callables with the signature of
+    Replay.run_day without `engine`: (trading_Sim, df, strategy_class,
+    shared_handler=None, on_tick=None).
+
+    With raw_reference the reference replays the raw ticks, without the
+    precomputed feature columns (CumVWAP, SecondsSinceOpen, ...), so the
+    strategies compute them tick by tick as in a hand-written loop, while the
+    candidate reads them from the loaded day.
+
+    Both sides start flat in their own result folders (<team_name>-ref,
+    <team_name>-cand). Day by day, after every tick the fill count, resting
+    orders, cash and NAV are compared, then the day's transaction log and
+    portfolio summary rows, and finally the portfolio JSON files, numbers within
+    rel_tol/abs_tol. The folders are removed when the engines agree, unless keep.
+
+    Returns an EquivalenceReport.
+    """
+    lanes = [_Lane(_engine_name(reference), f"{team_name}-ref", reference, features=not raw_reference),
+             _Lane(_engine_name(candidate), f"{team_name}-cand", candidate)]
+    report = EquivalenceReport(lanes[0].name, lanes[1].name)
+    saved_counter = Order.order._order_counter
+    ref, cand = lanes
+
+    try:
+        for i, date in enumerate(dates):
+            df = Replay.load_day(Replay.tick_file(date, ticks_dir))
+            for lane in lanes:
+                lane.run_day(df, strategy_class, shared_handler, first_day=i == 0)
+            report.days += 1
+            report.ticks += len(ref.trace)
+            report.fills = ref.trading_Sim.execution.fill_count
+
+            found = _first_tick_divergence(ref.trace, cand.trace, rel_tol, abs_tol)
+            if found:
+                index, label, a, b, tick = found
+                report.divergence = Divergence(date, "tick", f"tick {index} / {label}", a, b, tick)
+                break
+
+            for kind, suffix in (("transaction_log", "transaction_log.csv"),
+                                 ("portfolio_summary", "portfolio_summary.csv")):
+                found = diff_csv(ref.file(suffix), cand.file(suffix), rel_tol, abs_tol)
+                if found:
+                    report.divergence = Divergence(date, kind, *found, None)
+                    break
+            if report.divergence:
+                break
+
+        if report.ok and report.days:
+            with open(ref.file("portfolio.json")) as a, open(cand.file("portfolio.json")) as b:
+                found = diff_json(json.load(a), json.load(b), rel_tol, abs_tol)
+            if found:
+                report.divergence = Divergence(dates[-1], "portfolio", *found, None)
+    finally:
+        Order.order._order_counter = saved_counter
+
+    if report.ok and not keep:
+        for lane in lanes:
+            shutil.rmtree(os.path.join("result", lane.team_name), ignore_errors=True)
+    return report
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m tradeSim.Equivalence",
+        description="Check that a candidate replay engine produces the same fills and NAV as the reference.",
+    )
+    parser.add_argument("-s", "--strategy", required=True,
+                        help="Strategy: class name in strategy/, module path, or module:Class.")
+    parser.add_argument("--candidate", choices=Replay.ENGINES, default="vectorized")
+    parser.add_argument("--reference", choices=Replay.ENGINES, default="legacy")
+    parser.add_argument("--ticks-dir", default=Replay.TICKS_DIR, help="Folder with <date>.csv tick files.")
+    parser.add_argument("--universe", help="Symbol list CSV to trade instead of SET50 (e.g. the universe.csv "
+                                           "written by python -m tradeSim.Synthetic).")
+    parser.add_argument("--start", help="First trading day (YYYY-MM-DD), inclusive.")
+    parser.add_argument("--end", help="Last trading day (YYYY-MM-DD), inclusive.")
+    parser.add_argument("--dates", nargs="+", help="Explicit trading days instead of a range.")
+    parser.add_argument("--shared-handler", action="store_true", default=None,
+                        help="Feed all symbols to one strategy instance instead of one instance per symbol.")
+    parser.add_argument("--rel-tol", type=float, default=1e-9)
+    parser.add_argument("--abs-tol", type=float, default=1e-6)
+    parser.add_argument("--team", default="Equivalence", help="Prefix of the two result folders.")
+    parser.add_argument("--keep", action="store_true", help="Keep the result folders even when equivalent.")
+    return parser
+
+
+def main(argv=None):
+    from .Backtest import load_strategy
+
+    args = build_parser().parse_args(argv)
+    if args.universe:
+        Universe.set_default_universe(Universe.Universe.from_csv(args.universe))
+    dates = args.dates or Replay.discover_dates(args.ticks_dir, args.start, args.end)
+    if not dates:
+        raise SystemExit(f"No tick files found in {args.ticks_dir} for the requested days.")
+
+    report = compare_engines(load_strategy(args.strategy), dates, args.candidate, args.reference, args.ticks_dir,
+                             args.team, args.shared_handler, args.rel_tol, args.abs_tol, args.keep)
+    print(report)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
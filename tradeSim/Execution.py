@@ -2,7 +2,8 @@ from . import Stock
 from . import TransactionLog
 from . import PortSummarize as ps
 from . import CommissionService
-import pandas as pd
+from . import Timestamps
+from . import Universe
 import os
 import bisect
 import logging
@@ -18,6 +19,9 @@ class execution:
     ):
         self.Orders_Book = orders_book if orders_book is not None else []
         self.tranLog = TransactionLog.Transaction(team_name)
+        # optional write-ahead fill journal, set by tradeSim.enable_journal()
+        self.journal = None
+        self.fill_count = 0
 
     def addOrderToOrders_Book(self, new_order, row):
         if new_order is None:
@@ -52,12 +56,12 @@ class execution:
                 return f"Limit order {market_order.get_order_number()} does not match with valid for matching order in market."
 
     def _is_order_valid(self, row, order):
-        order_time = pd.to_datetime(order.get_timestamp(), unit="s")
-
-        if row["ShareCode"] != order.get_symbol():
+        if Universe.row_symbol_id(row) != order.symbol_id:
             return False
 
-        if row["TradeDateTime"] < order_time:
+        # Same rule as before the switch to epoch ns: the tick's wall-clock time
+        # is compared with the order's UTC time, so the offset is added back.
+        if Timestamps.row_epoch_ns(row) + Timestamps.MARKET_UTC_OFFSET_NS < order.get_timestamp():
             return False
 
         if order.get_side() == "Buy" and row["LastPrice"] > (CommissionService.commissionService._get_slippage(order.get_price()) + order.get_price()):
@@ -66,6 +70,20 @@ class execution:
             return False  # order has higher price than market price
         return True
 
+    def replay_fill(self, order):
+        """
+        Apply a journaled fill again (see Journal.recover): the resting order
+        with the same number fills and leaves the book; a fill of an order that
+        is not in the book is applied like a market order.
+        """
+        resting = next((o for o in self.Orders_Book if o.get_order_number() == order.get_order_number()), None)
+        if resting is None:
+            self._process_market_order(order)
+        elif resting.get_side() == "Buy":
+            self._process_buy_order(resting)
+        else:
+            self._process_sell_order(resting)
+
     def _process_buy_order(self, order):
         Buy_value = CommissionService.commissionService.cal_commissionAndVat(
             order.get_volume(), order.get_price(), order.get_side()
@@ -81,7 +99,7 @@ class execution:
         order.get_ownerPortfolio().update_Buy_stock_valueToPort(
             Buy_value * order.get_volume()
         )
-        self.tranLog.create_transaction_log(order)
+        self._log_fill(order)
 
         self.removeOrder(order)
 
@@ -95,7 +113,7 @@ class execution:
         order.get_ownerPortfolio().update_sold_stock_valueToPort(
             Sell_value * order.get_volume()
         )
-        self.tranLog.create_transaction_log(order)
+        self._log_fill(order)
         self.removeOrder(order)
 
     def _process_market_order(self, order):
@@ -115,7 +133,7 @@ class execution:
             order.get_ownerPortfolio().update_Buy_stock_valueToPort(
                 Buy_value * order.get_volume()
             )
-            self.tranLog.create_transaction_log(order)
+            self._log_fill(order)
         elif order.get_side() == "Sell":
             Sell_value = CommissionService.commissionService.cal_commissionAndVat(
             order.get_volume(), order.get_price(), order.get_side()
@@ -126,7 +144,13 @@ class execution:
             order.get_ownerPortfolio().update_sold_stock_valueToPort(
                 Sell_value * order.get_volume()
             )
-            self.tranLog.create_transaction_log(order)
+            self._log_fill(order)
+
+    def _log_fill(self, order):
+        self.fill_count += 1
+        self.tranLog.create_transaction_log(order)
+        if self.journal is not None:
+            self.journal.record_fill(order)
 
     def removeOrder(self, order):
         self.Orders_Book.remove(order)
@@ -0,0 +1,158 @@
+import datetime
+import numpy as np
+from . import Timestamps
+from . import Universe
+
+# Per-tick feature columns, computed once per day by add_features() and stored
+# with the cached ticks (see Replay.load_day), so the engine, the strategies and
+# the analysis scripts read them instead of recomputing them tick by tick.
+#
+# CumBuyVol / CumSellVol : cumulative Buy / Sell volume of the symbol, including
+#                          the tick (what StrategyHandler.process_row counts)
+# CumVWAP                : VWAP of the symbol since the start of the day over the
+#                          ticks with a positive price and volume, carried over
+#                          other ticks (0.0 before the first one)
+# SessionVWAP            : the same over the continuous session only (opening
+#                          auction ticks left out), the VWAP of the analysis
+#                          scripts, which drop the auction ticks when loading
+# SecondsSinceOpen       : seconds since MARKET_OPEN (negative before the open)
+# IsOpenAuction          : True for opening auction ticks (Flag contains "OPEN")
+CUM_BUY_VOL = "CumBuyVol"
+CUM_SELL_VOL = "CumSellVol"
+CUM_VWAP = "CumVWAP"
+SESSION_VWAP = "SessionVWAP"
+SECONDS_SINCE_OPEN = "SecondsSinceOpen"
+IS_OPEN_AUCTION = "IsOpenAuction"
+COLUMNS = (CUM_BUY_VOL, CUM_SELL_VOL, CUM_VWAP, SESSION_VWAP, SECONDS_SINCE_OPEN, IS_OPEN_AUCTION)
+
+# bump when a definition changes, so cached ticks are rebuilt
+VERSION = 1
+
+MARKET_OPEN = datetime.time(10, 0)
+
+_NS_PER_DAY = 24 * 3600 * Timestamps.NS_PER_SECOND
+
+
+def seconds_after_open(t):
+    """
+    Seconds from MARKET_OPEN to the wall-clock time of day `t` (datetime.time),
+    for comparisons against SecondsSinceOpen.
+    """
+    return _seconds_since_open_ns(
+        ((t.hour * 3600 + t.minute * 60 + t.second) * 1_000_000 + t.microsecond) * 1000
+    )
+
+
+def seconds_since_open(value):
+    """
+    SecondsSinceOpen of one tick time (anything Timestamps.to_epoch_ns accepts),
+    for rows that do not carry the column.
+    """
+    return _seconds_since_open_ns((Timestamps.to_epoch_ns(value) + Timestamps.MARKET_UTC_OFFSET_NS) % _NS_PER_DAY)
+
+
+def _seconds_since_open_ns(ns_of_day):
+    open_ns = (MARKET_OPEN.hour * 3600 + MARKET_OPEN.minute * 60) * Timestamps.NS_PER_SECOND
+    return (ns_of_day - open_ns) / Timestamps.NS_PER_SECOND
+
+
+def _segments(sids):
+    """
+    Row positions of each symbol, in row order.
+    """
+    order = np.argsort(sids, kind="stable")
+    sorted_sids = sids[order]
+    starts = np.flatnonzero(np.r_[True, sorted_sids[1:] != sorted_sids[:-1]]) if len(sids) else []
+    ends = np.r_[starts[1:], len(order)] if len(sids) else []
+    for start, end in zip(starts, ends):
+        yield order[start:end]
+
+
+def _running_vwap(weighted, traded, valid, carry):
+    """
+    VWAP after each of consecutive ticks of one symbol over its `valid` ticks,
+    continuing from carry = [weighted, traded, vwap] of its earlier ticks, which
+    is updated in place.
+    """
+    cum_weighted = np.cumsum(np.r_[carry[0], weighted[valid]])[1:]
+    cum_traded = np.cumsum(np.r_[carry[1], traded[valid]])[1:]
+    # values[k] is the VWAP after the k-th valid tick; carry the last value over
+    # the ticks that did not update it
+    values = np.r_[carry[2], cum_weighted / cum_traded]
+    if len(cum_weighted):
+        carry[:] = cum_weighted[-1], cum_traded[-1], values[-1]
+    return values[np.cumsum(valid)]
+
+
+def _running(buy_volume, sell_volume, weighted, traded, valid, session, carry):
+    """
+    CumBuyVol, CumSellVol, CumVWAP and SessionVWAP of consecutive ticks of one
+    symbol, continuing from carry = [buy, sell, [CumVWAP sums], [SessionVWAP
+    sums]] of its earlier ticks, which is updated in place.
+    """
+    cum_buy = np.cumsum(np.r_[carry[0], buy_volume])[1:]
+    cum_sell = np.cumsum(np.r_[carry[1], sell_volume])[1:]
+    if len(cum_buy):
+        carry[0], carry[1] = cum_buy[-1], cum_sell[-1]
+    vwap = _running_vwap(weighted, traded, valid, carry[2])
+    session_vwap = _running_vwap(weighted, traded, valid & session, carry[3])
+    return cum_buy, cum_sell, vwap, session_vwap
+
+
+def compute(symbol_ids, epoch_ns, prices, volumes, flags, carry=None):
+    """
+    Feature columns of a day given as NumPy columns in file order (time order
+    within each symbol). Returns a dict column name -> array.
+
+    Sums run in row order per symbol, so CumVWAP is bit-identical to
+    strategy.indicators.CumulativeVWAP fed the same ticks, and SessionVWAP to
+    the same fed the continuous-session ticks.
+
+    To compute a day block by block (see Streaming.py), pass the same `carry`
+    dict with every block: it keeps the running sums of each symbol id, so the
+    columns are bit-identical to one call over the whole day.
+    """
+    if carry is None:
+        carry = {}
+    symbol_ids = np.asarray(symbol_ids)
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes)
+    flags = np.asarray(flags, dtype=object).astype(str)
+    n = len(symbol_ids)
+
+    buy_volume = np.where(flags == "Buy", volumes, 0)
+    sell_volume = np.where(flags == "Sell", volumes, 0)
+    valid = (prices > 0) & (volumes > 0)
+    weighted = np.where(valid, prices * volumes, 0.0)
+    traded = np.where(valid, volumes, 0).astype(np.float64)
+    open_auction = np.char.find(flags, "OPEN") >= 0
+
+    cum_buy = np.empty(n, dtype=buy_volume.dtype)
+    cum_sell = np.empty(n, dtype=sell_volume.dtype)
+    vwap = np.zeros(n)
+    session_vwap = np.zeros(n)
+    for idx in _segments(symbol_ids):
+        state = carry.setdefault(symbol_ids[idx[0]], [0, 0, [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        cum_buy[idx], cum_sell[idx], vwap[idx], session_vwap[idx] = _running(
+            buy_volume[idx], sell_volume[idx], weighted[idx], traded[idx], valid[idx], ~open_auction[idx], state)
+
+    wall_ns = np.asarray(epoch_ns, dtype=np.int64) + Timestamps.MARKET_UTC_OFFSET_NS
+
+    return {
+        CUM_BUY_VOL: cum_buy,
+        CUM_SELL_VOL: cum_sell,
+        CUM_VWAP: vwap,
+        SESSION_VWAP: session_vwap,
+        SECONDS_SINCE_OPEN: _seconds_since_open_ns(wall_ns % _NS_PER_DAY),
+        IS_OPEN_AUCTION: open_auction,
+    }
+
+
+def add_features(df):
+    """
+    Return `df` with the feature columns. Needs the EpochNs and SymbolId columns
+    added by Replay.prepare_day().
+    """
+    features = compute(df[Universe.SYMBOL_ID_COLUMN].to_numpy(), df[Timestamps.EPOCH_COLUMN].to_numpy(),
+                       df['LastPrice'].to_numpy(), df['Volume'].to_numpy(), df['Flag'].to_numpy())
+    return df.assign(**features)
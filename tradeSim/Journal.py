@@ -0,0 +1,211 @@
+import json
+import os
+from collections import namedtuple
+from . import Order
+from . import Snapshot
+from . import Timestamps
+
+
+# Resume point of a replay (see FillJournal.record_state): position of the last
+# processed tick of the day, order counter and strategy handler states after it
+# (see StrategyHandler.get_state)
+ResumePoint = namedtuple("ResumePoint", ["tick", "order_counter", "handlers"])
+
+# portfolio and lot fields that follow market prices (not rebuilt by replaying fills)
+_PATH_FIELDS = ("amountByCost", "unrealized", "unrealizedInPercentage", "nav", "max_nav", "min_nav",
+                "max_Draw_down", "prevousDay_maxDD")
+_LOT_MARKS = ("mkt_price", "avg_cost", "amount_cost", "market_value", "unrealized", "unrealizedInPercentage")
+
+
+def _to_builtin(value):
+    # rows replayed from pandas carry numpy scalars (e.g. int64 cumulative volumes)
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def journal_path(team_name, folder="result", filename_suffix="fill_journal.jsonl"):
+    return os.path.join(folder, team_name, f"{team_name}_{filename_suffix}")
+
+
+class FillJournal:
+    """
+    Append-only write-ahead journal of fills.
+
+    Every fill processed by execution is appended as one JSON line. The file is
+    fsync'ed every `fsync_every` fills and on sync()/close(), so a crash loses at
+    most the last unsynced batch. Records carry an increasing sequence number;
+    a snapshot stores the last sequence it already contains, which lets recover()
+    replay only what happened after it.
+
+    The replay engine also appends resume points (record_state) after the ticks
+    on which the journal was synced, so an interrupted day can continue from
+    its last resume point instead of its first tick.
+    """
+
+    def __init__(self, team_name, filename_suffix="fill_journal.jsonl", fsync_every=64, folder="result"):
+        self.team_name = team_name
+        self.fsync_every = fsync_every
+
+        os.makedirs(os.path.join(folder, team_name), exist_ok=True)
+        self.file_path = journal_path(team_name, folder, filename_suffix)
+
+        records = read_journal(self.file_path)
+        self.seq = records[-1]["seq"] if records else 0
+        # last sequence synced to disk / covered by a resume point
+        self.synced_seq = self.seq
+        self.state_seq = self.seq
+        self._pending = 0
+        self._file = open(self.file_path, "a", encoding="utf-8")
+
+    def record_fill(self, order):
+        self.seq += 1
+        record = order.to_dict()
+        record["seq"] = self.seq
+        self._file.write(json.dumps(record, default=_to_builtin) + "\n")
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self.synced_seq = self.seq
+
+    def record_state(self, tick, trading_sim, handlers, order_counter):
+        """
+        Append a resume point and sync it: `tick` is the replay position of the
+        day's tick just processed, `handlers` the JSON-friendly strategy handler
+        states after it. The resting orders and the portfolio fields that
+        follow market prices are kept too, since replaying the fills does not
+        rebuild them.
+        """
+        port = trading_sim.portfolio
+        state = {
+            "order_counter": order_counter,
+            "handlers": handlers,
+            "orders": [o.to_dict() for o in trading_sim.execution.Orders_Book],
+            "portfolio": {name: getattr(port, name) for name in _PATH_FIELDS},
+            "lots": [[getattr(s, name) for name in _LOT_MARKS] for s in port.stocksList],
+        }
+        record = {"seq": self.seq, "tick": tick, "state": state}
+        self._file.write(json.dumps(record, default=_to_builtin) + "\n")
+        self.sync()
+        self.state_seq = self.seq
+
+    def checkpoint(self):
+        """
+        Drop journaled fills once a snapshot holding them is safely on disk.
+        The sequence number keeps counting so it stays comparable with the snapshot.
+        """
+        self._file.close()
+        self._file = open(self.file_path, "w", encoding="utf-8")
+        # keep the sequence in the file so a new process continues counting from it
+        self._file.write(json.dumps({"seq": self.seq, "checkpoint": True}) + "\n")
+        self.sync()
+        self.state_seq = self.seq
+
+    def close(self):
+        self.sync()
+        self._file.close()
+
+
+def read_journal(file_path):
+    """
+    Read journal records in order. A torn last line (crash mid-write) is ignored.
+    """
+    if not os.path.exists(file_path):
+        return []
+
+    records = []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
+
+
+def is_fill(record):
+    return not record.get("checkpoint") and "state" not in record
+
+
+def recover(team_name, snapshot_file=None, fsync_every=64, resume=False):
+    """
+    Rebuild a tradeSim after a crash from the last snapshot plus the fill journal.
+
+    Fills journaled after the snapshot are applied again through execution, so
+    cash, lots, realized P&L and win/sell counters end up as they were at the
+    last synced fill. Orders that were still resting and had not filled are not
+    journaled and are therefore not restored.
+
+    resume=True stops at the last resume point written by the replay engine
+    instead: the fills up to it are applied, the resting orders, NAV tracking
+    and order counter are restored and sim.resume_point holds the strategy
+    states to continue
+    the day with (Replay.run_day(..., resume=sim.resume_point)). The journal is
+    cut after the resume point; the fills dropped are produced again by the
+    replay. Without a resume point the simulation is the snapshot's.
+
+    Returns
+    -------
+    tuple
+        (tradeSim, last_timestamp) where last_timestamp is the order timestamp
+        (epoch ns) of the last replayed fill (None when nothing was replayed).
+    """
+    from . import TradeSim
+
+    if snapshot_file is None:
+        snapshot_file = Snapshot.snapshot_path(team_name)
+
+    if os.path.exists(snapshot_file):
+        sim = TradeSim.tradeSim.from_snapshot(team_name, snapshot_file)
+        snapshot_seq = sim.restored_journal_seq
+    else:
+        sim = TradeSim.tradeSim(team_name)
+        snapshot_seq = 0
+
+    file_path = journal_path(team_name)
+    records = read_journal(file_path)
+    point = None
+    if resume:
+        states = [i for i, r in enumerate(records) if "state" in r]
+        if states:
+            point = records[states[-1]]
+        kept = records[:states[-1] + 1] if states else [r for r in records if r.get("checkpoint")][:1]
+        tmp = f"{file_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in kept)
+        os.replace(tmp, file_path)
+        records = kept
+
+    records = [r for r in records if r["seq"] > snapshot_seq and is_fill(r)]
+
+    last_timestamp = None
+    for record in records:
+        sim.execution.replay_fill(Order.order.from_dict(record, sim.portfolio))
+
+        order_no = int(record["order_number"].lstrip("ORD"))
+        Order.order._order_counter = max(Order.order._order_counter, order_no + 1)
+        last_timestamp = Timestamps.normalize(record["timestamp"])
+
+    sim.portfolio.update_portfolio_totals()
+
+    if point is not None:
+        state = point["state"]
+        sim.execution.Orders_Book[:] = [Order.order.from_dict(d, sim.portfolio) for d in state["orders"]]
+        port = sim.portfolio
+        for name, value in state["portfolio"].items():
+            setattr(port, name, value)
+        for stock, marks in zip(port.stocksList, state["lots"]):
+            for name, value in zip(_LOT_MARKS, marks):
+                setattr(stock, name, value)
+        Order.order._order_counter = state["order_counter"]
+        sim.resume_point = ResumePoint(point["tick"], state["order_counter"], state["handlers"])
+
+    sim.enable_journal(fsync_every=fsync_every)
+    return sim, last_timestamp
@@ -0,0 +1,191 @@
+import numpy as np
+from . import Universe
+
+
+class MarketState:
+    """
+    Market-wide state of the trading day, updated in O(1) per tick.
+
+    - tick clustering ratio (TCR): % of traded symbols that have traded at no more
+      than `cluster_levels` distinct prices so far
+    - breadth: advancers / decliners, i.e. symbols whose last price is above /
+      below their first traded price of the day
+    - aggregate turnover (sum of price * volume) and volume
+
+    Ticks with a non-positive price or volume are ignored, like the strategies do.
+    The replay engine updates one MarketState per day before the strategies see
+    the tick; strategies read it through StrategyHandler.get_market_state().
+
+    With record=True every update appends (timestamp, tcr, traded, clustered,
+    advancers, decliners, turnover) to a per-day time series, see series(). batch() produces the same
+    series from whole NumPy columns.
+    """
+
+    def __init__(self, symbols=(), cluster_levels=2, record=False):
+        self.cluster_levels = cluster_levels
+        self.record = record
+
+        # per-symbol state indexed by universe id
+        self.universe = Universe.default_universe()
+        self._prices = []
+        self._open = []
+        self._direction = []
+
+        self.n_traded = 0
+        self.n_clustered = 0
+        self.advancers = 0
+        self.decliners = 0
+        self.turnover = 0.0
+        self.volume = 0
+        self.ticks = 0
+        self.last_timestamp = None
+
+        self._history = {name: [] for name in ("timestamp", "tcr", "traded", "clustered",
+                                                    "advancers", "decliners", "turnover")}
+
+        for symbol in symbols:
+            self._symbol_id(symbol)
+
+    def _symbol_id(self, symbol):
+        sid = self.universe.intern(symbol)
+        while len(self._prices) <= sid:
+            self._prices.append(set())
+            self._open.append(0.0)
+            self._direction.append(0)
+        return sid
+
+    def update(self, symbol, price, volume, timestamp=None):
+        if price <= 0 or volume <= 0:
+            return
+
+        sid = self._symbol_id(symbol)
+        prices = self._prices[sid]
+
+        if not prices:
+            self.n_traded += 1
+            self.n_clustered += 1
+            self._open[sid] = price
+        if price not in prices:
+            prices.add(price)
+            if len(prices) == self.cluster_levels + 1:
+                self.n_clustered -= 1
+
+        old = self._direction[sid]
+        open_price = self._open[sid]
+        new = 1 if price > open_price else -1 if price < open_price else 0
+        if new != old:
+            self.advancers += (new == 1) - (old == 1)
+            self.decliners += (new == -1) - (old == -1)
+            self._direction[sid] = new
+
+        self.turnover += price * volume
+        self.volume += volume
+        self.ticks += 1
+        self.last_timestamp = timestamp
+
+        if self.record:
+            history = self._history
+            history["timestamp"].append(timestamp)
+            history["tcr"].append(self.tcr)
+            history["traded"].append(self.n_traded)
+            history["clustered"].append(self.n_clustered)
+            history["advancers"].append(self.advancers)
+            history["decliners"].append(self.decliners)
+            history["turnover"].append(self.turnover)
+
+    # --------- Getter Methods ---------
+    @property
+    def tcr(self):
+        return self.n_clustered / self.n_traded * 100 if self.n_traded > 0 else 0.0
+
+    @property
+    def breadth(self):
+        return self.advancers - self.decliners
+
+    def get_market_info(self):
+        return {
+            "TCR": self.tcr,
+            "Traded Symbols": self.n_traded,
+            "Clustered Symbols": self.n_clustered,
+            "Advancers": self.advancers,
+            "Decliners": self.decliners,
+            "Turnover": self.turnover,
+            "Volume": self.volume,
+        }
+
+    def series(self):
+        """
+        Recorded per-tick time series as NumPy arrays (empty unless record=True).
+        """
+        return {
+            "timestamp": np.array(self._history["timestamp"]),
+            "tcr": np.array(self._history["tcr"], dtype=np.float64),
+            "traded": np.array(self._history["traded"], dtype=np.int64),
+            "clustered": np.array(self._history["clustered"], dtype=np.int64),
+            "advancers": np.array(self._history["advancers"], dtype=np.int64),
+            "decliners": np.array(self._history["decliners"], dtype=np.int64),
+            "turnover": np.array(self._history["turnover"], dtype=np.float64),
+        }
+
+    @staticmethod
+    def batch(symbols, prices, volumes, timestamps=None, cluster_levels=2):
+        """
+        Same time series as a recording MarketState fed the rows in order, computed
+        with array operations over the columns of a whole day.
+        """
+        symbols = np.asarray(symbols)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes)
+        valid = (prices > 0) & (volumes > 0)
+        symbols, prices, volumes = symbols[valid], prices[valid], volumes[valid]
+        timestamps = np.asarray(timestamps)[valid] if timestamps is not None else np.full(len(prices), None)
+
+        n = len(prices)
+        _, first_idx, codes = np.unique(symbols, return_index=True, return_inverse=True)
+        codes = codes.ravel()
+
+        # rows in symbol order, keeping time order within a symbol
+        by_symbol = np.argsort(codes, kind="stable")
+        sorted_codes = codes[by_symbol]
+        group_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]] if n else np.zeros(0, dtype=bool)
+
+        # first appearance of each (symbol, price)
+        pairs = np.lexsort((prices, codes))
+        c, p = codes[pairs], prices[pairs]
+        is_new = np.zeros(n, dtype=np.int64)
+        if n:
+            is_new[pairs[np.r_[True, (c[1:] != c[:-1]) | (p[1:] != p[:-1])]]] = 1
+
+        # running distinct-price count of the row's symbol
+        running = np.cumsum(is_new[by_symbol])
+        offsets = np.maximum.accumulate(np.where(group_start, running - is_new[by_symbol], 0)) if n else running
+        distinct = np.empty(n, dtype=np.int64)
+        distinct[by_symbol] = running - offsets
+
+        first_trade = np.zeros(n, dtype=np.int64)
+        first_trade[first_idx] = 1
+        leaves_cluster = (is_new == 1) & (distinct == cluster_levels + 1)
+        n_traded = np.cumsum(first_trade)
+        n_clustered = n_traded - np.cumsum(leaves_cluster)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tcr = np.where(n_traded > 0, n_clustered / n_traded * 100, 0.0)
+
+        open_price = prices[first_idx][codes]
+        direction = np.sign(prices - open_price).astype(np.int64)
+        prev_sorted = np.r_[0, direction[by_symbol][:-1]] if n else direction
+        prev_sorted[group_start] = 0
+        prev = np.empty(n, dtype=np.int64)
+        prev[by_symbol] = prev_sorted
+
+        advancers = np.cumsum((direction == 1).astype(np.int64) - (prev == 1))
+        decliners = np.cumsum((direction == -1).astype(np.int64) - (prev == -1))
+
+        return {
+            "timestamp": timestamps,
+            "tcr": tcr,
+            "traded": n_traded,
+            "clustered": n_clustered,
+            "advancers": advancers,
+            "decliners": decliners,
+            "turnover": np.cumsum(prices * volumes),
+        }
@@ -0,0 +1,198 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+
+DEFAULT_MAX_BYTES = 1 << 30
+HASHES_NAME = "hashes.json"
+
+
+def _source_hash(obj):
+    try:
+        source = inspect.getsource(obj)
+    except (OSError, TypeError):
+        source = getattr(obj, "__qualname__", repr(obj))
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class MemoCache:
+    """
+    Disk-backed memoization of expensive analysis steps (DataFrames, dicts, ...).
+
+    A result is stored as a pickle in `folder` under a key made of:
+    - the function's file name, name and source code (plus the source of the
+      helpers listed in `depends`, given as objects or as names of the
+      function's module not defined yet, and `version`)
+    - its arguments, bound to the signature (f(1) and f(x=1) share a result)
+    - the SHA-256 of every input file returned by `inputs(*args, **kwargs)`
+      (tick files, result CSVs); a missing file counts as its own state
+
+    so editing the function or a helper, calling it with other arguments or
+    changing an input file recomputes it, while rerunning a script after e.g. a
+    plot styling change reads the results back. File hashes are kept in
+    hashes.json and only recomputed when a file's size or mtime changes.
+
+    The folder is bounded to `max_bytes`: after every store the least recently
+    used results are deleted (a hit refreshes the file's mtime).
+
+        MEMO = Memo.MemoCache("analysis/cache")
+
+        @MEMO.memoize(inputs=lambda date: [tick_file(date)], depends=("simulate",))
+        def run_all_backtests(date): ...
+    """
+
+    def __init__(self, folder, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.folder = str(folder)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._hashes = None
+
+    # === Input files ===
+    def _load_hashes(self):
+        if self._hashes is None:
+            self._hashes = {}
+            path = os.path.join(self.folder, HASHES_NAME)
+            if os.path.exists(path):
+                try:
+                    with open(path, encoding="utf-8") as file:
+                        self._hashes = json.load(file)
+                except (OSError, ValueError):
+                    pass
+        return self._hashes
+
+    def _save_hashes(self):
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, HASHES_NAME)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(self._hashes, file, indent=1)
+        os.replace(tmp, path)
+
+    def file_hash(self, path):
+        """
+        SHA-256 of a file (None if it does not exist), reused while its size and
+        modification time are unchanged.
+        """
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        hashes = self._load_hashes()
+        known = hashes.get(path)
+        if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        hashes[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        self._save_hashes()
+        return hashes[path][2]
+
+    # === Results ===
+    def key(self, func, args=(), kwargs=None, inputs=None, depends=(), version=None):
+        bound = inspect.signature(func).bind(*args, **(kwargs or {}))
+        bound.apply_defaults()
+        helpers = [func.__globals__[obj] if isinstance(obj, str) else obj for obj in depends]
+        files = [] if inputs is None else sorted(str(path) for path in inputs(*bound.args, **bound.kwargs))
+        parts = [
+            os.path.basename(inspect.getsourcefile(func) or ""), func.__qualname__, version,
+            [_source_hash(obj) for obj in [func] + helpers],
+            [(name, repr(value)) for name, value in bound.arguments.items()],
+            [(os.path.basename(path), self.file_hash(path)) for path in files],
+        ]
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, func, key):
+        return os.path.join(self.folder, f"{func.__qualname__}.{key[:24]}.pkl")
+
+    def memoize(self, inputs=None, depends=(), version=None):
+        """
+        Decorator: memoize the function in this cache (see the class docstring).
+        `inputs` is called with the function's arguments and returns the paths
+        of the files the result depends on.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                path = self._path(func, self.key(func, args, kwargs, inputs, depends, version))
+                found, result = self._read(path)
+                if found:
+                    self.hits += 1
+                    return result
+                self.misses += 1
+                result = func(*args, **kwargs)
+                self._write(path, result)
+                return result
+            wrapper.cache = self
+            return wrapper
+        return decorator
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as file:
+                result = pickle.load(file)
+        except FileNotFoundError:
+            return False, None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False, None
+        os.utime(path)  # most recently used
+        return True, result
+
+    def _write(self, path, result):
+        os.makedirs(self.folder, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"[WARNING] Cannot cache result to '{path}': {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self.evict()
+
+    def entries(self):
+        """
+        (path, size, mtime_ns) of the stored results, least recently used first.
+        """
+        if not os.path.isdir(self.folder):
+            return []
+        entries = []
+        for name in os.listdir(self.folder):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.folder, name))
+                entries.append((os.path.join(self.folder, name), stat.st_size, stat.st_mtime_ns))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used results until the folder fits in max_bytes.
+        Returns the number of deleted results.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        return self.evict(0)
@@ -0,0 +1,350 @@
+import os
+import numpy as np
+import pandas as pd
+from . import Replay
+from . import Features
+
+# SET minimum price steps: prices below TICK_BOUNDS[i] move by TICK_SIZES[i],
+# prices from 400 up by 4.00 (the tier table of the analysis scripts).
+TICK_BOUNDS = np.array([2, 5, 10, 25, 50, 100, 200, 400], dtype=np.float64)
+TICK_SIZES = np.array([0.01, 0.02, 0.05, 0.10, 0.25, 0.50, 1.00, 2.00, 4.00])
+
+COLUMNS = ["Symbol", "Ticks", "AvgPrice", "TickSize", "Slippage%", "UniquePrices", "Range%",
+           "MomentumWinRate", "MeanCrossings", "AvgVolume"]
+
+# Hourly bucket table: one row per symbol and hour of the day
+BUCKET_COLUMNS = ["symbol", "hour", "ticks", "open", "high", "low", "close", "volume", "value", "vwap",
+                  "abs_dev_pct", "signals"]
+# a signal tick trades at or below this fraction of its bucket's VWAP
+SIGNAL_TRIGGER = 0.985
+# buckets from this hour on belong to the afternoon session
+AFTERNOON_HOUR = 13
+
+# bump when a statistic changes, so cached results are rebuilt
+VERSION = 1
+
+
+def tick_size(prices):
+    """
+    Minimum price step of each price (vectorized).
+    """
+    return TICK_SIZES[np.searchsorted(TICK_BOUNDS, np.asarray(prices, dtype=np.float64), side="right")]
+
+
+def symbol_stats(symbols, timestamps, prices, volumes, min_ticks=10):
+    """
+    Per-symbol microstructure statistics of a day, computed for all symbols in
+    one sort instead of one mask per symbol. Ticks are taken in time order
+    within each symbol (file order for equal times).
+
+    Ticks            : number of ticks
+    AvgPrice         : mean price
+    TickSize         : price step at the mean price, Slippage% its share of it
+    UniquePrices     : distinct traded prices
+    Range%           : (max - min) / mean price
+    MomentumWinRate  : share of consecutive tick returns with the same sign
+    MeanCrossings    : times the price crosses its daily mean
+    AvgVolume        : mean volume
+
+    Symbols with fewer than `min_ticks` ticks are left out. Returns a
+    DataFrame with COLUMNS, one row per symbol in symbol order.
+    """
+    symbols = np.asarray(symbols, dtype=object).astype(str)
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    if not len(prices):
+        return pd.DataFrame(columns=COLUMNS)
+    names, codes = np.unique(symbols, return_inverse=True)
+    codes = codes.ravel()
+    order = np.lexsort((np.asarray(timestamps), codes))
+    codes, prices, volumes = codes[order], prices[order], volumes[order]
+
+    n_symbols = len(names)
+    ticks = np.bincount(codes, minlength=n_symbols)
+    starts = np.cumsum(ticks) - ticks
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_price = np.bincount(codes, prices, n_symbols) / ticks
+        avg_volume = np.bincount(codes, volumes, n_symbols) / ticks
+        price_range = (np.maximum.reduceat(prices, starts) - np.minimum.reduceat(prices, starts)) / avg_price * 100
+
+        # distinct (symbol, price) pairs
+        by_price = np.lexsort((prices, codes))
+        c, p = codes[by_price], prices[by_price]
+        first = np.r_[True, (c[1:] != c[:-1]) | (p[1:] != p[:-1])]
+        unique_prices = np.bincount(c[first], minlength=n_symbols)
+
+        # returns between consecutive ticks of the same symbol, and pairs of them
+        same = codes[1:] == codes[:-1]
+        returns = np.diff(prices) / prices[:-1]
+        pair = same[1:] & same[:-1]
+        persistent = pair & (returns[:-1] * returns[1:] > 0)
+        momentum = np.bincount(codes[2:][persistent], minlength=n_symbols) / np.maximum(ticks - 2, 1)
+
+        above = prices > avg_price[codes]
+        crossings = np.bincount(codes[1:][same & (above[1:] != above[:-1])], minlength=n_symbols)
+
+        size = tick_size(avg_price)
+        stats = pd.DataFrame({
+            "Symbol": names,
+            "Ticks": ticks,
+            "AvgPrice": avg_price,
+            "TickSize": size,
+            "Slippage%": size / avg_price * 100,
+            "UniquePrices": unique_prices,
+            "Range%": price_range,
+            "MomentumWinRate": momentum,
+            "MeanCrossings": crossings,
+            "AvgVolume": avg_volume,
+        }, columns=COLUMNS)
+    return stats[stats["Ticks"] >= min_ticks].reset_index(drop=True)
+
+
+def cache_file(daily_ticks, kind="micro"):
+    """
+    Cached statistics of a tick file: <ticks_dir>/cache/<date>.<kind>.v<N>.pkl.
+    """
+    ticks_dir, name = os.path.split(daily_ticks)
+    return os.path.join(ticks_dir, "cache", f"{os.path.splitext(name)[0]}.{kind}.v{VERSION}.pkl")
+
+
+def _cached_day(daily_ticks, kind, params, compute, cache):
+    """
+    compute(symbols, timestamps, prices, volumes) of the continuous-session
+    ticks (opening auction excluded) of one tick file. With cache=True the
+    result is kept in cache_file(daily_ticks, kind) and reused while the tick
+    file and `params` are unchanged, like Replay.load_day.
+    """
+    stat = os.stat(daily_ticks)
+    source = (stat.st_size, stat.st_mtime_ns) + tuple(params)
+    path = cache_file(daily_ticks, kind)
+    if cache and os.path.exists(path):
+        result = pd.read_pickle(path)
+        if result.attrs.get("source") == source:
+            return result
+
+    df = Replay.load_day(daily_ticks, cache=cache)
+    df = df[~df[Features.IS_OPEN_AUCTION]]
+    result = compute(df['ShareCode'], df['TradeDateTime'], df['LastPrice'], df['Volume'])
+
+    if cache:
+        result.attrs["source"] = source
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            result.to_pickle(tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[WARNING] Cannot cache statistics to '{path}': {e}")
+    return result
+
+
+def day_stats(daily_ticks, min_ticks=10, cache=True):
+    """
+    symbol_stats() of the continuous-session ticks of one tick file, cached
+    next to the ticks.
+    """
+    return _cached_day(daily_ticks, "micro", (min_ticks,),
+                       lambda *columns: symbol_stats(*columns, min_ticks=min_ticks), cache)
+
+
+def buckets(symbols, timestamps, prices, volumes):
+    """
+    OHLCV table of a day per symbol and hour, computed from one stable sort of
+    the ticks by (symbol, hour): within a bucket ticks keep their given order.
+
+    ticks, open, high, low, close, volume : as usual
+    value        : sum of price * volume
+    vwap         : value / volume
+    abs_dev_pct  : mean absolute deviation of the prices from the bucket VWAP, in %
+    signals      : ticks at or below SIGNAL_TRIGGER x the bucket VWAP
+
+    Returns a DataFrame with BUCKET_COLUMNS sorted by symbol and hour. Daily
+    bars, overnight gaps, hourly profiles and session statistics are derived
+    from it (daily_bars, overnight_gaps, session_stats).
+    """
+    symbols = np.asarray(symbols, dtype=object).astype(str)
+    timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    if not len(prices):
+        return pd.DataFrame(columns=BUCKET_COLUMNS)
+
+    names, codes = np.unique(symbols, return_inverse=True)
+    hours = (timestamps - timestamps.astype("datetime64[D]")) // np.timedelta64(1, "h")
+    keys = codes.ravel().astype(np.int64) * 24 + hours
+    order = np.argsort(keys, kind="stable")
+    keys, prices, volumes = keys[order], prices[order], volumes[order]
+
+    starts, ends = _segment_bounds(keys)
+    ticks = ends - starts
+    volume = np.add.reduceat(volumes, starts)
+    value = np.add.reduceat(prices * volumes, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = value / volume
+        tick_vwap = np.repeat(vwap, ticks)
+        deviation = np.abs((prices - tick_vwap) / tick_vwap * 100)
+    return pd.DataFrame({
+        "symbol": names[keys[starts] // 24],
+        "hour": keys[starts] % 24,
+        "ticks": ticks,
+        "open": prices[starts],
+        "high": np.maximum.reduceat(prices, starts),
+        "low": np.minimum.reduceat(prices, starts),
+        "close": prices[ends - 1],
+        "volume": volume,
+        "value": value,
+        "vwap": vwap,
+        "abs_dev_pct": np.add.reduceat(deviation, starts) / ticks,
+        "signals": np.add.reduceat(prices <= tick_vwap * SIGNAL_TRIGGER, starts),
+    }, columns=BUCKET_COLUMNS)
+
+
+def day_buckets(daily_ticks, cache=True):
+    """
+    buckets() of the continuous-session ticks of one tick file, cached next to
+    the ticks.
+    """
+    return _cached_day(daily_ticks, "buckets", (SIGNAL_TRIGGER,), buckets, cache)
+
+
+def daily_bars(bucket_table):
+    """
+    One OHLCV bar per symbol (open of its first hour, close of its last),
+    from a buckets() table.
+    """
+    bars = bucket_table.groupby("symbol", sort=True).agg(
+        ticks=("ticks", "sum"), open=("open", "first"), high=("high", "max"), low=("low", "min"),
+        close=("close", "last"), volume=("volume", "sum"), value=("value", "sum"))
+    bars["vwap"] = bars["value"] / bars["volume"]
+    return bars.reset_index()
+
+
+def overnight_gaps(bars, next_bars):
+    """
+    Gap between each symbol's close on one day and its open on the next, in %,
+    for the symbols traded on both days (daily_bars() tables).
+    """
+    gaps = bars[["symbol", "close"]].merge(next_bars[["symbol", "open"]], on="symbol")
+    gaps["gap_pct"] = (gaps["open"] - gaps["close"]) / gaps["close"] * 100
+    return gaps
+
+
+def session_stats(bucket_table):
+    """
+    Per symbol and session (morning / afternoon, split at AFTERNOON_HOUR):
+    ticks, volume, VWAP, high-low range in % of the VWAP and the move from the
+    session's open to its close in %, from a buckets() table.
+    """
+    table = bucket_table.assign(session=np.where(bucket_table["hour"] < AFTERNOON_HOUR, "morning", "afternoon"))
+    stats = table.groupby(["symbol", "session"], sort=True).agg(
+        ticks=("ticks", "sum"), volume=("volume", "sum"), value=("value", "sum"), open=("open", "first"),
+        close=("close", "last"), high=("high", "max"), low=("low", "min"))
+    stats["vwap"] = stats["value"] / stats["volume"]
+    stats["range_pct"] = (stats["high"] - stats["low"]) / stats["vwap"] * 100
+    stats["move_pct"] = (stats["close"] - stats["open"]) / stats["open"] * 100
+    return stats[["ticks", "volume", "vwap", "range_pct", "move_pct"]].reset_index()
+
+
+def _segment_bounds(codes):
+    """
+    Start and end (exclusive) row of each run of equal codes, for sorted codes.
+    """
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    return starts, np.r_[starts[1:], len(codes)]
+
+
+def reversion_events(symbols, timestamps, prices, volumes, thresholds=(1.5,), horizon=100, min_ticks=100,
+                     first_only=False):
+    """
+    VWAP mean-reversion event study of one day, for all symbols and thresholds.
+
+    Within each symbol (time order, symbols with at least `min_ticks` ticks),
+    the running VWAP is taken over the given ticks. An entry is a tick whose
+    deviation (price - VWAP) / VWAP reaches -threshold % after being above it
+    (or the first tick of the symbol); the last tick of a symbol is never an
+    entry. An entry has reverted if a later tick of the symbol trades at or
+    above its VWAP within `horizon` - 1 ticks; the next such tick comes from a
+    next-crossing index computed once for all thresholds.
+
+    first_only=True keeps only the first entry per symbol and threshold.
+
+    Returns a DataFrame with one row per entry: threshold, symbol, tick
+    (position within the symbol's ticks), timestamp, initial_deviation,
+    reverted, ticks_to_revert (horizon when not reverted) and
+    seconds_to_revert (NaN when not reverted).
+    """
+    columns = ["threshold", "symbol", "tick", "timestamp", "initial_deviation", "reverted", "ticks_to_revert",
+               "seconds_to_revert"]
+    symbols = np.asarray(symbols, dtype=object).astype(str)
+    timestamps = np.asarray(timestamps)
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+
+    names, codes = np.unique(symbols, return_inverse=True)
+    codes = codes.ravel()
+    keep = np.bincount(codes, minlength=len(names))[codes] >= min_ticks
+    order = np.flatnonzero(keep)[np.lexsort((timestamps[keep], codes[keep]))]
+    codes, timestamps, prices, volumes = codes[order], timestamps[order], prices[order], volumes[order]
+    if not len(prices):
+        return pd.DataFrame(columns=columns)
+
+    starts, ends = _segment_bounds(codes)
+    vwap = np.empty(len(prices))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start, end in zip(starts, ends):
+            vwap[start:end] = np.cumsum(prices[start:end] * volumes[start:end]) / np.cumsum(volumes[start:end])
+        deviation = (prices - vwap) / vwap * 100
+
+    n = len(prices)
+    position = np.arange(n)
+    segment = np.repeat(np.arange(len(starts)), ends - starts)
+    seg_start, seg_end = starts[segment], ends[segment]
+
+    # next tick at or above VWAP after each tick (n when there is none)
+    candidates = np.where(prices >= vwap, position, n)
+    after = np.r_[np.minimum.accumulate(candidates[::-1])[::-1][1:], n]
+    reverted = (after < seg_end) & (after - position < horizon)
+    ticks_to_revert = np.where(reverted, after - position, horizon)
+    revert_at = np.minimum(after, n - 1)
+    elapsed = timestamps[revert_at] - timestamps
+    if np.issubdtype(elapsed.dtype, np.timedelta64):
+        elapsed = elapsed / np.timedelta64(1, "s")
+    seconds_to_revert = np.where(reverted, elapsed, np.nan)
+
+    frames = []
+    for threshold in thresholds:
+        in_zone = deviation <= -threshold
+        entry = in_zone & (position < seg_end - 1)
+        entry[1:] &= ~in_zone[:-1] | (position[1:] == seg_start[1:])
+        rows = np.flatnonzero(entry)
+        if first_only:
+            rows = rows[np.unique(codes[rows], return_index=True)[1]]
+        frames.append(pd.DataFrame({
+            "threshold": threshold,
+            "symbol": names[codes[rows]],
+            "tick": rows - seg_start[rows],
+            "timestamp": timestamps[rows],
+            "initial_deviation": deviation[rows],
+            "reverted": reverted[rows],
+            "ticks_to_revert": ticks_to_revert[rows],
+            "seconds_to_revert": seconds_to_revert[rows],
+        }, columns=columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+def reversion_summary(events):
+    """
+    Hit rate and time-to-revert distribution per threshold of
+    reversion_events() (of one or several days).
+    """
+    reverted = events[events["reverted"]]
+    summary = pd.DataFrame({
+        "events": events.groupby("threshold").size(),
+        "hit_rate": events.groupby("threshold")["reverted"].mean() * 100,
+        "median_ticks": reverted.groupby("threshold")["ticks_to_revert"].median(),
+        "mean_ticks": reverted.groupby("threshold")["ticks_to_revert"].mean(),
+        "p90_ticks": reverted.groupby("threshold")["ticks_to_revert"].quantile(0.9),
+        "median_seconds": reverted.groupby("threshold")["seconds_to_revert"].median(),
+    })
+    return summary.reset_index()
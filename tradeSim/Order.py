@@ -1,47 +1,22 @@
-import time
-import csv
-import os
 import bisect
 from . import CommissionService
+from . import Timestamps
+from . import Universe
 
 
 class order:
     _order_counter = 1
-    _set50_symbols = set()
-    _csv_loaded = False
 
     @classmethod
     def load_set50_symbols(cls, csv_path=None):
-        if cls._csv_loaded:
-            return
-
-        if csv_path is None:
-            base_dir = os.path.dirname((__file__))
-            csv_path = os.path.join(
-                base_dir, "..", "marketInfo", "symbolSET50", "Symbol_SET50.csv"
-            )
-            csv_path = os.path.abspath(csv_path)
-
-        if not os.path.exists(csv_path):
-            raise FileNotFoundError(f"[ERROR] Cannot find SET50 list at '{csv_path}'")
-
-        with open(csv_path, mode="r", newline="", encoding="utf-8-sig") as file:
-            reader = csv.DictReader(file)
-            headers = [h.strip() for h in reader.fieldnames]
-
-            symbol_col = None
-            for h in headers:
-                if h.lower() == "symbol":
-                    symbol_col = h
-                    break
-            if symbol_col is None:
-                raise KeyError("[ERROR] 'Symbol' column not found in CSV headers.")
-
-            for row in reader:
-                symbol = row[symbol_col].strip().upper()
-                cls._set50_symbols.add(symbol)
-
-        cls._csv_loaded = True
+        """
+        Listed symbols of the universe orders are validated against (loaded once,
+        see Universe.py). A csv_path installs that file as the default universe.
+        """
+        if csv_path is not None:
+            Universe.set_default_universe(Universe.Universe.from_csv(csv_path))
+        universe = Universe.default_universe()
+        return set(universe.symbols[:universe.n_listed])
 
     def __init__(
         self,
@@ -54,7 +29,6 @@ class order:
         cum_buy_volume,
         timestamp=None,
     ):
-        order.load_set50_symbols()
         is_valid, reason = self.validate_order(
             volume, side, symbol, ownerPortfolio, price, cum_sell_volume, cum_buy_volume
         )
@@ -70,9 +44,11 @@ class order:
         self.price = price
         self.side = side
         self.symbol = symbol
+        self.symbol_id = Universe.default_universe().id_of(symbol)
         self.cum_sell_volume = cum_sell_volume
         self.cum_buy_volume = cum_buy_volume
-        self.timestamp = timestamp if timestamp is not None else time.time()
+        # epoch ns (see Timestamps.py)
+        self.timestamp = Timestamps.normalize(timestamp) if timestamp is not None else Timestamps.now_ns()
 
 
     def validate_order(self, volume, side, symbol, ownerPortfolio, price, cum_sell_volume, cum_buy_volume):
@@ -84,7 +60,7 @@ class order:
         if side.capitalize() not in {"Buy", "Sell"}:
             return False, f"Invalid side '{side}'. Must be 'Buy' or 'Sell'. Case sensitive."
         
-        if symbol.upper() not in self._set50_symbols:
+        if symbol not in Universe.default_universe():
             return False, f"Symbol '{symbol}' is not in SET50."
         
         if (
@@ -135,7 +111,7 @@ class order:
         return self.timestamp
 
     def get_formatted_timestamp(self):
-        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.timestamp))
+        return Timestamps.format_ns(self.timestamp)
 
     def get_order_info(self):
         return {
@@ -148,6 +124,37 @@ class order:
             "Timestamp": self.get_formatted_timestamp(),
         }
 
+    def to_dict(self):
+        return {
+            "order_number": self.order_number,
+            "volume": self.volume,
+            "price": self.price,
+            "side": self.side,
+            "symbol": self.symbol,
+            "cum_sell_volume": self.cum_sell_volume,
+            "cum_buy_volume": self.cum_buy_volume,
+            "timestamp": self.timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data, ownerPortfolio):
+        """
+        Rebuild a resting order that was already validated when it was first created.
+        Validation is skipped and the order counter is left untouched.
+        """
+        restored = cls.__new__(cls)
+        restored.order_number = str(data["order_number"])
+        restored.ownerPortfolio = ownerPortfolio
+        restored.volume = data["volume"]
+        restored.price = data["price"]
+        restored.side = str(data["side"])
+        restored.symbol = str(data["symbol"])
+        restored.symbol_id = Universe.default_universe().intern(restored.symbol)
+        restored.cum_sell_volume = data["cum_sell_volume"]
+        restored.cum_buy_volume = data["cum_buy_volume"]
+        restored.timestamp = Timestamps.normalize(data["timestamp"])
+        return restored
+
     # --------- Setter Methods ---------
     def set_owner(self, owner):
         self.owner = owner
@@ -0,0 +1,221 @@
+import hashlib
+import inspect
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from . import Memo
+
+# A step of a report: func(*args, *results of deps) -> result.
+# Data steps return what their dependents need (DataFrames, dicts), figure
+# steps save their file and return None. func must be a module-level function
+# so it can be sent to a worker process.
+# inputs: files read by the step (tick files, result CSVs), or a callable returning them
+# outputs: files written by the step (figures, reports); only steps with outputs are
+# tracked by an incremental run, see run(state=...)
+Job = namedtuple("Job", ["name", "func", "deps", "args", "inputs", "outputs"], defaults=((), (), (), ()))
+
+
+def figure(folder, name, func, deps=(), inputs=()):
+    """
+    Job saving the figure `name` in `folder`, its only output.
+    """
+    return Job(name, func, deps, inputs=inputs, outputs=[os.path.join(folder, name)])
+
+
+def use_agg():
+    """
+    Select matplotlib's non-interactive Agg backend (no-op without matplotlib).
+    """
+    try:
+        import matplotlib
+    except ImportError:
+        return
+    matplotlib.use("Agg")
+
+
+def _call(func, args):
+    return func(*args)
+
+
+def order(jobs, targets=None):
+    """
+    Names of the jobs needed for `targets` (all jobs by default) in a dependency
+    order, ties kept in declaration order. Raises ValueError for duplicate names,
+    unknown dependencies and cycles.
+    """
+    by_name = {}
+    for job in jobs:
+        if job.name in by_name:
+            raise ValueError(f"Duplicate job '{job.name}'")
+        by_name[job.name] = job
+
+    ordered, state = [], {}
+
+    def visit(name, path):
+        if name not in by_name:
+            raise ValueError(f"Unknown job '{name}'" + (f" (needed by '{path[-1]}')" if path else ""))
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        state[name] = "visiting"
+        for dep in by_name[name].deps:
+            visit(dep, path + [name])
+        state[name] = "done"
+        ordered.append(name)
+
+    for name in (by_name if targets is None else targets):
+        visit(name, [])
+    return ordered
+
+
+def _fingerprint(value, hasher):
+    if callable(value):
+        try:
+            path = inspect.getsourcefile(inspect.unwrap(value))
+        except TypeError:
+            path = None
+        return value.__qualname__, hasher.file_hash(path) if path else None
+    return repr(value)
+
+
+def stamps(jobs, hasher):
+    """
+    Stamp of every job: a hash of the source files defining its function (and
+    function arguments), its other arguments, its input files' contents and the
+    stamps of its dependencies, so a change upstream changes every stamp below.
+    `hasher` is a Memo.MemoCache whose file_hash() is used for the files.
+    """
+    by_name = {job.name: job for job in jobs}
+    result = {}
+    for name in order(jobs):
+        job = by_name[name]
+        inputs = job.inputs() if callable(job.inputs) else job.inputs
+        parts = [
+            [_fingerprint(value, hasher) for value in (job.func,) + tuple(job.args)],
+            sorted((str(path), hasher.file_hash(path)) for path in inputs),
+            [result[dep] for dep in job.deps],
+        ]
+        result[name] = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+    return result
+
+
+def load_state(state):
+    if not os.path.exists(state):
+        return {}
+    with open(state, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_state(state, recorded):
+    os.makedirs(os.path.dirname(os.path.abspath(state)), exist_ok=True)
+    tmp = f"{state}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as file:
+        json.dump(recorded, file, indent=1, sort_keys=True)
+    os.replace(tmp, state)
+
+
+def outdated(jobs, state, targets=None, force=False):
+    """
+    Jobs an incremental run has to execute, in dependency order, and the
+    current stamps. A job with outputs is stale when its stamp differs from the
+    one recorded in the `state` JSON file after its last successful run, or
+    one of its outputs is missing (force=True: always). Stale jobs are run with
+    the data steps they need; up-to-date outputs are left alone.
+    """
+    recorded = load_state(state)
+    current = stamps(jobs, Memo.MemoCache(os.path.dirname(os.path.abspath(state))))
+    by_name = {job.name: job for job in jobs}
+    stale = []
+    for name in order(jobs, targets):
+        outputs = by_name[name].outputs
+        if outputs and (force or recorded.get(name) != current[name]
+                        or not all(os.path.exists(path) for path in outputs)):
+            stale.append(name)
+    return (order(jobs, stale) if stale else []), current
+
+
+def run(jobs, workers=None, targets=None, state=None, force=False):
+    """
+    Run report jobs, each once, in a process pool of `workers` processes
+    (os.cpu_count() by default) with the Agg backend. A job is submitted as
+    soon as all of its dependencies have finished, so a shared DataFrame is
+    computed once and the figures using it render concurrently. workers=1 runs
+    the jobs in this process, in order.
+
+    With a `state` file the run is incremental: only outdated() jobs run, and
+    the stamps of the jobs with outputs that succeeded are recorded in it.
+
+    A failing job does not stop the independent ones; its dependents are
+    skipped and a RuntimeError naming the failed jobs is raised at the end.
+
+    Returns a dict job name -> result (of the jobs that ran).
+    """
+    by_name = {job.name: job for job in jobs}
+    if state is None:
+        pending = order(jobs, targets)
+    else:
+        pending, current = outdated(jobs, state, targets, force)
+        print(f"{len(pending)} of {len(order(jobs, targets))} report jobs outdated")
+
+    results, failed = _execute(by_name, pending, workers)
+
+    if state is not None:
+        recorded = load_state(state)
+        recorded.update({name: current[name] for name in results if by_name[name].outputs})
+        save_state(state, recorded)
+
+    if failed:
+        errors = [name for name, e in failed.items() if e is not None]
+        skipped = [name for name, e in failed.items() if e is None]
+        raise RuntimeError(f"Report jobs failed: {', '.join(errors)}"
+                           + (f" (skipped: {', '.join(skipped)})" if skipped else ""))
+    return results
+
+
+def _execute(by_name, pending, workers):
+    results, failed = {}, {}
+
+    def ready(name):
+        return all(dep in results for dep in by_name[name].deps)
+
+    def blocked(name):
+        return any(dep in failed for dep in by_name[name].deps)
+
+    def arguments(name):
+        job = by_name[name]
+        return tuple(job.args) + tuple(results[dep] for dep in job.deps)
+
+    if workers == 1:
+        use_agg()
+        for name in pending:
+            if blocked(name):
+                failed[name] = None
+                continue
+            try:
+                results[name] = by_name[name].func(*arguments(name))
+            except Exception as e:
+                print(f"[ERROR] Job '{name}' failed: {e!r}")
+                failed[name] = e
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_agg) as pool:
+            running = {}
+            while pending or running:
+                for name in [name for name in pending if blocked(name)]:
+                    failed[name] = None
+                    pending.remove(name)
+                for name in [name for name in pending if ready(name)]:
+                    running[pool.submit(_call, by_name[name].func, arguments(name))] = name
+                    pending.remove(name)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        print(f"[ERROR] Job '{name}' failed: {e!r}")
+                        failed[name] = e
+    return results, failed
@@ -1,4 +1,3 @@
-import pandas as pd
 import os
 
 
@@ -6,6 +5,9 @@ class summarize:
 
     @staticmethod
     def create_transaction_summarize(team_name):
+        # reporting only: keep pandas out of the engine's import path
+        import pandas as pd
+
         base_dir = os.path.abspath(
             os.path.join(os.path.dirname(__file__), "..", "result", team_name)
         )
@@ -2,6 +2,7 @@ from collections import defaultdict
 import csv
 import json
 from . import Stock
+from . import Universe
 import os
 from datetime import datetime
 import inspect
@@ -42,6 +43,14 @@ class portfolio:
         self.max_Draw_down = max_Draw_down
         self.No_win = No_win
         self.No_sell = No_sell
+        # symbol id -> its lots, in stocksList order
+        self.lots_by_id = {}
+        self._index_lots()
+
+    def _index_lots(self):
+        self.lots_by_id = {}
+        for stock in self.stocksList:
+            self.lots_by_id.setdefault(stock.symbol_id, []).append(stock)
 
     def add_stock(self, stock):
         # check if add stock is call for create_order
@@ -51,6 +60,7 @@ class portfolio:
             raise ValueError(f"add stock must be called from create_order(). unable to add stock from {caller}()")
 
         self.stocksList.append(stock)
+        self.lots_by_id.setdefault(stock.symbol_id, []).append(stock)
         self.update_portfolio_totals()
         self.update_avg_stocks_by_symbol(stock.get_symbol())
 
@@ -58,16 +68,17 @@ class portfolio:
 
         self.stocksList.sort(key=lambda stock: stock.buy_time)
 
+        sid = Universe.default_universe().id_of(symbol)
         remaining_volume = volume
         total_realized = 0.0
-        if self._isWin((price * volume), self._cal_avg_cost(symbol) * volume):
+        if self._isWin((price * volume), self._cal_avg_cost(sid) * volume):
             self._increase_numberOfWin()
         for s in list(self.stocksList):
 
             if remaining_volume == 0:
                 break
 
-            if s.get_symbol() == symbol:
+            if s.symbol_id == sid:
 
                 if s.get_realized() != 0.0:
                     total_realized = s.get_realized()
@@ -94,13 +105,16 @@ class portfolio:
                 if s.get_actual_vol() <= 0:
                     self.stocksList.remove(s)
 
+        # the sort may have reordered any symbol's lots
+        self._index_lots()
         self.update_portfolio_totals()
         self.update_avg_stocks_by_symbol(symbol)
 
     def update_avg_stocks_by_symbol(self, symbol):
-            for stocks in self.get_stock_by_symbol(symbol):
+            sid = Universe.default_universe().id_of(symbol)
+            for stocks in self.lots_by_id.get(sid, ()):
                 new_price = stocks.get_mkt_price()
-                symbol_avg_cost = self._cal_avg_cost(symbol)
+                symbol_avg_cost = self._cal_avg_cost(sid)
                 stocks.updateStockMk_value(new_price, symbol_avg_cost)
 
     def update_sold_stock_valueToPort(self, amount):
@@ -126,8 +140,8 @@ class portfolio:
             (self.unrealized / self.amount_cost) * 100 if self.amount_cost != 0 else 0.0
         )
 
-    def _cal_avg_cost(self, symbol):
-        symbol_stocks = self.get_stock_by_symbol(symbol)
+    def _cal_avg_cost(self, sid):
+        symbol_stocks = self.lots_by_id.get(sid, ())
         total_volume = 0
         total_cost = 0.0
         for stock in symbol_stocks:
@@ -194,19 +208,24 @@ class portfolio:
 
     def update_market_prices(self, price_updates: dict):
         """
-        price_updates: dict mapping symbol (str) -> new market price (float)
+        price_updates: dict mapping symbol id (int, see Universe.py) -> new market
+        price (float). Symbol names (str) are accepted too and looked up.
         """
-        for stock in self.stocksList:
-            if stock.get_symbol() in price_updates:
-                new_price = price_updates[stock.get_symbol()]
-                symbol_avg_cost = self._cal_avg_cost(stock.get_symbol())
-                stock.updateStockMk_value(new_price, symbol_avg_cost)
+        universe = Universe.default_universe()
+        for key, new_price in price_updates.items():
+            sid = universe.id_of(key) if isinstance(key, str) else key
+            lots = self.lots_by_id.get(sid)
+            if lots:
+                symbol_avg_cost = self._cal_avg_cost(sid)
+                for stock in lots:
+                    stock.updateStockMk_value(new_price, symbol_avg_cost)
         self.update_portfolio_totals()
 
     def has_stock(self, symbol, volume):
+        sid = Universe.default_universe().id_of(symbol)
         total_volume = 0.0
         for stock in self.stocksList:
-            if stock.get_symbol() == symbol:
+            if stock.symbol_id == sid:
                 total_volume += stock.get_actual_vol()
         if total_volume >= volume:
             return True
@@ -323,7 +342,8 @@ class portfolio:
         return result
 
     def get_stock_by_symbol(self, symbol):
-        return [stock for stock in self.stocksList if stock.get_symbol() == symbol]
+        sid = Universe.default_universe().id_of(symbol)
+        return list(self.lots_by_id.get(sid, ()))
 
     def get_total_stock_volume_by_symbol(self, symbol):
         total_volume = 0
@@ -0,0 +1,219 @@
+import cProfile
+import csv
+import marshal
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# cprofile : deterministic, every call is timed (exact counts, slows Python code down)
+# sample   : a background thread records the replay thread's stack every `interval`
+#            seconds (low overhead, statistical)
+PROFILERS = ("cprofile", "sample")
+
+
+def _label(func):
+    filename, _, name = func
+    return f"{os.path.basename(filename)}:{name}" if filename != "~" else name
+
+
+class StackSampler:
+    """
+    Low-overhead sampling profiler for one thread.
+
+    Every `interval` seconds the stack of the target thread is recorded from a
+    background thread, so the profiled code runs unmodified. Results are kept as
+    collapsed stacks (outermost frame first) with their sample counts.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def stats(self):
+        """
+        pstats-compatible dict built from the samples: sample time spent in each
+        function itself (tt) and below it (ct), with sample counts as call counts.
+        """
+        entries = defaultdict(lambda: [0, 0, 0.0, 0.0, defaultdict(lambda: [0, 0, 0.0, 0.0])])
+        for stack, count in self.stacks.items():
+            seconds = count * self.interval
+            entries[stack[-1]][2] += seconds
+            for func in set(stack):
+                entries[func][0] += count
+                entries[func][1] += count
+                entries[func][3] += seconds
+            for caller, callee in set(zip(stack, stack[1:])):
+                edge = entries[callee][4][caller]
+                edge[0] += count
+                edge[1] += count
+                edge[3] += seconds
+        return {
+            func: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers.items()})
+            for func, (cc, nc, tt, ct, callers) in entries.items()
+        }
+
+    def collapsed(self):
+        collapsed = Counter()
+        for stack, count in self.stacks.items():
+            collapsed[";".join(_label(func) for func in stack)] += count
+        return collapsed
+
+
+def collapse_stats(stats, unit=1e-6, resolution=1e-4, max_depth=64):
+    """
+    Collapsed stacks from a deterministic profile (pstats dict), weighted in
+    `unit` seconds. cProfile only keeps caller -> callee edges, so the own time of
+    a function is split across its call paths in proportion to the time each
+    caller spent in it. Paths lighter than `resolution` of the total time (or one
+    unit) are dropped, which bounds the number of paths.
+    """
+    collapsed = Counter()
+    min_weight = max(unit, resolution * sum(entry[2] for entry in stats.values()))
+
+    def walk(func, weight, path):
+        callers = stats[func][4] if func in stats else {}
+        callers = {caller: edge for caller, edge in callers.items() if caller not in path}
+        total = sum(edge[3] for edge in callers.values())
+        if not callers or len(path) >= max_depth or total <= 0:
+            collapsed[";".join(_label(f) for f in reversed(path))] += int(round(weight / unit))
+            return
+        for caller, edge in callers.items():
+            share = weight * edge[3] / total
+            if share >= min_weight:
+                walk(caller, share, path + [caller])
+
+    for func, (_, _, tt, _, _) in stats.items():
+        if tt >= min_weight:
+            walk(func, tt, [func])
+    return Counter({stack: weight for stack, weight in collapsed.items() if weight > 0})
+
+
+class DayProfiler:
+    """
+    Profiles the stages of replayed days (e.g. load, replay, close) and writes,
+    per day, into `folder`:
+
+    <date>.pstats     : profile readable with pstats / snakeviz
+    <date>.collapsed  : "frame;frame;frame weight" lines for flamegraph tools
+                        (weights: samples for "sample", microseconds for "cprofile")
+    <date>_stages.csv : wall time of every stage, plus the tracemalloc peak
+                        memory of the stage when trace_memory=True
+
+    With mode=None and trace_memory=False it only times the stages.
+    """
+
+    def __init__(self, folder, mode=None, interval=0.005, trace_memory=False):
+        if mode not in (None,) + PROFILERS:
+            raise ValueError(f"Unknown profiler '{mode}', expected one of {PROFILERS}")
+        self.folder = folder
+        self.mode = mode
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self._date = None
+        self._profiler = None
+        self._tracing = False
+        self._stages = []
+
+    def start_day(self, date):
+        self._date = date
+        self._stages = []
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+        elif self.mode == "sample":
+            self._profiler = StackSampler(self.interval)
+            self._profiler.start()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    @contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        if self.mode == "cprofile":
+            self._profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if self.mode == "cprofile":
+                self._profiler.disable()
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            self._stages.append((name, seconds, peak))
+
+    def end_day(self):
+        """
+        Write the day's files and return their paths.
+        """
+        if self.mode == "sample":
+            self._profiler.stop()
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        os.makedirs(self.folder, exist_ok=True)
+        written = [self._write_stages()]
+
+        if self.mode is not None:
+            if self.mode == "cprofile":
+                self._profiler.create_stats()
+                stats = self._profiler.stats
+                collapsed = collapse_stats(stats)
+            else:
+                stats = self._profiler.stats()
+                collapsed = self._profiler.collapsed()
+
+            pstats_path = os.path.join(self.folder, f"{self._date}.pstats")
+            with open(pstats_path, "wb") as file:
+                marshal.dump(stats, file)
+            collapsed_path = os.path.join(self.folder, f"{self._date}.collapsed")
+            with open(collapsed_path, "w", encoding="utf-8") as file:
+                for stack, weight in sorted(collapsed.items()):
+                    file.write(f"{stack} {weight}\n")
+            written += [pstats_path, collapsed_path]
+
+        self._profiler = None
+        return written
+
+    def _write_stages(self):
+        path = os.path.join(self.folder, f"{self._date}_stages.csv")
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Stage", "Seconds", "Peak Memory (bytes)"])
+            for name, seconds, peak in self._stages:
+                writer.writerow([name, f"{seconds:.6f}", "" if peak is None else peak])
+        return path
+
+    def print_day(self):
+        for name, seconds, peak in self._stages:
+            memory = f" | peak {peak / 2 ** 20:,.1f} MiB" if peak is not None else ""
+            print(f"  [profile] {name}: {seconds:.3f}s{memory}")
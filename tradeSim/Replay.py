@@ -0,0 +1,344 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from . import StrategyHandler
+from . import TradeSim
+from . import Order
+from . import MarketState
+from . import Timestamps
+from . import Universe
+from . import Features
+from . import Streaming
+
+TICKS_DIR = os.path.join(".", "marketInfo", "ticks")
+
+# legacy     : rows come from groupby + iloc, exactly as the notebook loop does
+# fast       : the round-robin order is computed once and rows are prebuilt dicts
+# vectorized : fast, plus market-price updates are skipped when they cannot change
+#              the portfolio (symbol not held and no fill since the last update)
+ENGINES = ("legacy", "fast", "vectorized")
+
+_DATE_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.csv$")
+
+
+def tick_file(date, ticks_dir=TICKS_DIR):
+    return os.path.join(ticks_dir, f"{date}.csv")
+
+
+def tick_files(dates, ticks_dir=TICKS_DIR):
+    return [tick_file(date, ticks_dir) for date in dates]
+
+
+def discover_dates(ticks_dir=TICKS_DIR, start=None, end=None):
+    """
+    List the trading days that have a tick file (YYYY-MM-DD.csv), optionally
+    limited to the inclusive range [start, end].
+    """
+    if not os.path.isdir(ticks_dir):
+        return []
+    dates = sorted(
+        m.group(1) for m in (_DATE_FILE.match(name) for name in os.listdir(ticks_dir)) if m
+    )
+    return [d for d in dates if (start is None or d >= start) and (end is None or d <= end)]
+
+
+def cache_file(daily_ticks):
+    """
+    Cached, prepared copy of a tick file: <ticks_dir>/cache/<date>.v<N>.pkl, where
+    N is the feature version (see Features.py).
+    """
+    ticks_dir, name = os.path.split(daily_ticks)
+    return os.path.join(ticks_dir, "cache", f"{os.path.splitext(name)[0]}.v{Features.VERSION}.pkl")
+
+
+def load_day(daily_ticks, cache=True):
+    """
+    Load one day of ticks the same way the notebook and runners do, plus the
+    engine and feature columns added by prepare_day().
+
+    With cache=True the prepared day is kept in cache_file() and reused while
+    the tick file is unchanged (same size and modification time). SymbolId is
+    recomputed on every load: ids of symbols outside the universe file depend
+    on the order they were met in this process.
+    """
+    stat = os.stat(daily_ticks)
+    source = (stat.st_size, stat.st_mtime_ns)
+    path = cache_file(daily_ticks)
+    if cache and os.path.exists(path):
+        df = pd.read_pickle(path)
+        if df.attrs.get("source") == source:
+            df[Universe.SYMBOL_ID_COLUMN] = Universe.default_universe().ids_for(df['ShareCode'])
+            return df
+
+    df = pd.read_csv(daily_ticks)
+    df['TradeDateTime'] = pd.to_datetime(df['TradeDateTime'])
+    df = prepare_day(df)
+
+    if cache:
+        df.attrs["source"] = source
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_pickle(tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[WARNING] Cannot cache ticks to '{path}': {e}")
+    return df
+
+
+def prepare_day(df, features=True):
+    """
+    Add the engine's columns, computed once per day, if they are missing:
+    EpochNs (int64 epoch-ns time, see Timestamps.py), SymbolId (universe id,
+    see Universe.py) and, unless features=False, the per-tick feature columns
+    (see Features.py).
+    """
+    if Timestamps.EPOCH_COLUMN not in df.columns:
+        df = df.assign(**{Timestamps.EPOCH_COLUMN: Timestamps.column_epoch_ns(df['TradeDateTime'])})
+    if Universe.SYMBOL_ID_COLUMN not in df.columns:
+        df = df.assign(**{Universe.SYMBOL_ID_COLUMN: Universe.default_universe().ids_for(df['ShareCode'])})
+    if features and any(column not in df.columns for column in Features.COLUMNS):
+        df = Features.add_features(df)
+    return df
+
+
+class StrategyBook:
+    """
+    One strategy with its own isolated tradeSim (portfolio, order book, logs) and
+    its own order numbering, so several books can share one replay.
+
+    shared_handler: True runs one strategy instance for all symbols through a
+    SharedStrategyHandler, False one instance per symbol (the notebook's layout).
+    None uses the strategy class attribute `shared_handler` (default False).
+
+    resume: Journal.ResumePoint of an interrupted day (see Journal.recover); the
+    book skips the ticks up to it and its strategies continue from its states.
+    """
+
+    def __init__(self, team_name, strategy_class, load_existing=True, journal=False, trading_Sim=None,
+                 shared_handler=None, resume=None):
+        self.team_name = team_name
+        self.strategy_class = strategy_class
+        if shared_handler is None:
+            shared_handler = getattr(strategy_class, "shared_handler", False)
+        self.shared_handler = shared_handler
+        if trading_Sim is None:
+            trading_Sim = TradeSim.tradeSim(team_name, load_existing=load_existing, journal=journal)
+        self.trading_Sim = trading_Sim
+        self.order_counter = 1
+        self.resume = resume
+
+
+class _Lane:
+    """
+    Per-book replay state: its handlers plus the bookkeeping of one _replay() pass.
+    """
+
+    def __init__(self, book, handlers, skip_until=-1):
+        self.book = book
+        self.trading_Sim = book.trading_Sim
+        self.handlers = handlers
+        # fill count at the last check and symbol ids held after it (vectorized engine)
+        self.fills_seen = -1
+        self.held_ids = set()
+        self.update_pending = True
+        # position of the last tick already processed before a resume
+        self.skip_until = skip_until
+        self.journal = book.trading_Sim.execution.journal
+
+
+def _legacy_rows(df):
+    grouped = df.groupby('ShareCode')
+    max_length = max((len(group) for _, group in grouped), default=0)
+
+    for tick in range(max_length):
+        for symbol, data in grouped:
+            if tick >= len(data):
+                continue
+            yield data.iloc[tick]
+
+
+def round_robin_order(df):
+    """
+    Positional index that puts the rows of a day in replay order: the n-th tick of
+    every symbol (in ShareCode order) before the (n+1)-th tick of any symbol.
+    """
+    codes, _ = pd.factorize(df['ShareCode'], sort=True)
+    rank = df.groupby('ShareCode', sort=False).cumcount().to_numpy()
+    return np.lexsort((codes, rank))
+
+
+def _prebuilt_rows(df):
+    ordered = df.iloc[round_robin_order(df)]
+    columns = list(ordered.columns)
+    for values in zip(*(ordered[c].tolist() for c in columns)):
+        yield dict(zip(columns, values))
+
+
+def run_day(trading_Sim, df, strategy_class, engine="legacy", shared_handler=None, on_tick=None, resume=None,
+            features=True):
+    """
+    Replay one day of ticks through a strategy.
+
+    One StrategyHandler is created per symbol and ticks are streamed round-robin:
+    the n-th tick of every symbol (in ShareCode order) before the (n+1)-th tick
+    of any symbol. After each tick the order book is matched and market prices
+    are updated, exactly like the notebook's headless loop. All engines produce
+    the same fills and NAV.
+
+    With shared_handler=True a single strategy instance sees every symbol
+    (see StrategyBook). on_tick(row), if given, is called after every tick has
+    been fully processed (e.g. to trace the portfolio state tick by tick).
+
+    df can also be a Streaming.TickStream, to replay a day that is too large to
+    load with bounded memory (fast and vectorized engines only).
+
+    resume (a Journal.ResumePoint, see Journal.recover) continues an interrupted
+    day: the ticks up to the resume point only update the MarketState, the
+    strategies start from the states it holds. The fills and NAV are the same as
+    an uninterrupted replay. With a fill journal, a resume point is written
+    after every tick on which the journal was synced, provided the strategy
+    declares its state_fields (see StrategyHandler.resumable); otherwise an
+    interrupted day is replayed again from its first tick.
+
+    features=False replays the raw ticks: the feature columns are left out
+    (dropped from a loaded day), so the strategies compute them from the rows
+    the way a hand-written loop does (see Equivalence.py).
+
+    Returns the day's MarketState.
+    """
+    book = StrategyBook(trading_Sim.portfolio.get_owner(), strategy_class, trading_Sim=trading_Sim,
+                        shared_handler=shared_handler, resume=resume)
+    return _replay([book], df, engine, swap_order_counter=False, on_tick=on_tick, features=features)
+
+
+def run_day_multi(books, df, engine="legacy", on_tick=None):
+    """
+    Replay one day of ticks through several strategies in a single pass.
+
+    Each row is produced once and handed to every StrategyBook in turn, in the
+    same round-robin order as run_day(). Books do not share any state: each has
+    its own handlers, portfolio and order book, and the global order counter is
+    swapped per book so order numbers match what a separate run would produce.
+    The MarketState is updated once per tick and shared by all books.
+
+    Returns the day's MarketState.
+    """
+    return _replay(books, df, engine, swap_order_counter=True, on_tick=on_tick)
+
+
+def _replay(books, df, engine, swap_order_counter, on_tick=None, features=True):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Must be one of {', '.join(ENGINES)}.")
+
+    if isinstance(df, Streaming.TickStream):
+        if engine == "legacy":
+            raise ValueError("The legacy engine needs a loaded day; stream with the fast or vectorized engine.")
+        if not features:
+            raise ValueError("Streamed ticks always carry the feature columns; replay raw ticks from a loaded day.")
+        symbols = df.symbols
+        rows = df.rows()
+    else:
+        if not features:
+            df = df.drop(columns=[column for column in Features.COLUMNS if column in df.columns])
+        df = prepare_day(df, features)
+        symbols = df['ShareCode'].unique()
+        rows = _legacy_rows(df) if engine == "legacy" else _prebuilt_rows(df)
+
+    market_state = MarketState.MarketState(symbols)
+    lanes = []
+    for book in books:
+        strategy_runner = book.trading_Sim.get_strategy_runner()
+        if book.shared_handler:
+            shared = StrategyHandler.SharedStrategyHandler(book.strategy_class, strategy_runner, symbols, market_state)
+            handlers = dict.fromkeys(symbols, shared)
+        else:
+            handlers = {
+                symbol: StrategyHandler.StrategyHandler(book.strategy_class, strategy_runner, market_state)
+                for symbol in symbols
+            }
+        skip_until = -1
+        if book.resume is not None:
+            skip_until = book.resume.tick
+            if book.shared_handler:
+                shared.set_state(book.resume.handlers)
+            else:
+                for symbol, state in book.resume.handlers.items():
+                    handlers[symbol].set_state(state)
+            book.order_counter = Order.order._order_counter = book.resume.order_counter
+        lanes.append(_Lane(book, handlers, skip_until))
+
+    skip_idle_updates = engine == "vectorized"
+
+    for tick, row in enumerate(rows):
+        symbol = row['ShareCode']
+        sid = row[Universe.SYMBOL_ID_COLUMN]
+        price_update = {sid: row['LastPrice']}
+        market_state.update(symbol, row['LastPrice'], row['Volume'], row[Timestamps.EPOCH_COLUMN])
+
+        for lane in lanes:
+            book, trading_Sim, handlers = lane.book, lane.trading_Sim, lane.handlers
+            if tick <= lane.skip_until:
+                continue
+            if swap_order_counter:
+                Order.order._order_counter = book.order_counter
+
+            handlers[symbol].process_row(row)
+
+            if not trading_Sim.isOrderbooksEmpty():
+                trading_Sim.isMatch(row)
+
+            if skip_idle_updates:
+                fills = trading_Sim.execution.fill_count
+                if fills != lane.fills_seen:
+                    # lots only change through fills; cash may have moved too,
+                    # so the next update must run even for a symbol not held
+                    lane.fills_seen = fills
+                    lane.held_ids = set(trading_Sim.portfolio.lots_by_id)
+                    lane.update_pending = True
+                if lane.update_pending or sid in lane.held_ids:
+                    trading_Sim.update_market_prices(price_update)
+                    lane.update_pending = False
+            else:
+                trading_Sim.update_market_prices(price_update)
+
+            if swap_order_counter:
+                book.order_counter = Order.order._order_counter
+
+            journal = lane.journal
+            if journal is not None and journal.synced_seq != journal.state_seq and handlers[symbol].resumable:
+                if book.shared_handler:
+                    states = handlers[symbol].get_state()
+                else:
+                    states = {s: handler.get_state() for s, handler in handlers.items()}
+                journal.record_state(tick, trading_Sim, states, Order.order._order_counter)
+
+        if on_tick is not None:
+            on_tick(row)
+
+    return market_state
+
+
+def close_day(trading_Sim, team_name, trading_date, output="json"):
+    """
+    End-of-day bookkeeping shared by the runners: flush logs, write the
+    transaction summary, portfolio file(s) and daily summary row.
+
+    output: "json" (portfolio JSON), "snapshot" (binary snapshot) or "both".
+
+    With a fill journal the snapshot is always written, after the summary row:
+    it checkpoints the journal, so until the day is in the summary its fills
+    stay journaled (see Backtest.run(resume=True)).
+    """
+    trading_Sim.flushTransactionLog()
+    trading_Sim.flushErrorLogger()
+    trading_Sim.create_transaction_summarize(team_name)
+    if output in ("json", "both"):
+        trading_Sim.save_portfolio()
+    journaled = trading_Sim.execution.journal is not None
+    if output in ("snapshot", "both") and not journaled:
+        trading_Sim.save_snapshot()
+    trading_Sim.save_summary_csv(trading_date)
+    if journaled:
+        trading_Sim.save_snapshot()
@@ -0,0 +1,183 @@
+import os
+import numpy as np
+from . import Portfolio
+from . import Stock
+from . import Order
+from . import Timestamps
+
+# 2: buy_time / order timestamp stored as int64 epoch ns (1: float epoch seconds)
+SNAPSHOT_VERSION = 2
+
+_STOCK_DTYPE = np.dtype([
+    ("symbol", "U16"),
+    ("start_vol", "f8"),
+    ("actual_vol", "f8"),
+    ("buy_price", "f8"),
+    ("mkt_price", "f8"),
+    ("buy_time", "i8"),
+    ("amount_cost", "f8"),
+    ("avg_cost", "f8"),
+    ("market_value", "f8"),
+    ("unrealized", "f8"),
+    ("unrealizedInPercentage", "f8"),
+    ("realized", "f8"),
+])
+
+_ORDER_DTYPE = np.dtype([
+    ("order_number", "U16"),
+    ("symbol", "U16"),
+    ("side", "U4"),
+    ("volume", "f8"),
+    ("price", "f8"),
+    ("cum_sell_volume", "f8"),
+    ("cum_buy_volume", "f8"),
+    ("timestamp", "i8"),
+    ("volume_is_int", "?"),
+])
+
+# portfolio scalars kept in one float64 vector, None is stored as NaN
+_PORTFOLIO_FIELDS = (
+    "amountByCost",
+    "unrealized",
+    "unrealizedInPercentage",
+    "realized",
+    "cashbalance",
+    "cashbalance_start",
+    "prevousDay_maxDD",
+    "nav",
+    "max_nav",
+    "min_nav",
+    "max_Draw_down",
+    "No_win",
+    "No_sell",
+)
+_INT_FIELDS = {"No_win", "No_sell"}
+
+
+def snapshot_path(team_name, folder="result"):
+    return os.path.join(folder, team_name, f"{team_name}_portfolio.npz")
+
+
+def save_snapshot(trading_sim, file_path=None):
+    """
+    Write the full in-memory state of a tradeSim (portfolio, lots, resting orders
+    and the global order counter) to a versioned NumPy archive.
+
+    Unlike the JSON portfolio file, every field is kept so a restored simulation
+    continues exactly where it stopped, including intraday NAV tracking.
+    If the simulation has a fill journal, the journal is checkpointed once the
+    snapshot is on disk.
+    """
+    port = trading_sim.portfolio
+    if file_path is None:
+        file_path = snapshot_path(port.get_owner())
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+    stocks = np.empty(len(port.stocksList), dtype=_STOCK_DTYPE)
+    for i, s in enumerate(port.stocksList):
+        stocks[i] = (
+            s.symbol, s.start_vol, s.actual_vol, s.buy_price, s.mkt_price, s.buy_time,
+            s.amount_cost, s.avg_cost, s.market_value, s.unrealized,
+            s.unrealizedInPercentage, s.realized,
+        )
+
+    book = trading_sim.execution.Orders_Book
+    orders = np.empty(len(book), dtype=_ORDER_DTYPE)
+    for i, o in enumerate(book):
+        d = o.to_dict()
+        d["volume_is_int"] = isinstance(d["volume"], (int, np.integer))
+        orders[i] = tuple(d[name] for name in _ORDER_DTYPE.names)
+
+    scalars = np.array(
+        [np.nan if getattr(port, f) is None else getattr(port, f) for f in _PORTFOLIO_FIELDS],
+        dtype="f8",
+    )
+
+    journal = trading_sim.execution.journal
+    journal_seq = journal.seq if journal is not None else 0
+
+    # write through a temp file so a crash never leaves a half-written snapshot
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            version=np.array(SNAPSHOT_VERSION),
+            owner=np.array(port.get_owner()),
+            scalars=scalars,
+            stocks=stocks,
+            orders=orders,
+            order_counter=np.array(Order.order._order_counter),
+            journal_seq=np.array(journal_seq),
+        )
+    os.replace(tmp_path, file_path)
+
+    if journal is not None:
+        journal.checkpoint()
+    return file_path
+
+
+def load_snapshot(team_name, file_path=None):
+    """
+    Read a snapshot written by save_snapshot().
+
+    Returns
+    -------
+    tuple
+        (portfolio, orders_book, order_counter, journal_seq)
+    """
+    if file_path is None:
+        file_path = snapshot_path(team_name)
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Snapshot for {team_name} does not exist: {file_path}")
+
+    with np.load(file_path, allow_pickle=False) as data:
+        version = int(data["version"])
+        if version not in (1, SNAPSHOT_VERSION):
+            raise ValueError(
+                f"Unsupported snapshot version {version} in {file_path} (expected {SNAPSHOT_VERSION})"
+            )
+        owner = str(data["owner"])
+        scalars = data["scalars"]
+        stocks = data["stocks"]
+        orders = data["orders"]
+        order_counter = int(data["order_counter"])
+        journal_seq = int(data["journal_seq"])
+
+    kwargs = {}
+    for name, value in zip(_PORTFOLIO_FIELDS, scalars.tolist()):
+        if value != value:  # NaN -> None
+            value = None
+        elif name in _INT_FIELDS:
+            value = int(value)
+        kwargs[name] = value
+
+    stocksList = []
+    for row in stocks.tolist():
+        (symbol, start_vol, actual_vol, buy_price, mkt_price, buy_time, amount_cost,
+         avg_cost, market_value, unrealized, unrealized_pct, realized) = row
+        s = Stock.stock(
+            symbol=symbol,
+            start_vol=int(start_vol),
+            buy_price=buy_price,
+            mkt_price=mkt_price,
+            buytime=Timestamps.normalize(buy_time),
+            amount_cost=amount_cost,
+            avg_cost=avg_cost,
+            market_value=market_value,
+            unrealized=unrealized,
+            unrealizedInPercentage=unrealized_pct,
+            realized=realized,
+        )
+        s.actual_vol = int(actual_vol)
+        stocksList.append(s)
+
+    port = Portfolio.portfolio(owner=owner, stocksList=stocksList, **kwargs)
+
+    orders_book = []
+    for row in orders.tolist():
+        d = dict(zip(_ORDER_DTYPE.names, row))
+        if d.pop("volume_is_int"):
+            d["volume"] = int(d["volume"])
+        orders_book.append(Order.order.from_dict(d, port))
+
+    return port, orders_book, order_counter, journal_seq
@@ -1,6 +1,6 @@
-import time
-import datetime
 import inspect
+from . import Timestamps
+from . import Universe
 
 
 class stock:
@@ -19,6 +19,7 @@ class stock:
         realized=0.0,
     ):
         self.symbol = symbol
+        self.symbol_id = Universe.default_universe().intern(symbol)
         self.start_vol = start_vol
         self.actual_vol = start_vol
         self.buy_price = buy_price
@@ -114,9 +115,7 @@ class stock:
         return self.realized
 
     def get_buy_time_str(self):
-        return datetime.datetime.fromtimestamp(self.buy_time).strftime(
-            "%Y-%m-%d %H:%M:%S"
-        )
+        return Timestamps.format_ns(self.buy_time)
 
     def to_dict(self):
         return {
@@ -137,7 +136,7 @@ class stock:
             symbol=data["symbol"],
             start_vol=int(data["start_vol"]),
             buy_price=float(data["buy_price"]),
-            buytime=data["buy_time"],
+            buytime=Timestamps.normalize(data["buy_time"]),
             amount_cost=float(data["amount_cost"]),
             market_value=float(data["market_value"]),
             unrealized=float(data["unrealized"]),
@@ -1,8 +1,36 @@
 import copy
+import datetime
 from types import MappingProxyType
+import numpy as np
+from . import Universe
+from . import Features
+
+
+def _field_state(value):
+    # one JSON-friendly entry per declared strategy field
+    if hasattr(value, "get_state"):
+        return {"indicator": value.get_state()}
+    if isinstance(value, np.ndarray):
+        return {"array": value.tolist(), "dtype": str(value.dtype)}
+    if type(value) is datetime.date:
+        return {"date": value.isoformat()}
+    return {"value": value}
+
+
+def _restore_field(strategy, name, state):
+    if "indicator" in state:
+        getattr(strategy, name).set_state(state["indicator"])
+    elif "array" in state:
+        setattr(strategy, name, np.array(state["array"], dtype=state["dtype"]))
+    elif "date" in state:
+        setattr(strategy, name, datetime.date.fromisoformat(state["date"]))
+    else:
+        setattr(strategy, name, state["value"])
+
 
 class StrategyHandler:
-    def __init__(self, strategy_class, strategy_runner):
+    def __init__(self, strategy_class, strategy_runner, market_state=None):
+        self._market_state = market_state
         self.strategy = strategy_class(self)
         self._runner = strategy_runner
         self._current_row = None
@@ -15,16 +43,53 @@ class StrategyHandler:
         #made deep copy and readonly
         self._current_row = MappingProxyType(copy.deepcopy(dict(row)))
 
-        flag = row["Flag"]
-        volume = row["Volume"]
-        
-        if flag == "Buy":
-            self.cum_buy_volume += volume
-        elif flag == "Sell":
-            self.cum_sell_volume += volume
+        cum_buy_volume = row.get(Features.CUM_BUY_VOL) if hasattr(row, "get") else None
+        if cum_buy_volume is not None:
+            # precomputed by Replay.prepare_day()
+            self.cum_buy_volume = cum_buy_volume
+            self.cum_sell_volume = row[Features.CUM_SELL_VOL]
+        else:
+            flag = row["Flag"]
+            volume = row["Volume"]
+
+            if flag == "Buy":
+                self.cum_buy_volume += volume
+            elif flag == "Sell":
+                self.cum_sell_volume += volume
 
         self.strategy.on_data(self._current_row)
 
+    @property
+    def resumable(self):
+        """
+        True when the strategy declares the attributes that carry its state
+        across ticks (a `state_fields` tuple); only then can an interrupted day
+        continue mid-day.
+        """
+        return hasattr(self.strategy, "state_fields")
+
+    def _strategy_state(self):
+        return {name: _field_state(getattr(self.strategy, name)) for name in self.strategy.state_fields}
+
+    def _restore_strategy(self, state):
+        for name, field in state.items():
+            _restore_field(self.strategy, name, field)
+
+    def get_state(self):
+        """
+        JSON-friendly state of the handler and of the strategy's state_fields
+        (plain values, NumPy arrays, dates and indicators with get_state()),
+        kept in the journal's resume points so an interrupted day continues
+        mid-day (see Journal.py).
+        """
+        return {"cum_buy_volume": self.cum_buy_volume, "cum_sell_volume": self.cum_sell_volume,
+                "strategy": self._strategy_state()}
+
+    def set_state(self, state):
+        self.cum_buy_volume = state["cum_buy_volume"]
+        self.cum_sell_volume = state["cum_sell_volume"]
+        self._restore_strategy(state["strategy"])
+
     def create_order_to_limit(self, volume, price, side, symbol):
         if self._current_row is None:
             raise RuntimeError("There is error in daily tick row data. Please check the data source.")
@@ -35,6 +100,14 @@ class StrategyHandler:
             raise RuntimeError("There is error in daily tick row data. Please check the data source.")
         return self._runner.create_order_at_market(volume, side, symbol, self.cum_sell_volume, self.cum_buy_volume, self._current_row)
 
+    def get_market_state(self):
+        """
+        Market-wide state (TCR, advancers/decliners, turnover) maintained by the
+        replay engine, already including the current tick. None when the handler
+        is driven without an engine (e.g. a hand-written loop).
+        """
+        return self._market_state
+
     def check_port_has_stock(self, symbol, volume):
         return self._runner.check_port_has_stock(symbol, volume)
 
@@ -67,3 +140,109 @@ class StrategyHandler:
     
     def get_number_of_sells(self):
         return self._runner.get_number_of_sells()
+
+
+class SharedStrategyHandler(StrategyHandler):
+    """
+    Handler that feeds every symbol's ticks to ONE strategy instance.
+
+    Cumulative buy/sell volumes are kept per symbol in NumPy arrays indexed by
+    the universe symbol id (see Universe.py), so the strategy can look across
+    all symbols of the day (e.g. a tick clustering ratio) without extra passes.
+    Orders are validated against the cumulative volumes of the symbol they are
+    placed on.
+    """
+
+    def __init__(self, strategy_class, strategy_runner, symbols=(), market_state=None):
+        self._market_state = market_state
+        self._runner = strategy_runner
+        self._current_row = None
+        self._current_id = None
+
+        self.universe = Universe.default_universe()
+        self.cum_buy_volumes = np.zeros(len(self.universe), dtype=np.int64)
+        self.cum_sell_volumes = np.zeros(len(self.universe), dtype=np.int64)
+        for symbol in symbols:
+            self.symbol_id(symbol)
+
+        self.strategy = strategy_class(self)
+
+    def symbol_id(self, symbol):
+        """
+        Universe id of `symbol`; the volume arrays grow for symbols outside the file.
+        """
+        sid = self.universe.intern(symbol)
+        self._ensure_capacity(sid)
+        return sid
+
+    def _ensure_capacity(self, sid):
+        old = len(self.cum_buy_volumes)
+        if sid >= old:
+            size = max(sid + 1, 2 * old)
+            self.cum_buy_volumes = np.resize(self.cum_buy_volumes, size)
+            self.cum_sell_volumes = np.resize(self.cum_sell_volumes, size)
+            self.cum_buy_volumes[old:] = 0
+            self.cum_sell_volumes[old:] = 0
+
+    @property
+    def cum_buy_volume(self):
+        return 0 if self._current_id is None else self.cum_buy_volumes[self._current_id].item()
+
+    @property
+    def cum_sell_volume(self):
+        return 0 if self._current_id is None else self.cum_sell_volumes[self._current_id].item()
+
+    def process_row(self, row):
+
+        #made deep copy and readonly
+        self._current_row = MappingProxyType(copy.deepcopy(dict(row)))
+
+        sid = row.get(Universe.SYMBOL_ID_COLUMN) if hasattr(row, "get") else None
+        if sid is None:
+            sid = self.symbol_id(row["ShareCode"])
+        else:
+            sid = int(sid)
+            self._ensure_capacity(sid)
+        self._current_id = sid
+
+        cum_buy_volume = row.get(Features.CUM_BUY_VOL) if hasattr(row, "get") else None
+        if cum_buy_volume is not None:
+            self.cum_buy_volumes[sid] = cum_buy_volume
+            self.cum_sell_volumes[sid] = row[Features.CUM_SELL_VOL]
+        else:
+            flag = row["Flag"]
+            volume = row["Volume"]
+
+            if flag == "Buy":
+                self.cum_buy_volumes[sid] += volume
+            elif flag == "Sell":
+                self.cum_sell_volumes[sid] += volume
+
+        self.strategy.on_data(self._current_row)
+
+    def get_state(self):
+        return {"cum_buy_volumes": self.cum_buy_volumes.tolist(), "cum_sell_volumes": self.cum_sell_volumes.tolist(),
+                "strategy": self._strategy_state()}
+
+    def set_state(self, state):
+        self.cum_buy_volumes = np.array(state["cum_buy_volumes"], dtype=np.int64)
+        self.cum_sell_volumes = np.array(state["cum_sell_volumes"], dtype=np.int64)
+        self._restore_strategy(state["strategy"])
+
+    def _volumes_of(self, symbol):
+        sid = self.universe.id_of(symbol)
+        if sid is None or sid >= len(self.cum_buy_volumes):
+            return 0, 0
+        return self.cum_sell_volumes[sid].item(), self.cum_buy_volumes[sid].item()
+
+    def create_order_to_limit(self, volume, price, side, symbol):
+        if self._current_row is None:
+            raise RuntimeError("There is error in daily tick row data. Please check the data source.")
+        cum_sell_volume, cum_buy_volume = self._volumes_of(symbol)
+        return self._runner.create_order_to_limit(volume, price, side, symbol, cum_sell_volume, cum_buy_volume, self._current_row)
+
+    def create_order_at_market(self, volume, side, symbol):
+        if self._current_row is None:
+            raise RuntimeError("There is error in daily tick row data. Please check the data source.")
+        cum_sell_volume, cum_buy_volume = self._volumes_of(symbol)
+        return self._runner.create_order_at_market(volume, side, symbol, cum_sell_volume, cum_buy_volume, self._current_row)
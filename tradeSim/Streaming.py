@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from . import Timestamps
+from . import Universe
+from . import Features
+
+# Rows per CSV chunk and (about) per replay block; memory use of a streamed day
+# grows with this, not with the size of the day.
+CHUNK_ROWS = 200_000
+
+# One tick of a symbol in a spill file. TradeDateTime is kept as wall-clock ns.
+_RECORD = np.dtype([("t", "i8"), ("p", "f8"), ("v", "i8"), ("f", "i2")])
+
+
+class TickStream:
+    """
+    A tick day replayed with bounded memory, for days too large to load whole.
+
+    The replay order is round-robin (the n-th tick of every symbol before the
+    (n+1)-th tick of any symbol), so it cannot be produced from the time-ordered
+    file in one pass. Instead the file is read in time-ordered chunks of
+    `chunk_rows` rows and every symbol's ticks are appended to its own spill
+    file. blocks() then reads a window of tick ranks from every spill file at a
+    time, so that no more than about `chunk_rows` rows are in memory at once.
+
+    Replay.run_day / run_day_multi accept a TickStream in place of a DataFrame
+    (fast and vectorized engines); rows carry the same columns and values as a
+    day loaded by Replay.load_day, so the fills are identical. Columns other
+    than ShareCode, TradeDateTime, LastPrice, Volume and Flag are not kept.
+
+        with Streaming.TickStream(Replay.tick_file(date)) as day:
+            Replay.run_day(trading_Sim, day, strategy_class, "vectorized")
+    """
+
+    def __init__(self, daily_ticks, chunk_rows=CHUNK_ROWS, spill_dir=None):
+        self.daily_ticks = daily_ticks
+        self.chunk_rows = chunk_rows
+        self.symbols = []  # in order of first appearance, like df['ShareCode'].unique()
+        self.counts = {}
+        self.trading_date = None
+        self.n_rows = 0
+        self._flags = []
+        self._paths = {}
+        self._folder = tempfile.mkdtemp(prefix="ticks-", dir=spill_dir)
+        try:
+            self._spill()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """
+        Remove the spill files.
+        """
+        shutil.rmtree(self._folder, ignore_errors=True)
+
+    def _spill(self):
+        flag_codes = {}
+        paths = self._paths
+        for chunk in pd.read_csv(self.daily_ticks, chunksize=self.chunk_rows):
+            volumes = chunk['Volume'].to_numpy()
+            if not np.array_equal(volumes, volumes.astype(np.int64)):
+                raise ValueError(f"[ERROR] Non-integer volumes in '{self.daily_ticks}' cannot be streamed.")
+            times = pd.to_datetime(chunk['TradeDateTime']).to_numpy(dtype="datetime64[ns]")
+            if self.trading_date is None:
+                self.trading_date = pd.Timestamp(times[0]).date()
+
+            flags, flag_table = pd.factorize(chunk['Flag'].astype(str))
+            flag_map = np.array([flag_codes.setdefault(flag, len(flag_codes)) for flag in flag_table], dtype=np.int16)
+
+            records = np.empty(len(chunk), dtype=_RECORD)
+            records["t"] = times.astype(np.int64)
+            records["p"] = chunk['LastPrice'].to_numpy(dtype=np.float64)
+            records["v"] = volumes
+            records["f"] = flag_map[flags]
+
+            codes, names = pd.factorize(chunk['ShareCode'])
+            order = np.argsort(codes, kind="stable")
+            bounds = np.r_[0, np.cumsum(np.bincount(codes, minlength=len(names)))]
+            for code, symbol in enumerate(names):
+                if symbol not in paths:
+                    self.symbols.append(symbol)
+                    self.counts[symbol] = 0
+                    paths[symbol] = os.path.join(self._folder, f"{len(paths)}.bin")
+                with open(paths[symbol], "ab") as file:
+                    records[order[bounds[code]:bounds[code + 1]]].tofile(file)
+                self.counts[symbol] += int(bounds[code + 1] - bounds[code])
+            self.n_rows += len(chunk)
+
+        self._flags = np.array(list(flag_codes), dtype=object)
+        # intern in the order prepare_day() does, so SymbolIds match a full load
+        Universe.default_universe().ids_for(sorted(self.symbols))
+
+    def blocks(self):
+        """
+        Yield the day in replay order as blocks: dicts column name -> NumPy array,
+        with the columns of Replay.prepare_day().
+        """
+        universe = Universe.default_universe()
+        ordered = sorted(self.symbols)  # ShareCode order within a round
+        ids = np.array([universe.id_of(symbol) for symbol in ordered], dtype=np.int64)
+        names = np.array(ordered, dtype=object)
+        counts = np.array([self.counts[symbol] for symbol in ordered])
+        window = max(1, self.chunk_rows // max(1, len(ordered)))
+        carry = {}
+
+        for first in range(0, int(counts.max(initial=0)), window):
+            parts, codes, ranks = [], [], []
+            for code in np.flatnonzero(counts > first):
+                n = min(window, counts[code] - first)
+                parts.append(np.fromfile(self._paths[ordered[code]], dtype=_RECORD, count=n,
+                                         offset=first * _RECORD.itemsize))
+                codes.append(np.full(n, code))
+                ranks.append(np.arange(first, first + n))
+            codes = np.concatenate(codes)
+            order = np.lexsort((codes, np.concatenate(ranks)))
+            records, codes = np.concatenate(parts)[order], codes[order]
+
+            wall_ns = records["t"]
+            epoch_ns = wall_ns - Timestamps.MARKET_UTC_OFFSET_NS
+            flags = self._flags[records["f"]]
+            block = {
+                "ShareCode": names[codes],
+                "TradeDateTime": wall_ns.astype("datetime64[ns]"),
+                "LastPrice": records["p"],
+                "Volume": records["v"],
+                "Flag": flags,
+                Timestamps.EPOCH_COLUMN: epoch_ns,
+                Universe.SYMBOL_ID_COLUMN: ids[codes],
+            }
+            block.update(Features.compute(ids[codes], epoch_ns, records["p"], records["v"], flags, carry=carry))
+            yield block
+
+    def rows(self):
+        """
+        Rows in replay order as dicts, like the fast engine builds them from a
+        loaded day.
+        """
+        for block in self.blocks():
+            columns = list(block)
+            values = [pd.DatetimeIndex(block[c]).tolist() if c == "TradeDateTime" else block[c].tolist()
+                      for c in columns]
+            for row in zip(*values):
+                yield dict(zip(columns, row))
@@ -0,0 +1,172 @@
+import argparse
+import csv
+import datetime
+import os
+import numpy as np
+import pandas as pd
+from . import CommissionService
+from . import Universe
+
+# Synthetic tick days in the tick file schema, for scale testing:
+#
+#   ShareCode, TradeDateTime, LastPrice, Volume, Flag
+#
+# Every symbol has one opening auction trade (Flag "OPEN") between 09:55 and
+# 10:00, then Buy/Sell trades spread over the two continuous sessions. Prices
+# move on the tick grid of CommissionService.commissionService.price_range /
+# slippages, so every price is a valid price of its tier.
+COLUMNS = ["ShareCode", "TradeDateTime", "LastPrice", "Volume", "Flag"]
+SESSIONS = ((datetime.time(10, 0), datetime.time(12, 30)), (datetime.time(14, 30), datetime.time(16, 30)))
+OPEN_AUCTION = (datetime.time(9, 55), datetime.time(10, 0))
+MAX_PRICE = 1000
+
+
+def price_ladder(max_price=MAX_PRICE):
+    """
+    Every valid price up to max_price, ascending: the tick size of each tier
+    of commissionService.price_range applies from its lower bound on.
+    """
+    service = CommissionService.commissionService
+    bounds = [0] + list(service.price_range) + [max_price]
+    cents = []
+    for tier, tick in enumerate(service.slippages):
+        tick_cents = int(round(tick * 100))
+        low, high = int(bounds[tier] * 100), int(bounds[tier + 1] * 100)
+        cents.append(np.arange(max(low, tick_cents), high, tick_cents))
+    return np.concatenate(cents) / 100
+
+
+def _seconds(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _session_times(rng, n):
+    """
+    n sorted times (seconds of day) spread uniformly over the continuous sessions.
+    """
+    lengths = [_seconds(end) - _seconds(start) for start, end in SESSIONS]
+    offsets = np.sort(rng.integers(0, sum(lengths), n))
+    first = offsets >= lengths[0]
+    return np.where(first, offsets - lengths[0] + _seconds(SESSIONS[1][0]), offsets + _seconds(SESSIONS[0][0]))
+
+
+def symbol_names(n_symbols, universe=None):
+    """
+    The listed symbols of the universe (SET50 by default) in file order, then
+    SYN0051, SYN0052, ... up to n_symbols.
+    """
+    universe = Universe.default_universe() if universe is None else universe
+    listed = universe.symbols[:universe.n_listed]
+    return listed[:n_symbols] + [f"SYN{i:04d}" for i in range(len(listed) + 1, n_symbols + 1)]
+
+
+def generate_day(date, n_symbols=50, ticks_per_symbol=1000, seed=0, anomaly=False, cluster_share=0.7,
+                 symbols=None):
+    """
+    One synthetic trading day as a DataFrame in tick file order (by time).
+
+    ticks_per_symbol is the mean number of continuous-session trades per symbol;
+    the activity of symbols varies around it (log-normally).
+
+    anomaly=True reproduces an anomaly day with heavy tick clustering:
+    `cluster_share` of the symbols only trade at two adjacent prices all day, so
+    the tick clustering ratio is at least that share.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = symbol_names(n_symbols) if symbols is None else list(symbols)
+    ladder = price_ladder()
+    day = pd.Timestamp(date)
+
+    activity = rng.lognormal(0.0, 0.6, len(symbols))
+    counts = rng.poisson(ticks_per_symbol * activity / activity.mean())
+    start_levels = np.searchsorted(ladder, np.exp(rng.uniform(np.log(2), np.log(400), len(symbols))))
+    clustered = rng.random(len(symbols)) < cluster_share if anomaly else np.zeros(len(symbols), dtype=bool)
+
+    frames = []
+    for symbol, n, level, is_clustered in zip(symbols, counts, start_levels, clustered):
+        if is_clustered:
+            # bid/ask bounce between two adjacent prices
+            levels = level + rng.integers(0, 2, n)
+            steps = np.diff(np.r_[level, levels])
+        else:
+            steps = rng.choice([-2, -1, 0, 1, 2], n, p=[0.02, 0.2, 0.56, 0.2, 0.02])
+            levels = np.clip(level + np.cumsum(steps), 1, len(ladder) - 1)
+
+        flags = np.where(steps > 0, "Buy", np.where(steps < 0, "Sell", rng.choice(["Buy", "Sell"], n)))
+        auction = rng.integers(_seconds(OPEN_AUCTION[0]), _seconds(OPEN_AUCTION[1]))
+        seconds = np.r_[auction, _session_times(rng, n)]
+        volumes = np.maximum(1, np.round(rng.lognormal(2.0, 1.0, n + 1))).astype(np.int64) * 100
+
+        frames.append(pd.DataFrame({
+            "ShareCode": symbol,
+            "TradeDateTime": day + pd.to_timedelta(seconds, unit="s"),
+            "LastPrice": ladder[np.r_[level, levels]],
+            "Volume": volumes,
+            "Flag": np.concatenate([["OPEN"], flags]),
+        }))
+
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values("TradeDateTime", kind="stable", ignore_index=True)[COLUMNS]
+
+
+def write_day(ticks_dir, date, **kwargs):
+    """
+    Write generate_day(date, **kwargs) to <ticks_dir>/<date>.csv and return the path.
+    """
+    os.makedirs(ticks_dir, exist_ok=True)
+    path = os.path.join(ticks_dir, f"{date}.csv")
+    df = generate_day(date, **kwargs)
+    df.to_csv(path, index=False, date_format="%Y-%m-%d %H:%M:%S")
+    return path
+
+
+def write_universe(csv_path, symbols):
+    """
+    Write a universe file (Symbol_SET50.csv layout) listing `symbols`, so the
+    synthetic symbols can be traded (see Backtest --universe).
+    """
+    os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Symbol", "Market", "Sector", "Security Type"])
+        for symbol in symbols:
+            writer.writerow([symbol, "SET", "SYNTH", "Common Shares"])
+    return csv_path
+
+
+def trading_days(start, n_days):
+    return [d.strftime("%Y-%m-%d") for d in pd.bdate_range(start, periods=n_days)]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m tradeSim.Synthetic",
+        description="Generate synthetic tick days for scale testing.",
+    )
+    parser.add_argument("--out", required=True, help="Folder for the <date>.csv tick files.")
+    parser.add_argument("--start", default="2025-11-10", help="First trading day (weekdays follow).")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--symbols", type=int, default=50, help="Universe size (SET50 names, then SYNxxxx).")
+    parser.add_argument("--ticks-per-symbol", type=int, default=1000,
+                        help="Mean continuous-session trades per symbol and day.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on --ticks-per-symbol (e.g. 10, 100).")
+    parser.add_argument("--anomaly", action="store_true", help="Generate anomaly days with heavy tick clustering.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    symbols = symbol_names(args.symbols)
+    ticks_per_symbol = int(args.ticks_per_symbol * args.scale)
+    for i, date in enumerate(trading_days(args.start, args.days)):
+        path = write_day(args.out, date, ticks_per_symbol=ticks_per_symbol, seed=args.seed + i,
+                         anomaly=args.anomaly, symbols=symbols)
+        print(f"[INFO] Wrote {path}")
+    if len(symbols) > Universe.default_universe().n_listed:
+        path = write_universe(os.path.join(args.out, "universe.csv"), symbols)
+        print(f"[INFO] Wrote {path} (pass it as --universe to trade the synthetic symbols)")
+
+
+if __name__ == "__main__":
+    main()
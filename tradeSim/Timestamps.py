@@ -0,0 +1,77 @@
+import datetime
+import time
+
+# Engine time is an int: nanoseconds since the Unix epoch (UTC).
+#
+# Tick files carry naive Bangkok wall-clock times. They are converted once, when
+# a day is loaded (column EpochNs), and turned back into readable strings only
+# when logs and files are written.
+NS_PER_SECOND = 1_000_000_000
+MARKET_UTC_OFFSET_NS = 7 * 3600 * NS_PER_SECOND
+EPOCH_COLUMN = "EpochNs"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def now_ns():
+    return time.time_ns()
+
+
+def to_epoch_ns(value):
+    """
+    Epoch ns of a tick time. Naive values (pandas Timestamp, datetime,
+    numpy datetime64) are market wall-clock times; aware values are converted
+    from their own timezone. Ints are taken as epoch ns already.
+    """
+    if hasattr(value, "__index__"):  # int, numpy integer
+        return int(value)
+    if type(value).__name__ == "datetime64":
+        return int(value.astype("datetime64[ns]").astype("int64")) - MARKET_UTC_OFFSET_NS
+    if getattr(value, "tzinfo", None) is not None:
+        if hasattr(value, "value"):  # pandas Timestamp
+            return int(value.value)
+        return (value - _EPOCH_UTC) // _MICROSECOND * 1000
+    if hasattr(value, "value"):
+        return int(value.value) - MARKET_UTC_OFFSET_NS
+    return (value - _EPOCH) // _MICROSECOND * 1000 - MARKET_UTC_OFFSET_NS
+
+
+def column_epoch_ns(values):
+    """
+    Vectorized to_epoch_ns() for a column of naive market wall-clock times.
+    """
+    import numpy as np
+
+    return np.asarray(values, dtype="datetime64[ns]").astype(np.int64) - MARKET_UTC_OFFSET_NS
+
+
+def row_epoch_ns(row):
+    """
+    Epoch ns of a tick row: the precomputed EpochNs column when the day was
+    loaded by the engine, otherwise converted from TradeDateTime.
+    """
+    epoch = row.get(EPOCH_COLUMN) if hasattr(row, "get") else None
+    if epoch is not None:
+        return int(epoch)
+    return to_epoch_ns(row["TradeDateTime"])
+
+
+def normalize(value):
+    """
+    Accept timestamps persisted before the engine switched to epoch ns: floats
+    are epoch seconds (rounded to the microsecond they were taken from).
+    """
+    if isinstance(value, float):  # includes numpy float64
+        return int(round(float(value) * 1_000_000)) * 1000
+    return int(value)
+
+
+def format_ns(epoch_ns, fmt=TIME_FORMAT):
+    """
+    Market wall-clock string for an epoch ns timestamp.
+    """
+    wall = _EPOCH + datetime.timedelta(microseconds=(epoch_ns + MARKET_UTC_OFFSET_NS) // 1000)
+    return wall.strftime(fmt)
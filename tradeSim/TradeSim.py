@@ -2,7 +2,9 @@ from . import Portfolio
 from . import Execution
 from . import Strategy_runner
 from . import Order
-from datetime import timedelta
+from . import Snapshot
+from . import Journal
+from . import Timestamps
 import os
 import threading
 lock = threading.Lock()
@@ -13,13 +15,16 @@ from datetime import datetime
 logged_errors = set()
 
 class tradeSim:
-    def __init__(self, team_name, load_existing=True, folder="result", ):
+    def __init__(self, team_name, load_existing=True, folder="result", portfolio=None, journal=False):
         self.error_logger = ErrorLogger(team_name)
         """
         Initialize the trade simulation environment for a simulation.
         ----------
         Parameter
         team_name: Name of the team.
+        portfolio: Optional live portfolio object to carry over (in-process handoff).
+                   When given, nothing is loaded from or saved to disk.
+        journal: Write every fill to a crash-safe journal (see Journal.py).
         """
         # create directory if it does not exist
         team_folder = os.path.join(folder, team_name)
@@ -28,7 +33,9 @@ class tradeSim:
         portfolio_file_name = f"{team_name}_portfolio.json"
         file_path = os.path.join(folder,team_name, portfolio_file_name)
 
-        if load_existing and os.path.exists(file_path):
+        if portfolio is not None:
+            self.portfolio = portfolio
+        elif load_existing and os.path.exists(file_path):
             self.portfolio = Portfolio.portfolio.load_from_file(team_name)
             print(f"[INFO] Loaded existing portfolio from '{file_path}'")
         else:
@@ -36,6 +43,45 @@ class tradeSim:
             print(f"[INFO] Created new portfolio for '{team_name}'")
             self.portfolio.save_to_file(team_name)
         self.execution = Execution.execution(team_name)
+        self.restored_journal_seq = 0
+        # set by Journal.recover(resume=True): where the interrupted day continues
+        self.resume_point = None
+        if journal:
+            self.enable_journal()
+
+    @classmethod
+    def from_snapshot(cls, team_name, file_path=None):
+        """
+        Restore a simulation (portfolio, resting orders and order counter) from a
+        binary snapshot written by save_snapshot().
+        """
+        port, orders_book, order_counter, journal_seq = Snapshot.load_snapshot(team_name, file_path)
+        sim = cls(team_name, portfolio=port)
+        sim.execution.Orders_Book = orders_book
+        sim.restored_journal_seq = journal_seq
+        Order.order._order_counter = max(Order.order._order_counter, order_counter)
+        return sim
+
+    def enable_journal(self, fsync_every=64):
+        """
+        Start writing fills to the write-ahead journal as they occur.
+        Use Journal.recover() to rebuild the simulation after a crash.
+        """
+        journal = Journal.FillJournal(self.portfolio.get_owner(), fsync_every=fsync_every)
+        journal.seq = max(journal.seq, self.restored_journal_seq)
+        self.execution.journal = journal
+
+    def start_new_day(self):
+        """
+        Roll the live simulation over to the next trading day without reloading it from disk.
+        Applies the same resets as re-creating tradeSim from the saved portfolio:
+        the day's starting cash is the current cash, intraday NAV peaks are cleared
+        and resting orders from the previous day are dropped.
+        """
+        self.portfolio.cashbalance_start = self.portfolio.cashbalance
+        self.portfolio.max_nav = None
+        self.portfolio.min_nav = None
+        self.execution.Orders_Book.clear()
 
     def create_order_to_limit(self, volume, price, side, symbol, cum_sell_volume, cum_buy_volume, mkt_data):
         with lock:
@@ -49,7 +95,7 @@ class tradeSim:
                     symbol=symbol,
                     cum_sell_volume=cum_sell_volume,
                     cum_buy_volume=cum_buy_volume,
-                    timestamp= (mkt_data['TradeDateTime'] - timedelta(hours=7)).timestamp()
+                    timestamp=Timestamps.row_epoch_ns(mkt_data)
                 )
                 self.execution.addOrderToOrders_Book(limit_order, mkt_data)
 
@@ -82,7 +128,7 @@ class tradeSim:
                     symbol=symbol,
                     cum_sell_volume=cum_sell_volume,
                     cum_buy_volume=cum_buy_volume,
-                    timestamp= (mkt_data['TradeDateTime'] - timedelta(hours=7)).timestamp()
+                    timestamp=Timestamps.row_epoch_ns(mkt_data)
                 )
                 self.execution.isMatchMarketOrder(mkt_data,new_order)
 
@@ -114,6 +160,12 @@ class tradeSim:
         Save the current portfolio state to  JSONfile. 
         """
         self.portfolio.save_to_file(self.portfolio.get_owner())
+
+    def save_snapshot(self, file_path=None):
+        """
+        Save the full simulation state to a binary snapshot (see Snapshot.py).
+        """
+        return Snapshot.save_snapshot(self, file_path)
     
     def save_summary_csv(self, trading_date):
         self.portfolio.save_summary_csv(trading_date)
@@ -143,6 +195,8 @@ class tradeSim:
         
     def flushTransactionLog(self):
         self.execution.flushTransactionLog()
+        if self.execution.journal is not None:
+            self.execution.journal.sync()
 
     def flushErrorLogger(self):
         self.error_logger.flush_logs()
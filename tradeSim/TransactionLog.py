@@ -33,3 +33,4 @@ class Transaction:
                 'Order Number', 'owner', 'Volume', 'Price', 'Side', 'Symbol', 'Timestamp'
             ])
             writer.writerows(self.transaction_log)
+        self.transaction_log.clear()
@@ -0,0 +1,131 @@
+from datetime import time
+import numpy as np
+import pandas as pd
+from . import Features
+from . import Microstructure
+
+# VWAP mean-reversion rules of the analysis scripts' simulate_vwap_strategy
+CAPITAL = 10_000_000
+COMMISSION_RATE = 0.00157 * 1.07  # 0.168%
+LAST_ENTRY = time(16, 20)
+LIQUIDATE_AT = time(16, 25)
+
+COLUMNS = ["buy_trigger", "stop_loss", "position_size", "return_pct", "trades", "wins"]
+
+
+def grid(buy_triggers, stop_losses=(0.98,), position_sizes=(500_000,)):
+    """
+    Every (buy_trigger, stop_loss, position_size) combination, as a DataFrame.
+    """
+    index = pd.MultiIndex.from_product([buy_triggers, stop_losses, position_sizes],
+                                       names=["buy_trigger", "stop_loss", "position_size"])
+    return index.to_frame(index=False)
+
+
+def evaluate(symbols, prices, volumes, vwaps, elapsed, buy_triggers, stop_losses=0.98, position_sizes=500_000,
+             capital=CAPITAL, commission_rate=COMMISSION_RATE):
+    """
+    Simulate the VWAP mean-reversion day for many parameter combinations in one
+    pass over the ticks (given in replay order, `elapsed` in seconds since the
+    open as in SecondsSinceOpen).
+
+    Per combination k, the rules of simulate_vwap_strategy:
+    - without a position in the symbol, before LAST_ENTRY: buy when
+      price <= VWAP * buy_triggers[k] and cash > position_sizes[k], at price +
+      one tick, in lots of 100 for position_sizes[k]
+    - with a position: sell at price - one tick when price >= VWAP, price <=
+      entry * stop_losses[k], or from LIQUIDATE_AT on
+
+    The combinations' cash and positions are NumPy arrays (symbols x
+    combinations) advanced together at each tick. Ticks that cannot trigger a
+    trade for any combination (no buy signal and, for the symbols held, neither
+    a take profit, the highest stop nor the liquidation) only cost a scalar
+    check, so hundreds of combinations take little more than one pass.
+    Results equal the per-combination simulation exactly.
+
+    Returns a DataFrame with COLUMNS, one row per combination (the parameters
+    are broadcast together): return_pct (open positions valued at entry),
+    number of sells and winning sells.
+    """
+    buy_triggers, stop_losses, position_sizes = np.broadcast_arrays(
+        np.asarray(buy_triggers, dtype=np.float64), np.asarray(stop_losses, dtype=np.float64),
+        np.asarray(position_sizes, dtype=np.float64))
+    buy_triggers, stop_losses, position_sizes = buy_triggers.ravel(), stop_losses.ravel(), position_sizes.ravel()
+    n_combos = len(buy_triggers)
+
+    prices = np.asarray(prices, dtype=np.float64)
+    vwaps = np.asarray(vwaps, dtype=np.float64)
+    elapsed = np.asarray(elapsed, dtype=np.float64)
+    names, codes = np.unique(np.asarray(symbols, dtype=object).astype(str), return_inverse=True)
+    codes = codes.ravel()
+    n_symbols = len(names)
+
+    valid = (prices > 0) & (np.asarray(volumes) > 0)
+    liquidate = elapsed >= Features.seconds_after_open(LIQUIDATE_AT)
+    with np.errstate(invalid="ignore"):
+        signal = valid & (elapsed < Features.seconds_after_open(LAST_ENTRY)) & (prices <= vwaps * buy_triggers.max())
+    ticks = Microstructure.tick_size(prices)
+
+    cash = np.full(n_combos, float(capital))
+    volume = np.zeros((n_symbols, n_combos), dtype=np.int64)
+    entry = np.zeros((n_symbols, n_combos))
+    cost = np.zeros((n_symbols, n_combos))
+    opened = np.zeros((n_symbols, n_combos), dtype=np.int64)  # buy sequence, to value positions in buy order
+    trades = np.zeros(n_combos, dtype=np.int64)
+    wins = np.zeros(n_combos, dtype=np.int64)
+    held = [0] * n_symbols  # combinations holding each symbol
+    top_stop = [-np.inf] * n_symbols  # highest stop price among them
+    sell_factor = 1 - commission_rate
+    buy_factor = 1 + commission_rate
+
+    rows = zip(range(len(prices)), codes.tolist(), prices.tolist(), vwaps.tolist(), valid.tolist(),
+               liquidate.tolist(), signal.tolist())
+    for i, s, price, vwap, ok, late, buy_signal in rows:
+        if not ok:
+            continue
+        holders = held[s]
+        exit_signal = holders and (late or price >= vwap or price <= top_stop[s])
+        if not exit_signal and not (buy_signal and holders < n_combos):
+            continue
+
+        holding = volume[s] > 0
+        if exit_signal:
+            sell = holding if late or price >= vwap else holding & (price <= entry[s] * stop_losses)
+            proceeds = volume[s, sell] * (price - ticks[i]) * sell_factor
+            cash[sell] += proceeds
+            trades[sell] += 1
+            wins[sell] += proceeds - cost[s, sell] > 0
+            volume[s, sell] = 0
+            held[s] -= int(sell.sum())
+            top_stop[s] = (entry[s] * stop_losses)[volume[s] > 0].max() if held[s] else -np.inf
+
+        if buy_signal:
+            entry_price = price + ticks[i]
+            buy = ~holding & (price <= vwap * buy_triggers) & (cash > position_sizes)
+            lots = (position_sizes[buy] / entry_price // 100 * 100).astype(np.int64)
+            buy[buy] = lots >= 100
+            lots = lots[lots >= 100]
+            if len(lots):
+                paid = lots * entry_price * buy_factor
+                cash[buy] -= paid
+                volume[s, buy] = lots
+                entry[s, buy] = entry_price
+                cost[s, buy] = paid
+                opened[s, buy] = i
+                held[s] += len(lots)
+                top_stop[s] = max(top_stop[s], entry_price * stop_losses[buy].max())
+
+    final_value = cash.copy()
+    for k in range(n_combos):
+        open_symbols = np.flatnonzero(volume[:, k])
+        for s in open_symbols[np.argsort(opened[open_symbols, k], kind="stable")]:
+            final_value[k] += volume[s, k] * entry[s, k]  # approximate
+
+    return pd.DataFrame({
+        "buy_trigger": buy_triggers,
+        "stop_loss": stop_losses,
+        "position_size": position_sizes,
+        "return_pct": (final_value - capital) / capital * 100,
+        "trades": trades,
+        "wins": wins,
+    }, columns=COLUMNS)
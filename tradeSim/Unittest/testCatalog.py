@@ -0,0 +1,70 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from tradeSim import Catalog
+from tradeSim import Synthetic
+from tradeSim import MarketState
+from tradeSim import Replay
+
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        Synthetic.write_day(self.ticks_dir, "2025-11-10", n_symbols=12, ticks_per_symbol=200, seed=1)
+        Synthetic.write_day(self.ticks_dir, "2025-11-11", n_symbols=12, ticks_per_symbol=100, seed=2, anomaly=True)
+        Synthetic.write_day(self.ticks_dir, "2025-11-12", n_symbols=6, ticks_per_symbol=400, seed=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+
+    def test_day_metadata(self):
+        path = Replay.tick_file("2025-11-10", self.ticks_dir)
+        info = Catalog.scan_day(path)
+        df = Replay.load_day(path, cache=False)
+        session = df[~df['IsOpenAuction']]
+        state = MarketState.MarketState.batch(session['ShareCode'], session['LastPrice'], session['Volume'])
+
+        self.assertEqual(info.date, "2025-11-10")
+        self.assertEqual(info.rows, len(df))
+        self.assertEqual(info.symbols, sorted(df['ShareCode'].unique()))
+        self.assertEqual(info.first_time, str(df['TradeDateTime'].min()))
+        self.assertEqual(info.last_time, str(df['TradeDateTime'].max()))
+        self.assertEqual(info.sha256, Catalog.file_hash(path))
+        self.assertAlmostEqual(info.tcr, state['tcr'][-1])
+        self.assertEqual(info.traded, 12)
+        self.assertFalse(info.anomaly)
+
+    def test_build_filters_and_refresh(self):
+        catalog = Catalog.TickCatalog.build(self.ticks_dir)
+        self.assertTrue(os.path.exists(catalog.path))
+        self.assertEqual(catalog.dates(), ["2025-11-10", "2025-11-11", "2025-11-12"])
+        self.assertEqual(catalog.dates(anomaly=True), ["2025-11-11"])
+        self.assertEqual(catalog.dates(start="2025-11-11", anomaly=False), ["2025-11-12"])
+        self.assertEqual(Replay.discover_dates(self.ticks_dir), catalog.dates())
+
+        loaded = Catalog.TickCatalog.load(self.ticks_dir)
+        self.assertEqual(loaded.days, catalog.days)
+        self.assertFalse(loaded.refresh())
+
+        os.remove(Replay.tick_file("2025-11-10", self.ticks_dir))
+        Synthetic.write_day(self.ticks_dir, "2025-11-12", n_symbols=6, ticks_per_symbol=100, seed=4, anomaly=True)
+        catalog = Catalog.TickCatalog.build(self.ticks_dir)
+        self.assertEqual(catalog.dates(anomaly=True), ["2025-11-11", "2025-11-12"])
+        with open(catalog.path) as file:
+            self.assertEqual([day["date"] for day in json.load(file)["days"]], ["2025-11-11", "2025-11-12"])
+
+    def test_work_order(self):
+        catalog = Catalog.TickCatalog.build(self.ticks_dir)
+        dates = catalog.dates()
+        self.assertEqual(catalog.work_order(dates), sorted(dates, key=lambda d: catalog[d].rows, reverse=True))
+
+        # a day not cataloged yet is weighed by its file size
+        Synthetic.write_day(self.ticks_dir, "2025-11-13", n_symbols=30, ticks_per_symbol=400, seed=5)
+        self.assertEqual(catalog.work_order(dates + ["2025-11-13"])[0], "2025-11-13")
+
+
+if __name__ == '__main__':
+    unittest.main()
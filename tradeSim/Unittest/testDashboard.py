@@ -0,0 +1,74 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+from tradeSim import Replay
+from tradeSim import Portfolio
+from tradeSim import TradeSim
+from tradeSim import Dashboard
+from tradeSim.Unittest.tickFixtures import write_tick_day
+from strategy.IntradayMeanReversion import IntradayMeanReversion
+
+
+class TestLiveDashboard(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        write_tick_day(self.ticks_dir, "2025-11-10", seed=2)
+        self.df = Replay.load_day(Replay.tick_file("2025-11-10", self.ticks_dir), cache=False)
+        self.team = "DashboardTeam"
+        self.sim = TradeSim.tradeSim(self.team, portfolio=Portfolio.portfolio(self.team))
+        self.runner = self.sim.get_strategy_runner()
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        shutil.rmtree(os.path.join("result", self.team), ignore_errors=True)
+
+    def replay(self, dashboard):
+        # the notebook's visual replay
+        Replay.run_day(self.sim, self.df, IntradayMeanReversion, "vectorized", on_tick=dashboard.on_row)
+
+    def test_frames_drawn_off_thread(self):
+        frames = []
+        threads = set()
+
+        def draw(snapshot):
+            threads.add(threading.current_thread().name)
+            frames.append(snapshot)
+
+        # one publish every 100 ticks of a fake clock
+        clock = iter(i * 0.0025 for i in range(10 ** 6))
+        with mock.patch.object(Dashboard.time, "monotonic", lambda: next(clock)):
+            with Dashboard.LiveDashboard(self.runner, fps=4, draw=draw) as dashboard:
+                self.replay(dashboard)
+
+        self.assertEqual(threads, {"LiveDashboard"})
+        self.assertGreater(len(frames), 0)
+        self.assertLessEqual(len(frames), len(self.df) // 100 + 2)
+        self.assertEqual(dashboard.frames, len(frames))
+
+        # the last frame is the final state of the replay
+        final = frames[-1]
+        self.assertEqual(final.ticks, len(self.df))
+        self.assertEqual(final.cash, self.runner.get_cash_balance())
+        self.assertEqual(len(final.stocks), len(self.runner.get_all_stocks_info()))
+        self.assertEqual({m[0] for m in final.market}, set(self.df['ShareCode']))
+        for stock in final.stocks:
+            with self.assertRaises(TypeError):
+                stock["Symbol"] = "X"
+
+    def test_same_fills_as_headless(self):
+        with Dashboard.LiveDashboard(self.runner, fps=1000, draw=lambda snapshot: None) as dashboard:
+            self.replay(dashboard)
+
+        ref_team = "DashboardRefTeam"
+        self.addCleanup(shutil.rmtree, os.path.join("result", ref_team), True)
+        ref = TradeSim.tradeSim(ref_team, portfolio=Portfolio.portfolio(ref_team))
+        Replay.run_day(ref, self.df, IntradayMeanReversion, "legacy")
+        self.assertEqual(self.sim.portfolio.get_cash_balance(), ref.portfolio.get_cash_balance())
+
+
+if __name__ == '__main__':
+    unittest.main()
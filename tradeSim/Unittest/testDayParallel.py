@@ -0,0 +1,83 @@
+import unittest
+import os
+import shutil
+import tempfile
+import pandas as pd
+from tradeSim import DayParallel
+from tradeSim import Portfolio
+from tradeSim import Replay
+from tradeSim import TradeSim
+from strategy.IntradayMeanReversion import IntradayMeanReversion
+from tradeSim.Unittest.tickFixtures import write_tick_day
+
+
+class TestDayParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        self.dates = ["2025-11-10", "2025-11-11"]
+        for seed, date in enumerate(self.dates):
+            write_tick_day(self.ticks_dir, date, seed)
+        self.teams = ["FlatTeam", "FlatRefTeam"]
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        for team in self.teams:
+            shutil.rmtree(os.path.join("result", team), ignore_errors=True)
+
+    def run_single_day(self, date):
+        sim = TradeSim.tradeSim("FlatRefTeam", portfolio=Portfolio.portfolio("FlatRefTeam"))
+        Replay.run_day(sim, Replay.load_day(Replay.tick_file(date, self.ticks_dir)), IntradayMeanReversion)
+        return sim.portfolio
+
+    def test_flat_start_days_are_stitched(self):
+        results = DayParallel.run_flat_start_days(
+            "FlatTeam", "strategy.IntradayMeanReversion", "IntradayMeanReversion",
+            self.dates, workers=2, ticks_dir=self.ticks_dir
+        )
+        self.assertEqual([r["date"] for r in results], self.dates)
+
+        day1 = self.run_single_day(self.dates[0])
+        day2 = self.run_single_day(self.dates[1])
+        self.assertAlmostEqual(results[0]["nav"], day1.get_nav(), places=4)
+        self.assertAlmostEqual(results[1]["nav"], day1.get_nav() + day2.get_nav() - 10000000.0, places=4)
+        self.assertEqual(results[1]["sells"], day1.get_number_of_sells() + day2.get_number_of_sells())
+        self.assertLessEqual(results[1]["max_dd"], results[0]["max_dd"])
+
+        summary = pd.read_csv(os.path.join("result", "FlatTeam", "FlatTeam_portfolio_summary.csv"))
+        self.assertEqual(len(summary), 2)
+        self.assertAlmostEqual(summary["cashbalance start"].iloc[1], round(results[0]["nav"], 2), places=2)
+
+        log = pd.read_csv(os.path.join("result", "FlatTeam", "FlatTeam_transaction_log.csv"))
+        self.assertTrue(log["Order Number"].is_unique)
+
+    def test_empty_day_stays_flat(self):
+        empty = "2025-11-12"
+        pd.DataFrame(columns=["ShareCode", "TradeDateTime", "LastPrice", "Volume", "Flag"]).to_csv(
+            Replay.tick_file(empty, self.ticks_dir), index=False)
+        dates = [self.dates[0], empty, self.dates[1]]
+        results = DayParallel.run_flat_start_days(
+            "FlatTeam", "strategy.IntradayMeanReversion", "IntradayMeanReversion",
+            dates, workers=2, ticks_dir=self.ticks_dir
+        )
+        self.assertEqual([r["date"] for r in results], dates)
+        self.assertEqual(results[1]["nav"], results[0]["nav"])
+        self.assertEqual(results[1]["sells"], results[0]["sells"])
+        self.assertEqual(results[1]["max_dd"], results[0]["max_dd"])
+
+        day1 = self.run_single_day(self.dates[0])
+        day2 = self.run_single_day(self.dates[1])
+        self.assertAlmostEqual(results[2]["nav"], day1.get_nav() + day2.get_nav() - 10000000.0, places=4)
+
+        summary = pd.read_csv(os.path.join("result", "FlatTeam", "FlatTeam_portfolio_summary.csv"))
+        self.assertEqual(len(summary), 3)
+
+    def test_shifted_drawdown(self):
+        peaks = [[100.0, 90.0], [110.0, 105.0]]
+        self.assertAlmostEqual(DayParallel._shifted_drawdown(peaks, 0.0), -10.0)
+        # the same 10 THB drop is a smaller percentage on a higher NAV
+        self.assertAlmostEqual(DayParallel._shifted_drawdown(peaks, 100.0), -5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+from tradeSim import Equivalence
+from tradeSim import Features
+from tradeSim import Replay
+from tradeSim import Universe
+from tradeSim.Unittest.tickFixtures import write_tick_day
+from strategy.IntradayMeanReversion import IntradayMeanReversion
+from strategy.HybridVWAP import HybridVWAP
+
+
+def leaky_engine(trading_Sim, df, strategy_class, shared_handler=None, on_tick=None):
+    """
+    The fast engine, except that one baht of cash goes missing at tick 100.
+    """
+    ticks = []
+
+    def tick(row):
+        ticks.append(row)
+        if len(ticks) == 100:
+            trading_Sim.portfolio.cashbalance -= 1
+        on_tick(row)
+
+    return Replay.run_day(trading_Sim, df, strategy_class, "fast", shared_handler, on_tick=tick)
+
+
+class FeatureRecorder(IntradayMeanReversion):
+    """
+    IntradayMeanReversion that records whether its rows carry precomputed features.
+    """
+    featured = []
+
+    def on_data(self, row):
+        self.featured.append(Features.CUM_VWAP in row)
+        super().on_data(row)
+
+
+class TestEquivalence(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        self.dates = ["2025-11-10", "2025-11-11"]
+        for seed, date in enumerate(self.dates):
+            write_tick_day(self.ticks_dir, date, seed + 6)
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        for suffix in ("-ref", "-cand"):
+            shutil.rmtree(os.path.join("result", f"EquivTeam{suffix}"), ignore_errors=True)
+
+    def compare(self, strategy_class, candidate, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return Equivalence.compare_engines(strategy_class, self.dates, candidate, ticks_dir=self.ticks_dir,
+                                               team_name="EquivTeam", **kwargs)
+
+    def test_engines_are_equivalent(self):
+        for engine in ("fast", "vectorized"):
+            for strategy_class in (IntradayMeanReversion, HybridVWAP):
+                report = self.compare(strategy_class, engine)
+                self.assertTrue(report.ok, str(report))
+                self.assertEqual(report.days, 2)
+                self.assertGreater(report.fills, 0)
+        self.assertFalse(os.path.exists(os.path.join("result", "EquivTeam-ref")))
+
+    def test_reference_replays_raw_ticks(self):
+        FeatureRecorder.featured = []
+        report = self.compare(FeatureRecorder, "vectorized")
+        self.assertTrue(report.ok, str(report))
+        # the reference lane computes the features itself, the candidate reads them
+        self.assertEqual(FeatureRecorder.featured.count(False), report.ticks)
+        self.assertEqual(FeatureRecorder.featured.count(True), report.ticks)
+
+    def test_reports_first_diverging_tick(self):
+        report = self.compare(IntradayMeanReversion, leaky_engine)
+        self.assertFalse(report.ok)
+        divergence = report.divergence
+        self.assertEqual(divergence.date, "2025-11-10")
+        self.assertEqual(divergence.kind, "tick")
+        self.assertEqual(divergence.where, "tick 99 / cash")
+        self.assertAlmostEqual(divergence.reference - divergence.candidate, 1.0)
+        self.assertIn("2025-11-10", divergence.tick)
+        self.assertIn("DIVERGED", str(report))
+        # results are kept for inspection
+        self.assertTrue(os.path.exists(os.path.join("result", "EquivTeam-cand")))
+
+    def test_file_diffs(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, True)
+        a, b = os.path.join(folder, "a.csv"), os.path.join(folder, "b.csv")
+        with open(a, "w") as f:
+            f.write("owner,Price,Side\nA,10.0,Buy\nA,11.0,Sell\n")
+        with open(b, "w") as f:
+            f.write("owner,Price,Side\nB,10.0000000001,Buy\nB,11.5,Sell\n")
+        where, ref, cand = Equivalence.diff_csv(a, b)
+        self.assertEqual(where, "row 2 / Price")
+        self.assertIsNone(Equivalence.diff_csv(a, a))
+
+        self.assertIsNone(Equivalence.diff_json({"owner": "A", "cash": 1.0}, {"owner": "B", "cash": 1.0 + 1e-12}))
+        self.assertEqual(Equivalence.diff_json({"lots": [{"vol": 100}]}, {"lots": [{"vol": 200}]})[0], "$.lots[0].vol")
+
+    def test_cli(self):
+        with redirect_stdout(io.StringIO()) as out:
+            status = Equivalence.main(["-s", "IntradayMeanReversion", "--candidate", "vectorized",
+                                       "--ticks-dir", self.ticks_dir, "--team", "EquivTeam"])
+        self.assertEqual(status, 0)
+        self.assertIn("EQUIVALENT", out.getvalue())
+
+    def test_cli_universe(self):
+        path = os.path.join(self.ticks_dir, "universe.csv")
+        with open(path, "w") as f:
+            f.write("Symbol\nPTT\nKBANK\nAOT\n")
+        with mock.patch.object(Universe, "_default", Universe.default_universe()):
+            with redirect_stdout(io.StringIO()) as out:
+                status = Equivalence.main(["-s", "IntradayMeanReversion", "--ticks-dir", self.ticks_dir,
+                                           "--team", "EquivTeam", "--universe", path])
+            self.assertEqual(Universe.default_universe().symbols, ["PTT", "KBANK", "AOT"])
+        self.assertEqual(status, 0)
+        self.assertIn("EQUIVALENT", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
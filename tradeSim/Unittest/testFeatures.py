@@ -0,0 +1,111 @@
+import unittest
+import os
+import time
+import shutil
+import tempfile
+from unittest import mock
+import pandas as pd
+from strategy.indicators import CumulativeVWAP
+from tradeSim import Features
+from tradeSim import Replay
+from tradeSim import StrategyHandler
+from tradeSim import Universe
+from tradeSim.Unittest.tickFixtures import write_tick_day
+
+
+class _Recorder:
+    def __init__(self, handler):
+        self.handler = handler
+
+    def on_data(self, row):
+        pass
+
+
+class TestFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        write_tick_day(self.ticks_dir, "2025-11-10", 3)
+        self.path = Replay.tick_file("2025-11-10", self.ticks_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+
+    def test_columns_match_streaming(self):
+        df = Replay.load_day(self.path, cache=False)
+        df.loc[df.index[[5, 40]], 'Volume'] = 0
+        df.loc[df.index[7], 'Flag'] = "OPEN"
+        df = Features.add_features(df)
+
+        vwap = CumulativeVWAP()
+        handlers = {}
+        sids = {}
+        for i, row in enumerate(df.drop(columns=list(Features.COLUMNS)).to_dict("records")):
+            symbol = row["ShareCode"]
+            handler = handlers.setdefault(symbol, StrategyHandler.StrategyHandler(_Recorder, None))
+            handler.process_row(row)
+            self.assertEqual(handler.cum_buy_volume, df[Features.CUM_BUY_VOL].iat[i])
+            self.assertEqual(handler.cum_sell_volume, df[Features.CUM_SELL_VOL].iat[i])
+            if row["LastPrice"] > 0 and row["Volume"] > 0:
+                value = vwap.update(sids.setdefault(symbol, len(sids)), row["LastPrice"], row["Volume"])
+                self.assertEqual(value, df[Features.CUM_VWAP].iat[i])
+
+        self.assertEqual(df[Features.IS_OPEN_AUCTION].tolist(), [i == 7 for i in range(len(df))])
+
+    def test_session_vwap_leaves_out_the_opening_auction(self):
+        df = Replay.load_day(self.path, cache=False)
+        opening = df.groupby('ShareCode').head(3).index
+        df.loc[opening, 'Flag'] = "OPEN"
+        df.loc[df.index[[40, 41]], 'Volume'] = 0
+        df = Features.add_features(df)
+        self.assertTrue((df[Features.SESSION_VWAP] != df[Features.CUM_VWAP]).any())
+
+        # the running VWAP of the analysis scripts, over their OPEN-filtered ticks
+        session = df[~df[Features.IS_OPEN_AUCTION]]
+        num, den = {}, {}
+        for row in session.itertuples(index=False):
+            if row.LastPrice > 0 and row.Volume > 0:
+                num[row.ShareCode] = num.get(row.ShareCode, 0) + row.LastPrice * row.Volume
+                den[row.ShareCode] = den.get(row.ShareCode, 0) + row.Volume
+            expected = num[row.ShareCode] / den[row.ShareCode] if den.get(row.ShareCode) else 0.0
+            self.assertEqual(row.SessionVWAP, expected)
+
+    def test_seconds_since_open(self):
+        self.assertEqual(Features.seconds_since_open(pd.Timestamp("2025-11-10 16:25:00")), 23100.0)
+        self.assertEqual(Features.seconds_after_open(pd.Timestamp("2025-11-10 16:25:00").time()), 23100.0)
+        self.assertEqual(Features.seconds_since_open(pd.Timestamp("2025-11-10 09:55:00")), -300.0)
+
+        df = Replay.load_day(self.path, cache=False)
+        expected = [Features.seconds_since_open(t) for t in df['TradeDateTime']]
+        self.assertEqual(df[Features.SECONDS_SINCE_OPEN].tolist(), expected)
+
+    def test_cache(self):
+        df = Replay.load_day(self.path)
+        cache = Replay.cache_file(self.path)
+        self.assertTrue(os.path.exists(cache))
+        pd.testing.assert_frame_equal(Replay.load_day(self.path), df)
+
+        # a rewritten tick file invalidates the cache
+        time.sleep(0.01)
+        write_tick_day(self.ticks_dir, "2025-11-10", 4)
+        fresh = Replay.load_day(self.path, cache=False)
+        pd.testing.assert_frame_equal(Replay.load_day(self.path), fresh)
+        self.assertEqual(Replay.discover_dates(self.ticks_dir), ["2025-11-10"])
+
+    def test_cached_symbol_ids_follow_the_process_universe(self):
+        df = pd.read_csv(self.path)
+        df.loc[df['ShareCode'] == "KBANK", 'ShareCode'] = "NOTLISTED"
+        df.to_csv(self.path, index=False)
+        Replay.load_day(self.path)
+
+        # another process may have met other unlisted symbols first
+        universe = Universe.Universe.from_csv()
+        universe.intern("OTHER")
+        with mock.patch.object(Universe, "_default", universe):
+            cached = Replay.load_day(self.path)
+        self.assertEqual(cached.loc[cached['ShareCode'] == "NOTLISTED", Universe.SYMBOL_ID_COLUMN].unique().tolist(),
+                         [universe.id_of("NOTLISTED")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import os
+import re
+import subprocess
+import sys
+
+CORE_MODULES = [
+    "tradeSim.TradeSim",
+    "tradeSim.Execution",
+    "tradeSim.Order",
+    "tradeSim.Portfolio",
+    "tradeSim.Stock",
+    "tradeSim.CommissionService",
+    "tradeSim.StrategyHandler",
+]
+
+# self time of the tradeSim modules only (dependencies such as numpy excluded)
+SELF_TIME_BUDGET_US = 100_000
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def import_times(module):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns {module name: (self us, cumulative us)} for every module loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)", line)
+        if match:
+            times[match.group(3)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_core_does_not_import_pandas(self):
+        for module in CORE_MODULES:
+            with self.subTest(module=module):
+                loaded = import_times(module)
+                self.assertIn(module, loaded)
+                self.assertNotIn("pandas", loaded)
+                self.assertNotIn("matplotlib", loaded)
+
+    def test_core_import_time_budget(self):
+        loaded = import_times("tradeSim.TradeSim")
+        own = sum(t[0] for name, t in loaded.items() if name.startswith("tradeSim"))
+        self.assertLess(own, SELF_TIME_BUDGET_US,
+                        f"tradeSim modules took {own / 1000:.1f} ms to import "
+                        f"(total with dependencies {loaded['tradeSim.TradeSim'][1] / 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    for module in CORE_MODULES:
+        times = import_times(module)
+        print(f"{module:<30} {times[module][1] / 1000:8.1f} ms")
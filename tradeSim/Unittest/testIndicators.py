@@ -0,0 +1,119 @@
+import unittest
+import json
+import numpy as np
+from strategy import indicators
+
+
+class TestIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        n = 600
+        self.sids = rng.integers(0, 4, n)
+        self.prices = 30.0 + np.round(rng.normal(0, 1, n).cumsum() * 4) / 4
+        self.volumes = rng.integers(1, 50, n) * 100
+        self.flags = rng.choice(["Buy", "Sell", ""], n)
+
+    def stream(self, indicator, *columns):
+        return [indicator.update(*row) for row in zip(self.sids.tolist(), *(c.tolist() for c in columns))]
+
+    def per_symbol(self, sid):
+        return self.sids == sid
+
+    def test_cumulative_vwap(self):
+        streamed = np.array(self.stream(indicators.CumulativeVWAP(), self.prices, self.volumes))
+        batched = indicators.CumulativeVWAP.batch(self.sids, self.prices, self.volumes)
+        np.testing.assert_array_equal(streamed, batched)
+
+        mask = self.per_symbol(2)
+        p, v = self.prices[mask], self.volumes[mask]
+        self.assertAlmostEqual(batched[mask][-1], (p * v).sum() / v.sum())
+
+    def test_windowed_vwap(self):
+        streamed = np.array(self.stream(indicators.WindowedVWAP(window=10), self.prices, self.volumes))
+        batched = indicators.WindowedVWAP.batch(self.sids, self.prices, self.volumes, window=10)
+        np.testing.assert_array_equal(streamed, batched)
+
+        mask = self.per_symbol(1)
+        p, v = self.prices[mask][-10:], self.volumes[mask][-10:]
+        self.assertAlmostEqual(batched[mask][-1], (p * v).sum() / v.sum())
+
+    def test_ema(self):
+        streamed = np.array(self.stream(indicators.EMA(span=5), self.prices))
+        np.testing.assert_array_equal(streamed, indicators.EMA.batch(self.sids, self.prices, span=5))
+
+        p = self.prices[self.per_symbol(0)]
+        expected = p[0]
+        for price in p[1:]:
+            expected = expected + (price - expected) / 3
+        self.assertAlmostEqual(streamed[self.per_symbol(0)][-1], expected)
+
+    def test_rolling_mean_std(self):
+        means, stds = indicators.RollingMeanStd.batch(self.sids, self.prices, window=20)
+        mask = self.per_symbol(3)
+        p = self.prices[mask]
+        self.assertAlmostEqual(means[mask][-1], p[-20:].mean())
+        self.assertAlmostEqual(stds[mask][-1], p[-20:].std(ddof=1))
+        self.assertAlmostEqual(stds[mask][5], p[:6].std(ddof=1))
+        self.assertEqual(stds[mask][0], 0.0)
+
+    def test_rolling_min_max(self):
+        streamed = self.stream(indicators.RollingMinMax(window=15), self.prices)
+        mins, maxs = indicators.RollingMinMax.batch(self.sids, self.prices, window=15)
+        np.testing.assert_array_equal(np.array(streamed), np.column_stack([mins, maxs]))
+
+        mask = self.per_symbol(0)
+        p = self.prices[mask]
+        for i in (0, 7, 14, 40, len(p) - 1):
+            window = p[max(0, i - 14):i + 1]
+            self.assertEqual((mins[mask][i], maxs[mask][i]), (window.min(), window.max()))
+
+    def test_distinct_prices(self):
+        streamed = np.array(self.stream(indicators.DistinctPrices(), self.prices))
+        batched = indicators.DistinctPrices.batch(self.sids, self.prices)
+        np.testing.assert_array_equal(streamed, batched)
+        self.assertEqual(batched[self.per_symbol(1)][-1], len(set(self.prices[self.per_symbol(1)])))
+
+    def test_flag_imbalance(self):
+        streamed = np.array(self.stream(indicators.FlagImbalance(), self.flags, self.volumes))
+        batched = indicators.FlagImbalance.batch(self.sids, self.flags, self.volumes)
+        np.testing.assert_array_equal(streamed, batched)
+
+    def test_reset_and_growth(self):
+        vwap = indicators.CumulativeVWAP()
+        vwap.update(40, 10.0, 100)
+        self.assertEqual(vwap.update(40, 20.0, 100), 15.0)
+        vwap.reset(40)
+        self.assertEqual(vwap.update(40, 20.0, 100), 20.0)
+
+        distinct = indicators.DistinctPrices()
+        distinct.update(0, 10.0)
+        distinct.update(0, 10.25)
+        distinct.reset()
+        self.assertEqual(distinct.update(0, 10.0), 1)
+
+    def test_state_round_trip(self):
+        half = len(self.sids) // 2
+        cases = [
+            (indicators.CumulativeVWAP, (self.prices, self.volumes)),
+            (indicators.WindowedVWAP, (self.prices, self.volumes)),
+            (indicators.EMA, (self.prices,)),
+            (indicators.RollingMeanStd, (self.prices,)),
+            (indicators.RollingMinMax, (self.prices,)),
+            (indicators.DistinctPrices, (self.prices,)),
+            (indicators.FlagImbalance, (self.flags, self.volumes)),
+        ]
+        for cls, columns in cases:
+            with self.subTest(indicator=cls.__name__):
+                expected = self.stream(cls(), *columns)
+                first = cls()
+                rows = list(zip(self.sids.tolist(), *(c.tolist() for c in columns)))
+                streamed = [first.update(*row) for row in rows[:half]]
+                resumed = cls()
+                resumed.set_state(json.loads(json.dumps(first.get_state())))
+                streamed += [resumed.update(*row) for row in rows[half:]]
+                np.testing.assert_array_equal(np.array(streamed), np.array(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
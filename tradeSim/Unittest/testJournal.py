@@ -0,0 +1,246 @@
+import unittest
+from unittest import mock
+import os
+import shutil
+import tempfile
+from tradeSim import TradeSim
+from tradeSim import Journal
+from tradeSim import Backtest
+from tradeSim import MarketState
+from tradeSim import Order
+from tradeSim import Replay
+from tradeSim.Unittest.tickFixtures import write_tick_day
+from strategy.Strategies_template import Strategy_template
+import numpy as np
+import pandas as pd
+
+
+class PairBuyer(Strategy_template):
+    """
+    Buys 100 shares in two orders every third tick. Execution fills one of them
+    on that tick; the other rests in the book until the symbol's next tick.
+    """
+    state_fields = ("ticks",)
+
+    def __init__(self, handler):
+        super().__init__("JournalTeam", "PairBuyer", handler)
+        self.ticks = 0
+
+    def on_data(self, row):
+        if self.ticks % 3 == 0:
+            for _ in range(2):
+                self.handler.create_order_to_limit(100, row['LastPrice'], "Buy", row['ShareCode'])
+        self.ticks += 1
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.team_name = "JournalTeam"
+        shutil.rmtree(os.path.join("result", self.team_name), ignore_errors=True)
+        self.tradeSim = TradeSim.tradeSim(team_name=self.team_name, load_existing=False, journal=True)
+
+    def tearDown(self):
+        self.tradeSim.execution.journal.close()
+        shutil.rmtree(os.path.join("result", self.team_name), ignore_errors=True)
+
+    def mock_market_row(self, symbol, price, timestamp="2025-11-10 10:00:00"):
+        return {
+            'ShareCode': symbol,
+            'LastPrice': price,
+            'Volume': 1000,
+            'Flag': 'Buy',
+            'TradeDateTime': pd.Timestamp(timestamp)
+        }
+
+    def fill(self, symbol, volume, price, side, timestamp="2025-11-10 10:00:00"):
+        row = self.mock_market_row(symbol, price, timestamp)
+        self.tradeSim.create_order_to_limit(volume, price, side, symbol, 10000, 10000, row)
+        self.tradeSim.isMatch(row)
+        self.tradeSim.update_market_prices({symbol: price})
+
+    def test_fills_are_journaled(self):
+        self.fill("AOT", 300, 30.0, "Buy")
+        self.fill("AOT", 100, 31.0, "Sell")
+        self.tradeSim.execution.journal.sync()
+
+        records = Journal.read_journal(self.tradeSim.execution.journal.file_path)
+        self.assertEqual([r["side"] for r in records], ["Buy", "Sell"])
+        self.assertEqual([r["seq"] for r in records], [1, 2])
+
+    def test_numpy_values_are_journaled(self):
+        row = self.mock_market_row("AOT", np.float64(30.0))
+        self.tradeSim.create_order_to_limit(np.float64(300), np.float64(30.0), "Buy", "AOT",
+                                            np.int64(10000), np.int64(10000), row)
+        self.tradeSim.isMatch(row)
+        self.tradeSim.execution.journal.sync()
+
+        records = Journal.read_journal(self.tradeSim.execution.journal.file_path)
+        self.assertEqual(records[0]["cum_sell_volume"], 10000)
+        self.assertEqual(records[0]["volume"], 300)
+
+    def test_recover_from_snapshot_and_journal(self):
+        self.tradeSim.save_snapshot()
+        self.fill("AOT", 300, 30.0, "Buy", "2025-11-10 10:00:00")
+        self.fill("PTT", 200, 20.0, "Buy", "2025-11-10 10:05:00")
+        self.fill("AOT", 100, 31.0, "Sell", "2025-11-10 10:10:00")
+        self.tradeSim.execution.journal.sync()
+        expected = self.tradeSim.portfolio
+
+        recovered, last_timestamp = Journal.recover(self.team_name)
+        self.addCleanup(recovered.execution.journal.close)
+        port = recovered.portfolio
+
+        self.assertAlmostEqual(port.get_cash_balance(), expected.get_cash_balance())
+        self.assertAlmostEqual(port.get_realized(), expected.get_realized())
+        self.assertEqual(port.get_total_stock_volume_by_symbol("AOT"), 200)
+        self.assertEqual(port.get_total_stock_volume_by_symbol("PTT"), 200)
+        self.assertEqual(port.get_number_of_sells(), expected.get_number_of_sells())
+        self.assertEqual(last_timestamp, pd.Timestamp("2025-11-10 03:10:00", tz="UTC").value)
+
+    def test_snapshot_checkpoints_journal(self):
+        self.fill("AOT", 300, 30.0, "Buy")
+        self.tradeSim.save_snapshot()
+        self.fill("AOT", 100, 31.0, "Sell")
+        self.tradeSim.execution.journal.sync()
+
+        recovered, _ = Journal.recover(self.team_name)
+        self.addCleanup(recovered.execution.journal.close)
+        # the buy is already inside the snapshot and must not be applied twice
+        self.assertEqual(recovered.portfolio.get_total_stock_volume_by_symbol("AOT"), 200)
+        self.assertEqual(recovered.execution.journal.seq, 2)
+
+    def test_torn_last_line_is_ignored(self):
+        self.fill("AOT", 300, 30.0, "Buy")
+        journal = self.tradeSim.execution.journal
+        journal.sync()
+        with open(journal.file_path, "a", encoding="utf-8") as f:
+            f.write('{"seq": 2, "order_numb')
+
+        self.assertEqual(len(Journal.read_journal(journal.file_path)), 1)
+
+    def test_recover_to_last_resume_point(self):
+        self.tradeSim.save_snapshot()
+        journal = self.tradeSim.execution.journal
+        self.fill("AOT", 300, 30.0, "Buy")
+        journal.sync()
+        self.tradeSim.update_market_prices({"AOT": 32.0})
+        journal.record_state(5, self.tradeSim, {"AOT": {"cum_buy_volume": 1000}}, Order.order._order_counter)
+        nav = self.tradeSim.portfolio.nav
+        # filled after the last resume point: produced again by the resumed replay
+        self.fill("PTT", 200, 20.0, "Buy")
+        journal.sync()
+
+        recovered, _ = Journal.recover(self.team_name, resume=True)
+        self.addCleanup(recovered.execution.journal.close)
+        self.assertEqual(recovered.resume_point.tick, 5)
+        self.assertEqual(recovered.resume_point.handlers, {"AOT": {"cum_buy_volume": 1000}})
+        self.assertEqual(recovered.portfolio.get_total_stock_volume_by_symbol("AOT"), 300)
+        self.assertEqual(recovered.portfolio.get_total_stock_volume_by_symbol("PTT"), 0)
+        self.assertAlmostEqual(recovered.portfolio.nav, nav)
+        fills = [r for r in Journal.read_journal(journal.file_path) if Journal.is_fill(r)]
+        self.assertEqual([r["symbol"] for r in fills], ["AOT"])
+
+    def test_resume_with_resting_order(self):
+        # one symbol, so the resting order fills on the next tick
+        df = pd.DataFrame({
+            'ShareCode': "AOT",
+            'TradeDateTime': pd.date_range("2025-11-10 10:00:00", periods=12, freq="min"),
+            'LastPrice': 30.0,
+            'Volume': 1000,
+            'Flag': "Sell",
+        })
+        Order.order._order_counter = 1
+        reference = TradeSim.tradeSim("JournalRefTeam", load_existing=False)
+        self.addCleanup(shutil.rmtree, os.path.join("result", "JournalRefTeam"), True)
+        Replay.run_day(reference, df, PairBuyer)
+
+        Order.order._order_counter = 1
+        self.tradeSim.execution.journal.close()
+        self.tradeSim.enable_journal(fsync_every=1)
+        self.tradeSim.save_snapshot()
+        update = MarketState.MarketState.update
+        ticks = iter(range(len(df)))
+
+        def crash(market_state, *args):
+            if next(ticks) == 4:
+                raise RuntimeError("killed")
+            return update(market_state, *args)
+
+        with mock.patch.object(MarketState.MarketState, "update", crash):
+            with self.assertRaises(RuntimeError):
+                Replay.run_day(self.tradeSim, df, PairBuyer)
+
+        recovered, _ = Journal.recover(self.team_name, resume=True)
+        self.addCleanup(recovered.execution.journal.close)
+        # interrupted after tick 3, with the second order of the pair resting
+        self.assertEqual(recovered.resume_point.tick, 3)
+        self.assertEqual([o.get_order_number() for o in recovered.execution.Orders_Book], ["ORD00004"])
+        state = Journal.read_journal(recovered.execution.journal.file_path)[-1]["state"]
+        self.assertEqual(state["handlers"]["AOT"]["strategy"], {"ticks": {"value": 4}})
+
+        Replay.run_day(recovered, df, PairBuyer, resume=recovered.resume_point)
+        self.assertEqual(recovered.portfolio.get_total_stock_volume_by_symbol("AOT"),
+                         reference.portfolio.get_total_stock_volume_by_symbol("AOT"))
+        self.assertAlmostEqual(recovered.portfolio.get_cash_balance(), reference.portfolio.get_cash_balance())
+        self.assertAlmostEqual(recovered.portfolio.get_nav(), reference.portfolio.get_nav())
+
+
+class TestResume(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        self.dates = ["2025-11-10", "2025-11-11"]
+        for seed, date in enumerate(self.dates):
+            write_tick_day(self.ticks_dir, date, seed)
+        self.teams = ["ResumeTeam", "ResumeRefTeam"]
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        for team in self.teams:
+            shutil.rmtree(os.path.join("result", team), ignore_errors=True)
+
+    def backtest(self, team, strategy, shared_handler, **kw):
+        # a new process: order numbers start over
+        Order.order._order_counter = 1
+        return Backtest.run([strategy], team, self.dates, engine="vectorized", journal=True,
+                            ticks_dir=self.ticks_dir, shared_handler=shared_handler, **kw)
+
+    def results(self, team):
+        log = pd.read_csv(os.path.join("result", team, f"{team}_transaction_log.csv")).drop(columns="owner")
+        summary = pd.read_csv(Backtest.summary_path(team)).drop(columns=["Owner", "Saved At"])
+        daily = pd.read_csv(os.path.join("result", team, "daily_results.csv"))
+        return log, summary, daily
+
+    def test_resume_after_crash_matches_uninterrupted_run(self):
+        update = MarketState.MarketState.update
+        for strategy, shared_handler in (("IntradayMeanReversion", None), ("HybridVWAP", True)):
+            with self.subTest(strategy=strategy), mock.patch.object(TradeSim.tradeSim.enable_journal,
+                                                                     "__defaults__", (2,)):
+                for team in self.teams:
+                    shutil.rmtree(os.path.join("result", team), ignore_errors=True)
+                self.backtest("ResumeRefTeam", strategy, shared_handler)
+
+                ticks = iter(range(10 ** 6))
+
+                def crash(market_state, *args):
+                    # killed near the end of the second day (750 ticks a day)
+                    if next(ticks) == 750 + 740:
+                        raise KeyboardInterrupt
+                    return update(market_state, *args)
+
+                with mock.patch.object(MarketState.MarketState, "update", crash):
+                    with self.assertRaises(KeyboardInterrupt):
+                        self.backtest("ResumeTeam", strategy, shared_handler)
+
+                records = Journal.read_journal(Journal.journal_path("ResumeTeam"))
+                self.assertTrue(any("state" in r for r in records))
+                self.backtest("ResumeTeam", strategy, shared_handler, resume=True)
+
+                for actual, expected in zip(self.results("ResumeTeam"), self.results("ResumeRefTeam")):
+                    pd.testing.assert_frame_equal(actual, expected)
+                self.assertFalse(pd.read_csv(Backtest.summary_path("ResumeTeam")).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
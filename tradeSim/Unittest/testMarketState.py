@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from tradeSim import MarketState
+from tradeSim import Replay
+from tradeSim import Portfolio
+from tradeSim import TradeSim
+from tradeSim.Unittest.tickFixtures import write_tick_day
+from strategy.Strategies_template import Strategy_template
+
+
+class MarketStateReader(Strategy_template):
+    seen = []
+
+    def __init__(self, handler):
+        super().__init__("TestTeam", "MarketStateReader", handler)
+
+    def on_data(self, row):
+        state = self.handler.get_market_state()
+        MarketStateReader.seen.append((state.ticks, state.tcr))
+
+
+class TestMarketState(unittest.TestCase):
+
+    def test_counters(self):
+        state = MarketState.MarketState(record=True)
+        state.update("AOT", 30.0, 100)
+        state.update("PTT", 20.0, 100)
+        self.assertEqual(state.tcr, 100.0)
+
+        state.update("AOT", 30.25, 100)
+        state.update("AOT", 30.5, 100)
+        self.assertEqual(state.tcr, 50.0)
+        self.assertEqual((state.advancers, state.decliners), (1, 0))
+
+        state.update("PTT", 19.9, 200)
+        state.update("AOT", 30.0, 100)
+        state.update("AOT", 0.0, 100)
+        self.assertEqual((state.advancers, state.decliners), (0, 1))
+        self.assertEqual(state.breadth, -1)
+        self.assertEqual(state.ticks, 6)
+        self.assertAlmostEqual(state.turnover, 30.0 * 100 + 20.0 * 100 + 30.25 * 100 + 30.5 * 100 + 19.9 * 200 + 30.0 * 100)
+        self.assertEqual(len(state.series()["tcr"]), 6)
+
+    def test_batch_matches_stream(self):
+        rng = np.random.default_rng(11)
+        n = 2000
+        symbols = rng.choice(["AOT", "PTT", "KBANK", "SCB", "CPALL"], n)
+        prices = 30.0 + rng.choice([-0.5, -0.25, 0.0, 0.25, 0.5], n)
+        prices[rng.integers(0, n, 20)] = 0.0
+        volumes = rng.integers(0, 20, n) * 100
+        timestamps = np.arange(n)
+
+        state = MarketState.MarketState(record=True)
+        for row in zip(symbols.tolist(), prices.tolist(), volumes.tolist(), timestamps.tolist()):
+            state.update(*row)
+        streamed = state.series()
+        batched = MarketState.MarketState.batch(symbols, prices, volumes, timestamps)
+
+        self.assertEqual(streamed.keys(), batched.keys())
+        for key in streamed:
+            np.testing.assert_array_equal(streamed[key], batched[key], err_msg=key)
+
+    def test_engine_exposes_state_to_strategies(self):
+        ticks_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, ticks_dir, True)
+        self.addCleanup(shutil.rmtree, os.path.join("result", "MarketStateTeam"), True)
+        write_tick_day(ticks_dir, "2025-11-10", seed=2)
+        df = Replay.load_day(Replay.tick_file("2025-11-10", ticks_dir))
+
+        MarketStateReader.seen = []
+        sim = TradeSim.tradeSim("MarketStateTeam", portfolio=Portfolio.portfolio("MarketStateTeam"))
+        state = Replay.run_day(sim, df, MarketStateReader, "fast")
+
+        self.assertEqual(state.ticks, len(df))
+        self.assertEqual([ticks for ticks, _ in MarketStateReader.seen], list(range(1, len(df) + 1)))
+        ordered = df.iloc[Replay.round_robin_order(df)]
+        batched = MarketState.MarketState.batch(ordered['ShareCode'], ordered['LastPrice'], ordered['Volume'])
+        np.testing.assert_array_equal([tcr for _, tcr in MarketStateReader.seen], batched["tcr"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import importlib.util
+import os
+import shutil
+import tempfile
+import pandas as pd
+from tradeSim import Memo
+
+STEPS = '''
+from tradeSim import Memo
+
+MEMO = Memo.MemoCache({folder!r})
+calls = []
+
+
+@MEMO.memoize(depends=("fee",))
+def cost(amount):
+    calls.append(amount)
+    return amount * fee()
+
+
+def fee():
+    return {fee}
+'''
+
+
+class TestMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.input = os.path.join(self.folder, "ticks.csv")
+        with open(self.input, "w") as file:
+            file.write("ShareCode,LastPrice\nPTT,34.25\n")
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def memoized(self, cache, version=None):
+        @cache.memoize(inputs=lambda scale=1: [self.input], version=version)
+        def prices(scale=1):
+            self.calls.append(scale)
+            return pd.read_csv(self.input).assign(LastPrice=lambda df: df['LastPrice'] * scale)
+        return prices
+
+    def test_hit_and_miss(self):
+        cache = Memo.MemoCache(os.path.join(self.folder, "cache"))
+        prices = self.memoized(cache)
+        first = prices()
+        self.assertTrue(prices().equals(first))
+        self.assertTrue(prices(scale=1).equals(first))
+        self.assertEqual(prices(2)['LastPrice'][0], 68.5)
+        self.assertEqual(self.calls, [1, 2])
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+        # a new process (new cache object) reads the stored results
+        self.memoized(Memo.MemoCache(cache.folder))()
+        self.assertEqual(self.calls, [1, 2])
+
+    def test_input_and_source_changes(self):
+        cache = Memo.MemoCache(os.path.join(self.folder, "cache"))
+        prices = self.memoized(cache)
+        prices()
+        with open(self.input, "w") as file:
+            file.write("ShareCode,LastPrice\nPTT,35.5\n")
+        self.assertEqual(prices()['LastPrice'][0], 35.5)
+        self.assertEqual(self.calls, [1, 1])
+
+        self.memoized(cache, version=2)()
+        self.assertEqual(self.calls, [1, 1, 1])
+
+        os.remove(self.input)
+        key = cache.key(prices.__wrapped__, inputs=lambda scale=1: [self.input])
+        self.assertIsNone(cache.file_hash(self.input))
+        self.assertNotEqual(key, cache.key(prices.__wrapped__))
+
+    def load_steps(self, fee):
+        path = os.path.join(self.folder, "memo_steps.py")
+        with open(path, "w") as file:
+            file.write(STEPS.format(folder=os.path.join(self.folder, "cache"), fee=fee))
+        spec = importlib.util.spec_from_file_location("memo_steps", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_helper_source_change(self):
+        steps = self.load_steps(0.001)
+        self.assertEqual(steps.cost(1000), 1.0)
+        steps = self.load_steps(0.001)
+        self.assertEqual(steps.cost(1000), 1.0)
+        self.assertEqual(steps.calls, [])
+
+        # the helper named in depends is defined after the memoized function
+        steps = self.load_steps(0.00168)
+        self.assertAlmostEqual(steps.cost(1000), 1.68)
+        self.assertEqual(steps.calls, [1000])
+
+    def test_lru_eviction(self):
+        cache = Memo.MemoCache(os.path.join(self.folder, "cache"), max_bytes=2500)
+
+        @cache.memoize()
+        def block(i):
+            self.calls.append(i)
+            return bytes(1000)
+
+        block(0), block(1)
+        os.utime(cache.entries()[0][0], ns=(0, 0))  # block(0) is the oldest ...
+        block(0)  # ... until it is used again
+        block(2)
+        self.assertEqual(len(cache.entries()), 2)
+        self.assertLessEqual(cache.size(), 2500)
+
+        block(0), block(1)
+        self.assertEqual(self.calls, [0, 1, 2, 1])
+        self.assertEqual(cache.clear(), 2)
+        self.assertEqual(cache.size(), 0)
+
+    def test_disabled(self):
+        cache = Memo.MemoCache(os.path.join(self.folder, "cache"), enabled=False)
+        prices = self.memoized(cache)
+        prices(), prices()
+        self.assertEqual(self.calls, [1, 1])
+        self.assertFalse(os.path.exists(cache.folder))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+import numpy as np
+from tradeSim import Microstructure
+from tradeSim import Synthetic
+
+
+def loop_stats(df, symbol):
+    """
+    One symbol's statistics, computed the way the analysis scripts did it.
+    """
+    sym_df = df[df['ShareCode'] == symbol].sort_values('TradeDateTime', kind="stable")
+    prices = sym_df['LastPrice'].values
+    returns = np.diff(prices) / prices[:-1]
+    above_mean = prices > prices.mean()
+    return {
+        'Ticks': len(prices),
+        'AvgPrice': prices.mean(),
+        'UniquePrices': len(np.unique(prices)),
+        'Range%': (prices.max() - prices.min()) / prices.mean() * 100,
+        'MomentumWinRate': np.mean(returns[:-1] * returns[1:] > 0),
+        'MeanCrossings': np.sum(np.diff(above_mean.astype(int)) != 0),
+        'AvgVolume': sym_df['Volume'].mean(),
+    }
+
+
+def loop_first_reversions(df, threshold=1.5, horizon=100):
+    """
+    First deviation entry per symbol and its reversion, scanned tick by tick.
+    """
+    events = []
+    for symbol in sorted(df['ShareCode'].unique()):
+        sym_df = df[df['ShareCode'] == symbol].sort_values('TradeDateTime', kind="stable")
+        if len(sym_df) < 100:
+            continue
+        prices, volumes = sym_df['LastPrice'].values, sym_df['Volume'].values
+        vwap = np.cumsum(prices * volumes) / np.cumsum(volumes)
+        deviations = (prices - vwap) / vwap * 100
+        for i in range(len(deviations) - 1):
+            if deviations[i] <= -threshold:
+                for j in range(i + 1, min(i + horizon, len(deviations))):
+                    if prices[j] >= vwap[j]:
+                        events.append((symbol, i, deviations[i], j - i, True))
+                        break
+                else:
+                    events.append((symbol, i, deviations[i], horizon, False))
+                break
+    return events
+
+
+def loop_hourly(df):
+    """
+    Hourly VWAP deviation and signals per symbol, filtered hour by hour.
+    """
+    rows = {}
+    hours = df['TradeDateTime'].dt.hour
+    for hour in sorted(hours.unique()):
+        hour_df = df[hours == hour]
+        for symbol in hour_df['ShareCode'].unique():
+            sym_df = hour_df[hour_df['ShareCode'] == symbol]
+            prices, volumes = sym_df['LastPrice'].values, sym_df['Volume'].values
+            vwap = np.sum(prices * volumes) / np.sum(volumes)
+            rows[symbol, hour] = (len(prices), prices[0], prices.max(), prices.min(), prices[-1], volumes.sum(),
+                                  np.mean(np.abs((prices - vwap) / vwap * 100)), np.sum(prices <= vwap * 0.985))
+    return rows
+
+
+class TestMicrostructure(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+
+    def test_tick_size_tiers(self):
+        prices = [1.99, 2.0, 4.98, 5.0, 24.9, 25.0, 49.75, 50.0, 99.5, 100.0, 199.0, 200.0, 398.0, 400.0, 1000.0]
+        expected = [0.01, 0.02, 0.02, 0.05, 0.10, 0.25, 0.25, 0.50, 0.50, 1.00, 1.00, 2.00, 2.00, 4.00, 4.00]
+        np.testing.assert_allclose(Microstructure.tick_size(prices), expected)
+
+    def test_matches_per_symbol_loop(self):
+        for anomaly in (False, True):
+            df = Synthetic.generate_day("2025-11-10", n_symbols=15, ticks_per_symbol=200, seed=4, anomaly=anomaly)
+            df = df.sample(frac=1.0, random_state=1)  # time order must come from the timestamps
+            stats = Microstructure.symbol_stats(df['ShareCode'], df['TradeDateTime'], df['LastPrice'], df['Volume'])
+
+            self.assertEqual(list(stats['Symbol']), sorted(df['ShareCode'].unique()))
+            for row in stats.to_dict("records"):
+                for column, value in loop_stats(df, row['Symbol']).items():
+                    self.assertAlmostEqual(row[column], value, places=9, msg=(row['Symbol'], column))
+                self.assertAlmostEqual(row['TickSize'], Microstructure.tick_size(row['AvgPrice']))
+
+    def test_min_ticks(self):
+        stats = Microstructure.symbol_stats(["A"] * 3 + ["B"] * 12, range(15), [10.0] * 15, [100] * 15)
+        self.assertEqual(list(stats['Symbol']), ["B"])
+        self.assertEqual(stats['UniquePrices'][0], 1)
+        self.assertEqual(stats['MomentumWinRate'][0], 0.0)
+        self.assertTrue(Microstructure.symbol_stats([], [], [], []).empty)
+
+    def test_first_reversions_match_scan(self):
+        for seed in range(3):
+            df = Synthetic.generate_day("2025-11-10", n_symbols=20, ticks_per_symbol=400, seed=seed)
+            events = Microstructure.reversion_events(df['ShareCode'], df['TradeDateTime'], df['LastPrice'],
+                                                     df['Volume'], thresholds=[1.5], first_only=True)
+            found = list(zip(events['symbol'], events['tick'], events['initial_deviation'],
+                             events['ticks_to_revert'], events['reverted']))
+            self.assertEqual(found, loop_first_reversions(df))
+
+    def test_reversion_entries_and_summary(self):
+        # VWAP stays near 10: entries at ticks 2 and 6, the first reverts at tick 4
+        prices = [10.0, 10.0, 9.5, 9.6, 10.2, 10.1, 9.0, 9.1, 9.2]
+        times = np.datetime64("2025-11-10T10:00:00") + np.arange(len(prices)) * np.timedelta64(30, "s")
+        events = Microstructure.reversion_events(["PTT"] * len(prices), times, prices, [100] * len(prices),
+                                                 thresholds=[1.0, 20.0], horizon=10, min_ticks=1)
+        self.assertEqual(list(events['tick']), [2, 6])
+        self.assertEqual(list(events['reverted']), [True, False])
+        self.assertEqual(list(events['ticks_to_revert']), [2, 10])
+        self.assertEqual(events['seconds_to_revert'][0], 60.0)
+        self.assertTrue(np.isnan(events['seconds_to_revert'][1]))
+
+        summary = Microstructure.reversion_summary(events)
+        self.assertEqual(list(summary['threshold']), [1.0])
+        self.assertEqual(summary['events'][0], 2)
+        self.assertEqual(summary['hit_rate'][0], 50.0)
+        self.assertEqual(summary['median_ticks'][0], 2)
+
+    def test_buckets_match_hourly_loop(self):
+        df = Synthetic.generate_day("2025-11-10", n_symbols=10, ticks_per_symbol=300, seed=6, anomaly=True)
+        table = Microstructure.buckets(df['ShareCode'], df['TradeDateTime'], df['LastPrice'], df['Volume'])
+        expected = loop_hourly(df)
+
+        self.assertEqual(list(table.columns), Microstructure.BUCKET_COLUMNS)
+        self.assertEqual(list(zip(table['symbol'], table['hour'])), sorted(expected))
+        columns = ['ticks', 'open', 'high', 'low', 'close', 'volume', 'abs_dev_pct', 'signals']
+        for row in table.to_dict("records"):
+            for column, value in zip(columns, expected[row['symbol'], row['hour']]):
+                self.assertAlmostEqual(row[column], value, places=9, msg=(row['symbol'], row['hour'], column))
+        self.assertTrue(Microstructure.buckets([], [], [], []).empty)
+
+    def test_daily_bars_gaps_and_sessions(self):
+        days = [Synthetic.generate_day(date, n_symbols=8, ticks_per_symbol=200, seed=seed)
+                for date, seed in (("2025-11-10", 1), ("2025-11-11", 2))]
+        days[1] = days[1][days[1]['ShareCode'] != Synthetic.symbol_names(8)[0]]
+        bars = [Microstructure.daily_bars(Microstructure.buckets(df['ShareCode'], df['TradeDateTime'],
+                                                                 df['LastPrice'], df['Volume'])) for df in days]
+        for row in bars[0].to_dict("records"):
+            sym_df = days[0][days[0]['ShareCode'] == row['symbol']]
+            self.assertEqual((row['ticks'], row['open'], row['close'], row['high'], row['low']),
+                             (len(sym_df), sym_df['LastPrice'].iloc[0], sym_df['LastPrice'].iloc[-1],
+                              sym_df['LastPrice'].max(), sym_df['LastPrice'].min()))
+            self.assertAlmostEqual(row['vwap'], np.average(sym_df['LastPrice'], weights=sym_df['Volume']))
+
+        gaps = Microstructure.overnight_gaps(*bars)
+        self.assertEqual(list(gaps['symbol']), Synthetic.symbol_names(8)[1:])
+        for row in gaps.to_dict("records"):
+            close = days[0][days[0]['ShareCode'] == row['symbol']]['LastPrice'].iloc[-1]
+            open_ = days[1][days[1]['ShareCode'] == row['symbol']]['LastPrice'].iloc[0]
+            self.assertEqual(row['gap_pct'], (open_ - close) / close * 100)
+
+        df = days[0]
+        sessions = Microstructure.session_stats(Microstructure.buckets(df['ShareCode'], df['TradeDateTime'],
+                                                                       df['LastPrice'], df['Volume']))
+        morning = df['TradeDateTime'].dt.hour < Microstructure.AFTERNOON_HOUR
+        totals = sessions.groupby('session')['ticks'].sum()
+        self.assertEqual((totals['morning'], totals['afternoon']), (morning.sum(), (~morning).sum()))
+
+    def test_day_stats_cached(self):
+        path = Synthetic.write_day(self.ticks_dir, "2025-11-10", n_symbols=5, ticks_per_symbol=100)
+        stats = Microstructure.day_stats(path)
+        self.assertTrue(os.path.exists(Microstructure.cache_file(path)))
+        self.assertEqual(set(stats['Symbol']), set(Synthetic.symbol_names(5)))
+
+        with mock.patch.object(Microstructure, "symbol_stats") as compute:
+            cached = Microstructure.day_stats(path)
+            compute.assert_not_called()
+        self.assertTrue(cached.equals(stats))
+
+        table = Microstructure.day_buckets(path)
+        self.assertTrue(os.path.exists(Microstructure.cache_file(path, "buckets")))
+        self.assertTrue(Microstructure.day_buckets(path).equals(table))
+        self.assertEqual(table['ticks'].sum(), Microstructure.day_stats(path)['Ticks'].sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
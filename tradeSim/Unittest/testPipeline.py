@@ -0,0 +1,118 @@
+import unittest
+import os
+import shutil
+import tempfile
+from tradeSim import Pipeline
+
+
+def load_prices(folder):
+    with open(os.path.join(folder, "loads.txt"), "a") as file:
+        file.write("load\n")
+    return [34.25, 35.0, 34.5]
+
+
+def average(prices):
+    return sum(prices) / len(prices)
+
+
+def render(folder, name, *values):
+    with open(os.path.join(folder, name), "w") as file:
+        file.write(" ".join(f"{value}" for value in values))
+
+
+def broken(prices):
+    raise ValueError("no ticks")
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def jobs(self):
+        def figure(name, deps=()):
+            return Pipeline.Job(name, render, deps, (self.folder, name), outputs=[self.path(name)])
+        return [
+            figure("01_prices.png", ["prices"]),
+            figure("02_average.png", ["prices", "average"]),
+            Pipeline.Job("average", average, ["prices"]),
+            Pipeline.Job("prices", load_prices, args=(self.folder,), inputs=lambda: [self.path("ticks.csv")]),
+            figure("03_static.png"),
+        ]
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def read(self, name):
+        with open(os.path.join(self.folder, name)) as file:
+            return file.read()
+
+    def test_order(self):
+        self.assertEqual(Pipeline.order(self.jobs()),
+                         ["prices", "01_prices.png", "average", "02_average.png", "03_static.png"])
+        self.assertEqual(Pipeline.order(self.jobs(), targets=["02_average.png"]),
+                         ["prices", "average", "02_average.png"])
+
+        with self.assertRaisesRegex(ValueError, "Duplicate"):
+            Pipeline.order(self.jobs() + [Pipeline.Job("average", average)])
+        with self.assertRaisesRegex(ValueError, "Unknown job 'volume'"):
+            Pipeline.order([Pipeline.Job("x", average, ["volume"])])
+        with self.assertRaisesRegex(ValueError, "cycle: a -> b -> a"):
+            Pipeline.order([Pipeline.Job("a", average, ["b"]), Pipeline.Job("b", average, ["a"])])
+
+    def test_shared_data_computed_once(self):
+        for workers in (1, 3):
+            os.makedirs(self.folder, exist_ok=True)
+            results = Pipeline.run(self.jobs(), workers=workers)
+            self.assertEqual(self.read("loads.txt"), "load\n")
+            self.assertEqual(self.read("01_prices.png"), "[34.25, 35.0, 34.5]")
+            self.assertEqual(self.read("02_average.png"), "[34.25, 35.0, 34.5] 34.583333333333336")
+            self.assertEqual(self.read("03_static.png"), "")
+            self.assertEqual(results["average"], average([34.25, 35.0, 34.5]))
+            self.assertIsNone(results["01_prices.png"])
+            shutil.rmtree(self.folder)
+
+    def test_failure_skips_dependents(self):
+        for workers in (1, 2):
+            jobs = self.jobs() + [Pipeline.Job("signals", broken, ["prices"]),
+                                  Pipeline.Job("04_signals.png", render, ["signals"], (self.folder, "04.png"))]
+            with self.assertRaisesRegex(RuntimeError, r"failed: signals \(skipped: 04_signals.png\)"):
+                Pipeline.run(jobs, workers=workers)
+            self.assertTrue(os.path.exists(os.path.join(self.folder, "02_average.png")))
+            self.assertFalse(os.path.exists(os.path.join(self.folder, "04.png")))
+
+
+    def test_incremental_rebuild(self):
+        state = self.path("cache/build.json")
+        with open(self.path("ticks.csv"), "w") as file:
+            file.write("PTT,34.25\n")
+        self.assertEqual(len(Pipeline.run(self.jobs(), workers=1, state=state)), 5)
+        self.assertEqual(Pipeline.run(self.jobs(), workers=1, state=state), {})
+
+        # a changed input refreshes the outputs below it only
+        with open(self.path("ticks.csv"), "a") as file:
+            file.write("PTT,35.00\n")
+        self.assertEqual(sorted(Pipeline.run(self.jobs(), workers=1, state=state)),
+                         ["01_prices.png", "02_average.png", "average", "prices"])
+        self.assertEqual(Pipeline.outdated(self.jobs(), state)[0], [])
+
+        os.remove(self.path("02_average.png"))
+        self.assertEqual(Pipeline.outdated(self.jobs(), state)[0], ["prices", "average", "02_average.png"])
+        self.assertEqual(Pipeline.outdated(self.jobs(), state, targets=["03_static.png"])[0], [])
+        self.assertEqual(len(Pipeline.outdated(self.jobs(), state, force=True)[0]), 5)
+
+        # a failed job stays outdated
+        jobs = self.jobs() + [Pipeline.Job("signals", broken, ["prices"]),
+                              Pipeline.Job("04.png", render, ["signals"], (self.folder, "04.png"),
+                                           outputs=[self.path("04.png")])]
+        with self.assertRaises(RuntimeError):
+            Pipeline.run(jobs, workers=2, state=state)
+        self.assertEqual(Pipeline.outdated(jobs, state)[0], ["prices", "signals", "04.png"])
+        self.assertEqual(self.read("loads.txt"), "load\n" * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import io
+import os
+import pstats
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from tradeSim import Backtest
+from tradeSim import Profiling
+from tradeSim.Unittest.tickFixtures import write_tick_day
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def outer():
+    return busy(200000) + busy(100000)
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def profile_day(self, mode, trace_memory=False):
+        profiler = Profiling.DayProfiler(self.folder, mode, interval=0.001, trace_memory=trace_memory)
+        profiler.start_day("2025-11-10")
+        with profiler.stage("work"):
+            outer()
+        with profiler.stage("alloc"):
+            data = [0] * 500000
+            del data
+        return profiler.end_day()
+
+    def read_collapsed(self):
+        with open(os.path.join(self.folder, "2025-11-10.collapsed"), encoding="utf-8") as file:
+            return [line.rsplit(" ", 1) for line in file.read().splitlines()]
+
+    def test_cprofile(self):
+        written = self.profile_day("cprofile")
+        self.assertEqual([os.path.basename(p) for p in written],
+                         ["2025-11-10_stages.csv", "2025-11-10.pstats", "2025-11-10.collapsed"])
+
+        stats = pstats.Stats(os.path.join(self.folder, "2025-11-10.pstats")).stats
+        calls = {func[2]: entry[1] for func, entry in stats.items()}
+        self.assertEqual(calls["busy"], 2)
+
+        stacks = self.read_collapsed()
+        self.assertTrue(any(stack.endswith("testProfiling.py:outer;testProfiling.py:busy;"
+                                            "<built-in method builtins.sum>;testProfiling.py:<genexpr>")
+                            for stack, _ in stacks))
+        self.assertTrue(all(int(weight) > 0 for _, weight in stacks))
+
+    def test_sampling(self):
+        self.profile_day("sample")
+        stacks = self.read_collapsed()
+        self.assertTrue(any("testProfiling.py:outer;testProfiling.py:busy" in stack for stack, _ in stacks))
+        stats = pstats.Stats(os.path.join(self.folder, "2025-11-10.pstats"))
+        self.assertGreater(stats.total_tt, 0)
+
+    def test_stage_memory(self):
+        self.profile_day(None, trace_memory=True)
+        with open(os.path.join(self.folder, "2025-11-10_stages.csv"), encoding="utf-8") as file:
+            rows = [line.split(",") for line in file.read().splitlines()[1:]]
+        self.assertEqual([row[0] for row in rows], ["work", "alloc"])
+        self.assertGreater(int(rows[1][2]), 500000 * 8 * 0.9)
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "2025-11-10.pstats")))
+
+    def test_cli_profile(self):
+        ticks_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, ticks_dir, True)
+        self.addCleanup(shutil.rmtree, os.path.join("result", "ProfileTeam"), True)
+        write_tick_day(ticks_dir, "2025-11-10", 0)
+
+        with redirect_stdout(io.StringIO()):
+            Backtest.main(["-s", "IntradayMeanReversion", "-t", "ProfileTeam", "--ticks-dir", ticks_dir,
+                           "--profile", "cprofile", "--trace-memory"])
+
+        profile_dir = os.path.join("result", "ProfileTeam", "profile")
+        self.assertEqual(sorted(os.listdir(profile_dir)),
+                         ["2025-11-10.collapsed", "2025-11-10.pstats", "2025-11-10_stages.csv"])
+        with open(os.path.join(profile_dir, "2025-11-10_stages.csv"), encoding="utf-8") as file:
+            self.assertEqual([line.split(",")[0] for line in file.read().splitlines()[1:]], ["load", "replay", "close"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import os
+import shutil
+import tempfile
+from tradeSim import Replay
+from tradeSim import Portfolio
+from tradeSim import TradeSim
+from tradeSim import Order
+from tradeSim import Backtest
+from tradeSim.Unittest.tickFixtures import write_tick_day
+from strategy.IntradayMeanReversion import IntradayMeanReversion
+from strategy.HybridVWAP import HybridVWAP
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        write_tick_day(self.ticks_dir, "2025-11-10", seed=3)
+        self.df = Replay.load_day(Replay.tick_file("2025-11-10", self.ticks_dir))
+        self.teams = []
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        for team in self.teams:
+            shutil.rmtree(os.path.join("result", team), ignore_errors=True)
+
+    def new_sim(self, team):
+        self.teams.append(team)
+        return TradeSim.tradeSim(team, portfolio=Portfolio.portfolio(team))
+
+    def fills(self, sim):
+        return [(t["Order Number"], t["Side"], t["Symbol"], t["Volume"], t["Price"])
+                for t in sim.execution.tranLog.transaction_log]
+
+    def test_multi_replay_matches_separate_runs(self):
+        expected = {}
+        for strategy_class in (IntradayMeanReversion, HybridVWAP):
+            Order.order._order_counter = 1
+            sim = self.new_sim(f"Solo{strategy_class.__name__}")
+            Replay.run_day(sim, self.df, strategy_class)
+            expected[strategy_class] = (self.fills(sim), sim.portfolio.get_portfolio_info())
+
+        books = []
+        for strategy_class in (IntradayMeanReversion, HybridVWAP):
+            team = f"Multi{strategy_class.__name__}"
+            self.teams.append(team)
+            book = Replay.StrategyBook(team, strategy_class, load_existing=False)
+            books.append(book)
+        Replay.run_day_multi(books, self.df)
+
+        for book in books:
+            fills, info = expected[book.strategy_class]
+            self.assertEqual(self.fills(book.trading_Sim), fills)
+            actual = book.trading_Sim.portfolio.get_portfolio_info()
+            actual.pop("Owner")
+            info = dict(info)
+            info.pop("Owner")
+            self.assertEqual(actual, info)
+
+    def test_books_are_isolated(self):
+        books = []
+        for team in ("IsolatedA", "IsolatedB"):
+            self.teams.append(team)
+            books.append(Replay.StrategyBook(team, IntradayMeanReversion, load_existing=False))
+        Replay.run_day_multi(books, self.df)
+
+        a, b = (book.trading_Sim.portfolio for book in books)
+        self.assertIsNot(a, b)
+        self.assertEqual(a.get_cash_balance(), b.get_cash_balance())
+
+
+    def test_engines_match_legacy(self):
+        results = {}
+        for engine in Replay.ENGINES:
+            Order.order._order_counter = 1
+            sim = self.new_sim(f"Engine{engine.capitalize()}")
+            Replay.run_day(sim, self.df, IntradayMeanReversion, engine)
+            info = sim.portfolio.get_portfolio_info()
+            info.pop("Owner")
+            results[engine] = (self.fills(sim), info)
+
+        self.assertTrue(results["legacy"][0])
+        self.assertEqual(results["fast"], results["legacy"])
+        self.assertEqual(results["vectorized"], results["legacy"])
+
+    def test_unknown_engine(self):
+        sim = self.new_sim("EngineUnknown")
+        with self.assertRaises(ValueError):
+            Replay.run_day(sim, self.df, IntradayMeanReversion, "turbo")
+
+    def test_discover_dates(self):
+        write_tick_day(self.ticks_dir, "2025-11-12", seed=4)
+        open(os.path.join(self.ticks_dir, "notes.csv"), "w").close()
+        self.assertEqual(Replay.discover_dates(self.ticks_dir), ["2025-11-10", "2025-11-12"])
+        self.assertEqual(Replay.discover_dates(self.ticks_dir, start="2025-11-11"), ["2025-11-12"])
+        self.assertEqual(Replay.discover_dates(self.ticks_dir, end="2025-11-11"), ["2025-11-10"])
+        self.assertEqual(Replay.tick_files(Replay.discover_dates(self.ticks_dir), self.ticks_dir),
+                         [Replay.tick_file("2025-11-10", self.ticks_dir), Replay.tick_file("2025-11-12", self.ticks_dir)])
+
+    def test_resolve_strategy(self):
+        self.assertEqual(Backtest.resolve_strategy("HybridVWAP"), ("strategy.HybridVWAP", "HybridVWAP"))
+        self.assertEqual(Backtest.resolve_strategy("strategy.HybridVWAP"), ("strategy.HybridVWAP", "HybridVWAP"))
+        self.assertEqual(Backtest.resolve_strategy("pkg.mod:Custom"), ("pkg.mod", "Custom"))
+
+    def test_cli_single_strategy(self):
+        self.teams.append("CliTeam")
+        results = Backtest.main([
+            "--strategy", "IntradayMeanReversion", "--team", "CliTeam",
+            "--ticks-dir", self.ticks_dir, "--output", "both", "--fresh",
+        ])
+
+        Order.order._order_counter = 1
+        sim = self.new_sim("CliRefTeam")
+        Replay.run_day(sim, self.df, IntradayMeanReversion)
+        self.assertEqual([r["date"] for r in results["CliTeam"]], ["2025-11-10"])
+        self.assertAlmostEqual(results["CliTeam"][0]["nav"], sim.portfolio.get_nav(), places=2)
+        self.assertTrue(os.path.exists(os.path.join("result", "CliTeam", "CliTeam_portfolio.json")))
+        self.assertTrue(os.path.exists(os.path.join("result", "CliTeam", "CliTeam_portfolio.npz")))
+        self.assertTrue(os.path.exists(os.path.join("result", "CliTeam", "daily_results.csv")))
+
+
+if __name__ == '__main__':
+    unittest.main()
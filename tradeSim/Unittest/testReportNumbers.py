@@ -0,0 +1,94 @@
+import unittest
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+import pandas as pd
+
+ANALYSIS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "analysis")
+spec = importlib.util.spec_from_file_location("report_numbers", os.path.join(ANALYSIS_DIR, "report_numbers.py"))
+report_numbers = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(report_numbers)
+
+REPORT = """# Final Report
+
+The **Return Rate** of the strategy is discussed below.
+
+| Metric | Value | Requirement | Status |
+|:------:|:-----:|:-----------:|:------:|
+| **Return Rate** | **{return_rate}** | > 5% | PASS |
+| **Max Drawdown** | **{max_dd}** | < 30% | PASS |
+| **Total Trades** | **{trades}** | > 20 | PASS |
+| **Win Rate** | **{win_rate}** | > 20% | PASS |
+| **Calmar Ratio** | **{calmar}** | - | Excellent |
+| **Best Day** | **+4.20%** | - | - |
+
+*Competition Period: 2025-11-10 to 2025-12-08*
+*Data Available: {period}*
+
+*Data available through: 2025-11-27*
+"""
+
+OLD = dict(return_rate="98.86%", max_dd="-5.18%", trades="1,411", win_rate="84.1%", calmar="19.07",
+           period="2025-11-10 to 2025-11-27 (14 trading days)")
+NEW = dict(return_rate="3.46%", max_dd="-1.25%", trades="1,234", win_rate="55.6%", calmar="2.77",
+           period="2025-11-10 to 2025-11-12 (3 trading days)")
+
+METRICS = {"sharpe_ratio": 1.5, "sortino_ratio": 2.5, "profit_factor": 1.8}
+
+
+def summary():
+    return pd.DataFrame({
+        "Return rate": [1.0, 2.0, 3.456],
+        "Max Drawdown (%)": [-0.5, -1.25, -1.25],
+        "Number of Sells": [400, 800, 1234],
+        "Win Rate": [50.0, 52.0, 55.56],
+        "Calmar Ratio": [2.0, 1.6, 2.7651],
+        "Daily Ticks Time": ["2025-11-10 00:00:00", "2025-11-11 00:00:00", "2025-11-12 00:00:00"],
+    })
+
+
+class TestReportNumbers(unittest.TestCase):
+
+    def test_only_values_and_period_change(self):
+        updated = report_numbers.report_text(REPORT.format(**OLD), summary(), METRICS)
+        # the prose, the requirement/status columns, the row without a value function
+        # (Best Day) and the second "Data ..." line are left as written
+        self.assertEqual(updated, REPORT.format(**NEW))
+
+    def test_metric_missing_from_table_is_left_alone(self):
+        # Sharpe, Sortino and Profit Factor have no row in this table
+        text = REPORT.format(**OLD)
+        self.assertNotIn("Sharpe Ratio", text)
+        updated = report_numbers.report_text(text, summary(), {})
+        self.assertEqual(updated, REPORT.format(**NEW))
+
+        with_row = text.replace("| **Best Day**", "| **Sharpe Ratio** | **0.00** | - | - |\n| **Best Day**")
+        updated = report_numbers.report_text(with_row, summary(), METRICS)
+        self.assertIn("| **Sharpe Ratio** | **1.50** | - | - |", updated)
+
+    def test_update_report_in_place(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, True)
+        report = os.path.join(folder, "REPORT.md")
+        summary_csv = os.path.join(folder, "summary.csv")
+        with open(report, "w", encoding="utf-8", newline="") as file:
+            file.write(REPORT.format(**OLD).replace("\n", "\r\n"))
+        summary().to_csv(summary_csv, index=False)
+
+        with redirect_stdout(io.StringIO()) as out:
+            report_numbers.update_report(report, summary_csv, METRICS)
+        self.assertIn("Updated", out.getvalue())
+        with open(report, encoding="utf-8", newline="") as file:
+            self.assertEqual(file.read(), REPORT.format(**NEW).replace("\n", "\r\n"))
+
+        # already up to date: not rewritten
+        with redirect_stdout(io.StringIO()) as out:
+            report_numbers.update_report(report, summary_csv, METRICS)
+        self.assertEqual(out.getvalue(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
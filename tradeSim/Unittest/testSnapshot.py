@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+from tradeSim import TradeSim
+from tradeSim import Order
+import pandas as pd
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.team_name = "SnapshotTeam"
+        self.tradeSim = TradeSim.tradeSim(team_name=self.team_name, load_existing=False)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.join("result", self.team_name), ignore_errors=True)
+
+    def mock_market_row(self, symbol, price, timestamp="2025-11-10 10:00:00"):
+        return {
+            'ShareCode': symbol,
+            'LastPrice': price,
+            'Volume': 1000,
+            'Flag': 'Buy',
+            'TradeDateTime': pd.Timestamp(timestamp)
+        }
+
+    def test_snapshot_round_trip(self):
+        row = self.mock_market_row("AOT", 30.0)
+        self.tradeSim.create_order_to_limit(300, 30.0, "Buy", "AOT", 10000, 10000, row)
+        self.tradeSim.isMatch(row)
+        self.tradeSim.update_market_prices({"AOT": 31.0})
+        # leave one order resting in the book
+        self.tradeSim.create_order_to_limit(100, 20.0, "Buy", "PTT", 10000, 10000, self.mock_market_row("PTT", 20.0))
+
+        self.tradeSim.save_snapshot()
+        restored = TradeSim.tradeSim.from_snapshot(self.team_name)
+
+        before = self.tradeSim.portfolio.get_portfolio_info()
+        after = restored.portfolio.get_portfolio_info()
+        self.assertEqual(before, after)
+        self.assertEqual(
+            self.tradeSim.portfolio.get_all_stocks_info(),
+            restored.portfolio.get_all_stocks_info()
+        )
+
+        self.assertEqual(restored.execution.getOrderbooksSize(), 1)
+        resting = restored.execution.Orders_Book[0]
+        self.assertEqual(resting.get_order_info(), self.tradeSim.execution.Orders_Book[0].get_order_info())
+        self.assertIs(resting.get_ownerPortfolio(), restored.portfolio)
+
+    def test_snapshot_keeps_order_counter(self):
+        row = self.mock_market_row("AOT", 30.0)
+        self.tradeSim.create_order_to_limit(100, 30.0, "Buy", "AOT", 10000, 10000, row)
+        self.tradeSim.save_snapshot()
+        counter = Order.order._order_counter
+
+        Order.order._order_counter = 1
+        TradeSim.tradeSim.from_snapshot(self.team_name)
+        self.assertEqual(Order.order._order_counter, counter)
+
+    def test_handoff_start_new_day(self):
+        row = self.mock_market_row("AOT", 30.0)
+        self.tradeSim.create_order_to_limit(100, 30.0, "Buy", "AOT", 10000, 10000, row)
+        self.tradeSim.isMatch(row)
+        self.tradeSim.update_market_prices({"AOT": 30.0})
+        self.tradeSim.create_order_to_limit(100, 20.0, "Buy", "PTT", 10000, 10000, self.mock_market_row("PTT", 20.0))
+
+        port = self.tradeSim.portfolio
+        self.tradeSim.start_new_day()
+
+        self.assertTrue(self.tradeSim.isOrderbooksEmpty())
+        self.assertEqual(port.cashbalance_start, port.get_cash_balance())
+        self.assertIsNone(port.get_max_nav())
+        self.assertEqual(port.get_total_stock_volume_by_symbol("AOT"), 100)
+
+        next_day = TradeSim.tradeSim(self.team_name, portfolio=port)
+        self.assertIs(next_day.portfolio, port)
+
+    def test_load_missing_snapshot_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            TradeSim.tradeSim.from_snapshot("NoSuchSnapshotTeam")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import os
+import shutil
+import tempfile
+import pandas as pd
+from tradeSim import Replay
+from tradeSim import Portfolio
+from tradeSim import TradeSim
+from tradeSim import Order
+from tradeSim import StrategyHandler
+from tradeSim.Unittest.tickFixtures import write_tick_day
+from strategy.IntradayMeanReversion import IntradayMeanReversion
+from strategy.Strategies_template import Strategy_template
+
+
+class RecordingStrategy(Strategy_template):
+    instances = 0
+
+    def __init__(self, handler):
+        super().__init__("TestTeam", "RecordingStrategy", handler)
+        RecordingStrategy.instances += 1
+        self.seen = []
+
+    def on_data(self, row):
+        self.seen.append(row['ShareCode'])
+
+
+class TestSharedStrategyHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        write_tick_day(self.ticks_dir, "2025-11-10", seed=5)
+        self.df = Replay.load_day(Replay.tick_file("2025-11-10", self.ticks_dir))
+        self.teams = []
+        RecordingStrategy.instances = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        for team in self.teams:
+            shutil.rmtree(os.path.join("result", team), ignore_errors=True)
+
+    def new_sim(self, team):
+        self.teams.append(team)
+        return TradeSim.tradeSim(team, portfolio=Portfolio.portfolio(team))
+
+    def row(self, symbol, volume, flag):
+        return {'ShareCode': symbol, 'LastPrice': 30.0, 'Volume': volume, 'Flag': flag,
+                'TradeDateTime': pd.Timestamp("2025-11-10 10:00:00")}
+
+    def test_one_instance_sees_every_symbol(self):
+        sim = self.new_sim("SharedRecording")
+        book = Replay.StrategyBook("SharedRecording", RecordingStrategy, trading_Sim=sim, shared_handler=True)
+        Replay.run_day_multi([book], self.df)
+
+        self.assertEqual(RecordingStrategy.instances, 1)
+
+    def test_volumes_are_kept_per_symbol(self):
+        sim = self.new_sim("SharedVolumes")
+        handler = StrategyHandler.SharedStrategyHandler(RecordingStrategy, sim.get_strategy_runner(), ["AOT"])
+        handler.process_row(self.row("AOT", 100, "Buy"))
+        handler.process_row(self.row("PTT", 300, "Sell"))
+        handler.process_row(self.row("AOT", 200, "Sell"))
+
+        aot, ptt = handler.universe.id_of("AOT"), handler.universe.id_of("PTT")
+        self.assertEqual(handler.cum_buy_volumes[aot], 100)
+        self.assertEqual(handler.cum_sell_volumes[aot], 200)
+        self.assertEqual(handler.cum_sell_volumes[ptt], 300)
+        self.assertEqual(handler.cum_buy_volume, 100)
+        self.assertEqual(handler.cum_sell_volume, 200)
+
+    def test_order_uses_volumes_of_its_symbol(self):
+        sim = self.new_sim("SharedOrders")
+        handler = StrategyHandler.SharedStrategyHandler(RecordingStrategy, sim.get_strategy_runner())
+        handler.process_row(self.row("PTT", 1000, "Sell"))
+        handler.process_row(self.row("AOT", 100, "Sell"))
+
+        # current row is AOT with only 100 sold, but the PTT order sees PTT's 1000
+        self.assertIn("created successfully", handler.create_order_to_limit(500, 30.0, "Buy", "PTT"))
+        self.assertIsInstance(handler.create_order_to_limit(500, 30.0, "Buy", "AOT"), ValueError)
+
+    def test_shared_matches_per_symbol_for_symbol_local_strategy(self):
+        results = []
+        for shared in (False, True):
+            Order.order._order_counter = 1
+            sim = self.new_sim(f"SharedMatch{shared}")
+            Replay.run_day(sim, self.df, IntradayMeanReversion, "fast", shared_handler=shared)
+            info = sim.portfolio.get_portfolio_info()
+            info.pop("Owner")
+            fills = [(t["Order Number"], t["Side"], t["Symbol"], t["Volume"], t["Price"])
+                     for t in sim.execution.tranLog.transaction_log]
+            results.append((fills, info))
+
+        self.assertTrue(results[0][0])
+        self.assertEqual(results[1], results[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
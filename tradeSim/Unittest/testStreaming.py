@@ -0,0 +1,72 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+import numpy as np
+from tradeSim import Streaming
+from tradeSim import Replay
+from tradeSim import Synthetic
+from tradeSim import Equivalence
+from tradeSim import TradeSim
+from strategy.IntradayMeanReversion import IntradayMeanReversion
+from strategy.HybridVWAP import HybridVWAP
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+        self.dates = ["2025-11-10", "2025-11-11"]
+        for seed, date in enumerate(self.dates):
+            Synthetic.write_day(self.ticks_dir, date, n_symbols=9, ticks_per_symbol=300, seed=seed,
+                                anomaly=seed == 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        for team in ("StreamTeam-ref", "StreamTeam-cand"):
+            shutil.rmtree(os.path.join("result", team), ignore_errors=True)
+
+    def test_rows_match_loaded_day(self):
+        path = Replay.tick_file(self.dates[0], self.ticks_dir)
+        expected = list(Replay._prebuilt_rows(Replay.load_day(path, cache=False)))
+        for chunk_rows in (1, 64, 10 ** 6):
+            with Streaming.TickStream(path, chunk_rows=chunk_rows) as day:
+                self.assertEqual(day.n_rows, len(expected))
+                self.assertEqual(str(day.trading_date), self.dates[0])
+                self.assertEqual(list(day.rows()), expected)
+
+    def test_blocks_are_bounded(self):
+        path = Replay.tick_file(self.dates[0], self.ticks_dir)
+        with Streaming.TickStream(path, chunk_rows=90) as day:
+            blocks = list(day.blocks())
+            folder = day._folder
+            self.assertTrue(all(len(block["ShareCode"]) <= 90 for block in blocks))
+            self.assertEqual(sum(len(block["ShareCode"]) for block in blocks), day.n_rows)
+            self.assertIsInstance(blocks[0]["LastPrice"], np.ndarray)
+        self.assertFalse(os.path.exists(folder))
+
+    def streamed(self, trading_Sim, df, strategy_class, shared_handler=None, on_tick=None):
+        date = df['TradeDateTime'].dt.date.iloc[0]
+        with Streaming.TickStream(Replay.tick_file(date, self.ticks_dir), chunk_rows=97) as day:
+            return Replay.run_day(trading_Sim, day, strategy_class, "vectorized", shared_handler, on_tick=on_tick)
+
+    def test_same_fills_as_loaded_day(self):
+        for strategy_class in (IntradayMeanReversion, HybridVWAP):
+            with redirect_stdout(io.StringIO()):
+                report = Equivalence.compare_engines(strategy_class, self.dates, self.streamed,
+                                                     ticks_dir=self.ticks_dir, team_name="StreamTeam")
+            self.assertTrue(report.ok, str(report))
+            self.assertGreater(report.fills, 0)
+
+    def test_legacy_engine_needs_loaded_day(self):
+        with redirect_stdout(io.StringIO()):
+            trading_Sim = TradeSim.tradeSim("StreamTeam-ref", load_existing=False)
+        with Streaming.TickStream(Replay.tick_file(self.dates[0], self.ticks_dir)) as day:
+            with self.assertRaises(ValueError):
+                Replay.run_day(trading_Sim, day, IntradayMeanReversion, "legacy")
+
+
+if __name__ == '__main__':
+    unittest.main()
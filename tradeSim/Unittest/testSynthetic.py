@@ -0,0 +1,87 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+import numpy as np
+import pandas as pd
+from tradeSim import Synthetic
+from tradeSim import CommissionService
+from tradeSim import MarketState
+from tradeSim import Equivalence
+from tradeSim import Universe
+from strategy.IntradayMeanReversion import IntradayMeanReversion
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+        shutil.rmtree(os.path.join("result", "SynthTeam-ref"), ignore_errors=True)
+        shutil.rmtree(os.path.join("result", "SynthTeam-cand"), ignore_errors=True)
+
+    def test_schema_and_sessions(self):
+        df = Synthetic.generate_day("2025-11-10", n_symbols=8, ticks_per_symbol=100, seed=1)
+        self.assertEqual(list(df.columns), Synthetic.COLUMNS)
+        self.assertTrue(df['TradeDateTime'].is_monotonic_increasing)
+        self.assertEqual(df['ShareCode'].nunique(), 8)
+        self.assertTrue(set(df['Flag']) <= {"Buy", "Sell", "OPEN"})
+        self.assertEqual((df['Flag'] == "OPEN").sum(), 8)
+        self.assertTrue((df['Volume'] % 100 == 0).all() and (df['Volume'] > 0).all())
+
+        times = df.loc[df['Flag'] != "OPEN", 'TradeDateTime'].dt.time
+        in_session = np.zeros(len(times), dtype=bool)
+        for start, end in Synthetic.SESSIONS:
+            in_session |= (times >= start).to_numpy() & (times < end).to_numpy()
+        self.assertTrue(in_session.all())
+
+    def test_prices_respect_tick_tiers(self):
+        service = CommissionService.commissionService
+        df = Synthetic.generate_day("2025-11-10", n_symbols=40, ticks_per_symbol=200, seed=2)
+        for price in np.unique(df['LastPrice']):
+            tick = service._get_slippage(price)
+            self.assertAlmostEqual(round(price / tick) * tick, price, places=9, msg=price)
+
+    def test_same_seed_same_day(self):
+        a = Synthetic.generate_day("2025-11-10", n_symbols=5, ticks_per_symbol=50, seed=3)
+        b = Synthetic.generate_day("2025-11-10", n_symbols=5, ticks_per_symbol=50, seed=3)
+        c = Synthetic.generate_day("2025-11-10", n_symbols=5, ticks_per_symbol=50, seed=4)
+        pd.testing.assert_frame_equal(a, b)
+        self.assertFalse(a.equals(c))
+
+    def test_large_universe_names(self):
+        symbols = Synthetic.symbol_names(520)
+        self.assertEqual(len(set(symbols)), 520)
+        self.assertEqual(symbols[:2], ["ADVANC", "AOT"])
+        self.assertEqual(symbols[-1], "SYN0520")
+
+        path = Synthetic.write_universe(os.path.join(self.ticks_dir, "universe.csv"), symbols)
+        universe = Universe.Universe.from_csv(path)
+        self.assertEqual(universe.n_listed, 520)
+        self.assertIn("SYN0300", universe)
+
+    def test_anomaly_day_clusters(self):
+        kwargs = dict(n_symbols=30, ticks_per_symbol=300, seed=5)
+        for anomaly, check in ((False, self.assertLess), (True, self.assertGreaterEqual)):
+            df = Synthetic.generate_day("2025-11-10", anomaly=anomaly, **kwargs)
+            series = MarketState.MarketState.batch(df['ShareCode'], df['LastPrice'], df['Volume'])
+            check(series["tcr"][-1], 50.0)
+
+    def test_engines_agree_on_synthetic_days(self):
+        dates = Synthetic.trading_days("2025-11-14", 2)
+        self.assertEqual(dates, ["2025-11-14", "2025-11-17"])
+        with redirect_stdout(io.StringIO()):
+            Synthetic.main(["--out", self.ticks_dir, "--start", dates[0], "--days", "2", "--symbols", "6",
+                            "--ticks-per-symbol", "100", "--scale", "2"])
+            report = Equivalence.compare_engines(IntradayMeanReversion, dates, "vectorized",
+                                                 ticks_dir=self.ticks_dir, team_name="SynthTeam")
+        self.assertTrue(report.ok, str(report))
+        self.assertGreater(report.ticks, 2 * 6 * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
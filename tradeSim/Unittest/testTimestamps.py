@@ -0,0 +1,53 @@
+import unittest
+import datetime
+import numpy as np
+import pandas as pd
+from tradeSim import Timestamps
+from tradeSim import Stock
+
+# 2025-11-10 10:00:00 in Bangkok (UTC+7)
+OPEN_NS = pd.Timestamp("2025-11-10 03:00:00", tz="UTC").value
+
+
+class TestTimestamps(unittest.TestCase):
+
+    def test_naive_values_are_market_time(self):
+        self.assertEqual(Timestamps.to_epoch_ns(pd.Timestamp("2025-11-10 10:00:00")), OPEN_NS)
+        self.assertEqual(Timestamps.to_epoch_ns(datetime.datetime(2025, 11, 10, 10, 0, 0)), OPEN_NS)
+        self.assertEqual(Timestamps.to_epoch_ns(np.datetime64("2025-11-10T10:00:00")), OPEN_NS)
+        self.assertEqual(Timestamps.to_epoch_ns(OPEN_NS), OPEN_NS)
+
+    def test_aware_values_keep_their_zone(self):
+        self.assertEqual(Timestamps.to_epoch_ns(pd.Timestamp("2025-11-10 10:00:00", tz="Asia/Bangkok")), OPEN_NS)
+        aware = datetime.datetime(2025, 11, 10, 3, 0, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual(Timestamps.to_epoch_ns(aware), OPEN_NS)
+
+    def test_column_matches_scalar(self):
+        times = pd.to_datetime(pd.Series(["2025-11-10 10:00:00.000", "2025-11-10 10:00:01.250"]))
+        column = Timestamps.column_epoch_ns(times)
+        self.assertEqual(column.dtype, np.int64)
+        self.assertEqual(column.tolist(), [Timestamps.to_epoch_ns(t) for t in times])
+
+    def test_row_prefers_precomputed_column(self):
+        row = {"TradeDateTime": pd.Timestamp("2025-11-10 10:00:00"), Timestamps.EPOCH_COLUMN: 123}
+        self.assertEqual(Timestamps.row_epoch_ns(row), 123)
+        del row[Timestamps.EPOCH_COLUMN]
+        self.assertEqual(Timestamps.row_epoch_ns(row), OPEN_NS)
+
+    def test_format_is_market_wall_clock(self):
+        self.assertEqual(Timestamps.format_ns(OPEN_NS), "2025-11-10 10:00:00")
+
+    def test_legacy_seconds_are_normalized(self):
+        self.assertEqual(Timestamps.normalize(OPEN_NS / 1e9), OPEN_NS)
+        self.assertEqual(Timestamps.normalize(OPEN_NS), OPEN_NS)
+
+        stock = Stock.stock.from_dict({
+            "symbol": "AOT", "buy_price": 30.0, "start_vol": 100, "buy_time": OPEN_NS / 1e9,
+            "amount_cost": 3000.0, "market_value": 3000.0, "unrealized": 0.0, "realized": 0.0,
+        })
+        self.assertEqual(stock.buy_time, OPEN_NS)
+        self.assertEqual(stock.get_buy_time_str(), "2025-11-10 10:00:00")
+
+
+if __name__ == '__main__':
+    unittest.main()
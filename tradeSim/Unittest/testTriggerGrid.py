@@ -0,0 +1,85 @@
+import unittest
+import shutil
+import tempfile
+from tradeSim import TriggerGrid
+from tradeSim import Features
+from tradeSim import Microstructure
+from tradeSim import Replay
+from tradeSim import Synthetic
+
+
+def simulate(df, buy_trigger, stop_loss, position_size):
+    """
+    One combination, tick by tick, the way the analysis scripts simulate it.
+    """
+    cash = TriggerGrid.CAPITAL
+    positions = {}
+    trades = wins = 0
+    liquidate_after = Features.seconds_after_open(TriggerGrid.LIQUIDATE_AT)
+    stop_trades_after = Features.seconds_after_open(TriggerGrid.LAST_ENTRY)
+    for row in df[['ShareCode', 'LastPrice', 'Volume', 'SessionVWAP', 'SecondsSinceOpen']].itertuples(index=False):
+        symbol, price, vwap, elapsed = row.ShareCode, row.LastPrice, row.SessionVWAP, row.SecondsSinceOpen
+        if price <= 0 or row.Volume <= 0:
+            continue
+        tick = float(Microstructure.tick_size(price))
+        if symbol in positions:
+            pos = positions[symbol]
+            if elapsed >= liquidate_after or price >= vwap or price <= pos['entry'] * stop_loss:
+                proceeds = pos['volume'] * (price - tick) * (1 - TriggerGrid.COMMISSION_RATE)
+                cash += proceeds
+                trades += 1
+                wins += proceeds - pos['cost'] > 0
+                del positions[symbol]
+        elif elapsed < stop_trades_after and price <= vwap * buy_trigger and cash > position_size:
+            entry_price = price + tick
+            vol = int((position_size / entry_price) // 100 * 100)
+            if vol >= 100:
+                cost = vol * entry_price * (1 + TriggerGrid.COMMISSION_RATE)
+                cash -= cost
+                positions[symbol] = {'volume': vol, 'entry': entry_price, 'cost': cost}
+    final_value = cash
+    for pos in positions.values():
+        final_value += pos['volume'] * pos['entry']
+    return (final_value - TriggerGrid.CAPITAL) / TriggerGrid.CAPITAL * 100, trades, wins
+
+
+class TestTriggerGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.ticks_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.ticks_dir, ignore_errors=True)
+
+    def day(self, date, **kw):
+        df = Replay.load_day(Synthetic.write_day(self.ticks_dir, date, **kw), cache=False)
+        return df[~df['IsOpenAuction']]
+
+    def test_matches_per_combination_simulation(self):
+        combos = TriggerGrid.grid([0.995, 0.99, 0.985, 0.97], [0.98, 0.995], [150_000, 500_000, 4_000_000])
+        for df in (self.day("2025-11-10", n_symbols=12, ticks_per_symbol=300, seed=3),
+                   self.day("2025-11-11", n_symbols=12, ticks_per_symbol=300, seed=5, anomaly=True)):
+            result = TriggerGrid.evaluate(df['ShareCode'], df['LastPrice'], df['Volume'], df['SessionVWAP'],
+                                          df['SecondsSinceOpen'], combos['buy_trigger'], combos['stop_loss'],
+                                          combos['position_size'])
+            self.assertEqual(list(result.columns), TriggerGrid.COLUMNS)
+            self.assertGreater(result['trades'].max(), 0)
+            for row in result.itertuples(index=False):
+                expected = simulate(df, row.buy_trigger, row.stop_loss, row.position_size)
+                self.assertEqual((row.return_pct, row.trades, row.wins), expected, msg=row)
+
+    def test_broadcast_and_grid(self):
+        combos = TriggerGrid.grid([0.99, 0.98], [0.97, 0.98, 0.99])
+        self.assertEqual(len(combos), 6)
+        self.assertEqual(list(combos.iloc[1]), [0.99, 0.98, 500_000])
+
+        df = self.day("2025-11-10", n_symbols=5, ticks_per_symbol=200, seed=1)
+        result = TriggerGrid.evaluate(df['ShareCode'], df['LastPrice'], df['Volume'], df['SessionVWAP'],
+                                      df['SecondsSinceOpen'], [0.99, 0.98])
+        self.assertEqual(list(result['stop_loss']), [0.98, 0.98])
+        self.assertEqual(list(result['position_size']), [500_000, 500_000])
+        self.assertEqual(tuple(result.iloc[1][['return_pct', 'trades', 'wins']]), simulate(df, 0.98, 0.98, 500_000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import tempfile
+from unittest import mock
+import numpy as np
+import pandas as pd
+from tradeSim import Universe
+from tradeSim import Replay
+from tradeSim import TradeSim
+from tradeSim import Portfolio
+from tradeSim import Order
+
+
+class TestUniverse(unittest.TestCase):
+
+    def setUp(self):
+        self.universe = Universe.default_universe()
+
+    def test_ids_follow_file_order(self):
+        listed = self.universe.symbols[:self.universe.n_listed]
+        self.assertEqual(listed[:3], ["ADVANC", "AOT", "AWC"])
+        self.assertEqual([self.universe.id_of(s) for s in listed], list(range(len(listed))))
+        self.assertEqual(self.universe.id_of("aot"), self.universe.id_of("AOT"))
+        self.assertIn("AOT", self.universe)
+
+    def test_interned_symbols_are_not_listed(self):
+        universe = Universe.Universe(["AOT", "PTT"])
+        sid = universe.intern("NOTSET50")
+        self.assertEqual(sid, 2)
+        self.assertEqual(universe.intern("NOTSET50"), 2)
+        self.assertNotIn("NOTSET50", universe)
+        self.assertEqual(universe.name_of(sid), "NOTSET50")
+
+    def test_column_ids(self):
+        universe = Universe.Universe(["AOT", "PTT"])
+        ids = universe.ids_for(pd.Series(["PTT", "AOT", "PTT", "XYZ"]))
+        np.testing.assert_array_equal(ids, [1, 0, 1, 2])
+
+    def test_load_symbols_installs_universe(self):
+        self.assertIn("AOT", Order.order.load_set50_symbols())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "universe.csv")
+            with open(path, "w") as f:
+                f.write("Symbol\nPTT\nSYN0001\n")
+            with mock.patch.object(Universe, "_default", self.universe):
+                self.assertEqual(Order.order.load_set50_symbols(path), {"PTT", "SYN0001"})
+                self.assertIn("SYN0001", Universe.default_universe())
+                self.assertNotIn("AOT", Universe.default_universe())
+
+    def test_day_and_orders_carry_ids(self):
+        team = "UniverseTeam"
+        self.addCleanup(lambda: __import__("shutil").rmtree(os.path.join("result", team), ignore_errors=True))
+        df = Replay.prepare_day(pd.DataFrame({
+            "ShareCode": ["AOT", "PTT"],
+            "TradeDateTime": pd.to_datetime(["2025-11-10 10:00:00", "2025-11-10 10:00:01"]),
+            "LastPrice": [30.0, 20.0], "Volume": [1000, 1000], "Flag": ["Sell", "Sell"],
+        }))
+        self.assertEqual(df[Universe.SYMBOL_ID_COLUMN].tolist(), [self.universe.id_of("AOT"), self.universe.id_of("PTT")])
+
+        sim = TradeSim.tradeSim(team, portfolio=Portfolio.portfolio(team))
+        row = df.iloc[0].to_dict()
+        sim.create_order_to_limit(300, 30.0, "Buy", "AOT", 1000, 1000, row)
+        sim.isMatch(row)
+        lots = sim.portfolio.get_stock_by_symbol("AOT")
+        self.assertEqual([lot.symbol_id for lot in lots], [self.universe.id_of("AOT")])
+        self.assertEqual(sim.portfolio.get_total_stock_volume_by_symbol("AOT"), 300)
+
+        result = sim.create_order_to_limit(100, 10.0, "Buy", "NOTSET50", 1000, 1000, row)
+        self.assertIn("not in SET50", str(result))
+
+    def test_market_prices_by_id(self):
+        team = "UniverseTeam"
+        self.addCleanup(lambda: __import__("shutil").rmtree(os.path.join("result", team), ignore_errors=True))
+        sim = TradeSim.tradeSim(team, portfolio=Portfolio.portfolio(team))
+        row = {"ShareCode": "AOT", "LastPrice": 30.0, "Volume": 1000, "Flag": "Sell",
+               "TradeDateTime": pd.Timestamp("2025-11-10 10:00:00")}
+        for _ in range(2):
+            sim.create_order_to_limit(100, 30.0, "Buy", "AOT", 1000, 1000, row)
+            sim.isMatch(row)
+        aot = self.universe.id_of("AOT")
+        self.assertEqual(set(sim.portfolio.lots_by_id), {aot})
+
+        sim.update_market_prices({aot: 35.0, self.universe.id_of("PTT"): 40.0})
+        by_id = sim.portfolio.get_nav()
+        self.assertEqual([lot.get_mkt_price() for lot in sim.portfolio.get_stock_by_symbol("AOT")], [35.0, 35.0])
+        sim.update_market_prices({"AOT": 35.0})
+        self.assertEqual(sim.portfolio.get_nav(), by_id)
+
+        row = dict(row, Flag="Buy")
+        sim.create_order_to_limit(200, 30.0, "Sell", "AOT", 1000, 1000, row)
+        sim.isMatch(row)
+        self.assertEqual(sim.portfolio.lots_by_id, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,20 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+def write_tick_day(ticks_dir, date, seed):
+    """
+    Write a small <date>.csv tick file (AOT, PTT, KBANK, 250 ticks each) for the engine tests.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for symbol in ("AOT", "PTT", "KBANK"):
+        price = 30.0
+        ts = pd.Timestamp(f"{date} 10:00:00")
+        for _ in range(250):
+            ts += pd.Timedelta(seconds=int(rng.integers(1, 180)))
+            price = max(5.0, price + rng.choice([-0.25, 0.0, 0.25]))
+            rows.append((symbol, ts, price, int(rng.integers(1, 50)) * 100, rng.choice(["Buy", "Sell"])))
+    df = pd.DataFrame(rows, columns=["ShareCode", "TradeDateTime", "LastPrice", "Volume", "Flag"])
+    df.sort_values("TradeDateTime", kind="stable").to_csv(os.path.join(ticks_dir, f"{date}.csv"), index=False)
@@ -0,0 +1,124 @@
+import csv
+import os
+
+DEFAULT_CSV = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "marketInfo", "symbolSET50", "Symbol_SET50.csv")
+)
+SYMBOL_ID_COLUMN = "SymbolId"
+
+
+class Universe:
+    """
+    Registry of tradable symbols with dense integer ids.
+
+    Ids 0 .. n_listed-1 are the symbols of the universe file, in file order.
+    Ticks, orders, lots and per-symbol state arrays are indexed by these ids;
+    names are only used at I/O boundaries (tick files, logs, JSON).
+
+    Symbols met outside the file (e.g. a lot loaded from an old portfolio file)
+    can be interned: they get the next free id but are not listed, so orders on
+    them are still rejected.
+    """
+
+    def __init__(self, symbols=()):
+        self.ids = {}
+        self.symbols = []
+        for symbol in symbols:
+            self.intern(symbol)
+        self.n_listed = len(self.symbols)
+
+    @classmethod
+    def from_csv(cls, csv_path=DEFAULT_CSV):
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"[ERROR] Cannot find SET50 list at '{csv_path}'")
+
+        with open(csv_path, mode="r", newline="", encoding="utf-8-sig") as file:
+            reader = csv.DictReader(file)
+
+            symbol_col = None
+            for h in reader.fieldnames:
+                if h.strip().lower() == "symbol":
+                    symbol_col = h
+                    break
+            if symbol_col is None:
+                raise KeyError("[ERROR] 'Symbol' column not found in CSV headers.")
+
+            symbols = [row[symbol_col].strip().upper() for row in reader]
+        return cls(symbols)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return self.is_listed(self.id_of(symbol))
+
+    def id_of(self, symbol):
+        """
+        Id of `symbol` (case-insensitive), or None if it has never been seen.
+        """
+        sid = self.ids.get(symbol)
+        if sid is None and isinstance(symbol, str):
+            sid = self.ids.get(symbol.upper())
+        return sid
+
+    def intern(self, symbol):
+        """
+        Id of `symbol`, assigning the next free id to unseen names.
+        """
+        sid = self.id_of(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self.ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def is_listed(self, sid):
+        return sid is not None and sid < self.n_listed
+
+    def name_of(self, sid):
+        return self.symbols[sid]
+
+    def ids_for(self, symbols):
+        """
+        Vectorized intern() for a column of names: int64 array of ids.
+        """
+        import numpy as np
+
+        names, inverse = np.unique(np.asarray(symbols, dtype=object).astype(str), return_inverse=True)
+        return np.array([self.intern(name) for name in names], dtype=np.int64)[inverse.ravel()]
+
+
+def row_symbol_id(row, universe=None):
+    """
+    Symbol id of a tick row: the precomputed SymbolId column when the day was
+    loaded by the engine, otherwise looked up from ShareCode.
+    """
+    sid = row.get(SYMBOL_ID_COLUMN) if hasattr(row, "get") else None
+    if sid is not None:
+        return int(sid)
+    if universe is None:
+        universe = default_universe()
+    return universe.id_of(row["ShareCode"])
+
+
+_default = None
+
+
+def default_universe():
+    """
+    The SET50 universe from marketInfo/symbolSET50/Symbol_SET50.csv, loaded once.
+    """
+    global _default
+    if _default is None:
+        _default = Universe.from_csv()
+    return _default
+
+
+def set_default_universe(universe):
+    """
+    Replace the default universe, e.g. with a larger synthetic one
+    (Universe.from_csv of a file written by Synthetic.write_universe). Call it
+    before the first order or tick day is created.
+    """
+    global _default
+    _default = universe
@@ -0,0 +1,3 @@
+from .Backtest import main
+
+main()